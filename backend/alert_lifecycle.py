@@ -0,0 +1,242 @@
+import itertools
+import threading
+from collections import deque
+
+from alert_rules import SEVERITY_RANK
+
+PENDING = 'pending'
+FIRING = 'firing'
+RESOLVED = 'resolved'
+# A pending alert whose condition cleared before it fired
+INACTIVE = 'inactive'
+
+# A key that changed between firing and resolved this many times within
+# FLAP_WINDOW seconds is flapping
+FLAP_THRESHOLD = 4
+FLAP_WINDOW = 600.0
+# A flapping alert resolves only after staying clear this long
+FLAP_QUIET_PERIOD = 300.0
+
+
+class _Alert:
+    def __init__(self, key, metric, device):
+        self.key = key
+        self.metric = metric
+        self.device = device
+        self.rule = None
+        self.state = None
+        self.value = None
+        self.display_value = None
+        self.first_seen = None
+        self.pending_since = None
+        self.fired_at = None
+        self.resolved_at = None
+        self.last_seen = None
+        self.clear_since = None
+        self.flapping = False
+        self.changes = deque()  # timestamps of firing <-> resolved changes
+
+    @property
+    def severity(self):
+        return self.rule.severity if self.rule else 'INFO'
+
+    @property
+    def message(self):
+        if self.rule is None:
+            return self.display_value
+        return f"{self.rule.description}: {self.display_value}"
+
+    def to_dict(self):
+        return {
+            'id': self.key,
+            'metric': self.metric,
+            'device': self.device,
+            'severity': self.severity,
+            'state': self.state,
+            'message': self.message,
+            'value': self.value,
+            'first_seen': self.first_seen.isoformat(),
+            'fired_at': self.fired_at.isoformat() if self.fired_at else None,
+            'resolved_at': self.resolved_at.isoformat() if self.resolved_at else None,
+            'last_seen': self.last_seen.isoformat(),
+            'flapping': self.flapping,
+            # When this alert started, for clients that only know 'timestamp'
+            'timestamp': (self.fired_at or self.first_seen).isoformat(),
+        }
+
+
+class AlertTracker:
+    """Alert state machine (pending -> firing -> resolved) keyed by metric and device
+
+    ``update()`` is fed every classified sample of a sampling cycle. A rule
+    match opens a pending alert that fires once the rule's ``for_seconds``
+    has elapsed. An open alert stays open while its value is still inside
+    the rule's hysteresis band, escalates or de-escalates when another rule
+    takes over, and resolves once nothing holds. Keys that keep switching
+    between firing and resolved are marked flapping: repeated re-fires are
+    folded into the open alert and it only resolves after a quiet period.
+
+    Every state change is appended to a bounded transition log with an
+    increasing id, so clients can ask for "transitions since N".
+    """
+
+    def __init__(self, max_transitions=500, flap_threshold=FLAP_THRESHOLD,
+                 flap_window=FLAP_WINDOW, flap_quiet_period=FLAP_QUIET_PERIOD):
+        self.flap_threshold = flap_threshold
+        self.flap_window = flap_window
+        self.flap_quiet_period = flap_quiet_period
+        self.last_seq = None
+        self._alerts = {}
+        self._transitions = deque(maxlen=max_transitions)
+        self._transition_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def update(self, classified, timestamp, seq=None):
+        """Apply one sampling cycle: ``classified`` yields (sample dict, Classification)"""
+        with self._lock:
+            if seq is not None:
+                if self.last_seq is not None and seq <= self.last_seq:
+                    return  # already applied
+                self.last_seq = seq
+            seen = set()
+            for sample, verdict in classified:
+                key = f"{sample['metric']}|{sample.get('device') or ''}"
+                seen.add(key)
+                self._step(key, sample, verdict.rule, timestamp)
+            # A series that stopped reporting cannot still be in breach
+            for key, alert in list(self._alerts.items()):
+                if key not in seen and alert.state in (PENDING, FIRING):
+                    self._step(key, {'metric': alert.metric, 'device': alert.device,
+                                     'raw_value': None, 'value': alert.display_value}, None, timestamp)
+            self._expire(timestamp)
+
+    def _step(self, key, sample, rule, timestamp):
+        alert = self._alerts.get(key)
+        value = sample['raw_value']
+        is_open = alert is not None and alert.state in (PENDING, FIRING)
+
+        # Hysteresis: the open alert's rule keeps holding until the value clears it
+        if is_open and alert.rule.holds(value):
+            if rule is None or SEVERITY_RANK[rule.severity] > SEVERITY_RANK[alert.rule.severity]:
+                rule = alert.rule
+        if rule is not None and rule.severity == 'INFO':
+            rule = None
+
+        if rule is None:
+            if is_open:
+                alert.value, alert.display_value = value, sample.get('value')
+                alert.last_seen = timestamp
+                self._clear(alert, timestamp)
+            return
+
+        if alert is None:
+            alert = self._alerts[key] = _Alert(key, sample['metric'], sample.get('device'))
+        alert.value, alert.display_value = value, sample.get('value')
+        alert.last_seen = timestamp
+        alert.clear_since = None
+
+        if not is_open:
+            alert.rule = rule
+            alert.resolved_at = None
+            if alert.first_seen is None:
+                alert.first_seen = timestamp
+            alert.pending_since = timestamp
+            if rule.for_seconds > 0:
+                previous = alert.state
+                alert.state = PENDING
+                self._record(alert, previous, PENDING, timestamp)
+            else:
+                self._fire(alert, timestamp, alert.state)
+            return
+
+        if rule is not alert.rule:
+            previous_severity = alert.severity
+            alert.rule = rule
+            if alert.state == FIRING and rule.severity != previous_severity:
+                self._record(alert, FIRING, FIRING, timestamp, previous_severity=previous_severity)
+        if alert.state == PENDING and (timestamp - alert.pending_since).total_seconds() >= rule.for_seconds:
+            self._fire(alert, timestamp, PENDING)
+
+    def _fire(self, alert, timestamp, previous):
+        if alert.fired_at is not None:
+            # Firing again after it resolved (resolved alerts are kept for flap_window)
+            self._note_change(alert, timestamp)
+        alert.state = FIRING
+        alert.fired_at = timestamp
+        self._record(alert, previous, FIRING, timestamp)
+
+    def _clear(self, alert, timestamp):
+        if alert.state == PENDING:
+            if alert.fired_at is None:
+                # Never fired: forget it rather than resolving it
+                del self._alerts[alert.key]
+            else:
+                alert.state = RESOLVED
+                alert.resolved_at = timestamp
+            self._record(alert, PENDING, INACTIVE if alert.fired_at is None else RESOLVED, timestamp)
+            return
+        if alert.flapping:
+            if alert.clear_since is None:
+                alert.clear_since = timestamp
+            if (timestamp - alert.clear_since).total_seconds() < self.flap_quiet_period:
+                return
+            # Quiet long enough: resolve and start counting changes afresh
+            alert.flapping = False
+            alert.changes.clear()
+        else:
+            self._note_change(alert, timestamp)
+        alert.state = RESOLVED
+        alert.resolved_at = timestamp
+        alert.clear_since = None
+        self._record(alert, FIRING, RESOLVED, timestamp)
+
+    def _note_change(self, alert, timestamp):
+        alert.changes.append(timestamp)
+        while alert.changes and (timestamp - alert.changes[0]).total_seconds() > self.flap_window:
+            alert.changes.popleft()
+        if not alert.flapping and len(alert.changes) >= self.flap_threshold:
+            alert.flapping = True
+
+    def _expire(self, timestamp):
+        """Forget resolved alerts once they can no longer count towards flapping"""
+        for key, alert in list(self._alerts.items()):
+            if alert.state == RESOLVED and (timestamp - alert.resolved_at).total_seconds() > self.flap_window:
+                del self._alerts[key]
+
+    def _record(self, alert, previous, state, timestamp, previous_severity=None):
+        transition = {
+            'id': next(self._transition_ids),
+            'alert_id': alert.key,
+            'metric': alert.metric,
+            'device': alert.device,
+            'from': previous,
+            'to': state,
+            'severity': alert.severity,
+            'message': alert.message,
+            'flapping': alert.flapping,
+            'timestamp': timestamp.isoformat(),
+        }
+        if previous_severity:
+            transition['previous_severity'] = previous_severity
+        self._transitions.append(transition)
+
+    def open_alerts(self):
+        """Pending and firing alerts as dicts, most severe first"""
+        with self._lock:
+            alerts = [alert for alert in self._alerts.values() if alert.state in (PENDING, FIRING)]
+            alerts.sort(key=lambda alert: (SEVERITY_RANK[alert.severity], alert.first_seen))
+            return [alert.to_dict() for alert in alerts]
+
+    def transitions(self, since=None, limit=None):
+        """Transitions with an id greater than ``since`` (oldest first)"""
+        with self._lock:
+            transitions = [t for t in self._transitions if since is None or t['id'] > since]
+        if limit is not None:
+            transitions = transitions[-limit:]
+        return transitions
+
+    @property
+    def cursor(self):
+        """Id of the newest transition (0 if none yet)"""
+        with self._lock:
+            return self._transitions[-1]['id'] if self._transitions else 0
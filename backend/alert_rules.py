@@ -0,0 +1,156 @@
+import json
+import operator
+from collections import namedtuple
+from dataclasses import dataclass
+
+# Highest first; the first matching rule in this order wins
+SEVERITIES = ('CRITICAL', 'WARNING', 'INFO')
+SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITIES)}
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+Classification = namedtuple('Classification', ['severity', 'rule'])
+
+# Default gap between firing and clearing thresholds, as a fraction of the threshold
+DEFAULT_HYSTERESIS = 0.05
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """One threshold on one metric, e.g. CPU Usage >= 90 -> CRITICAL
+
+    ``device`` limits the rule to samples from that device; None matches any
+    device, so one rule covers every interface or process reporting the metric.
+    ``for_seconds`` is how long the condition must hold before the alert
+    fires, and ``clear`` the value an open alert has to get back past before
+    it resolves (defaults to the threshold moved back by DEFAULT_HYSTERESIS).
+    """
+    metric: str
+    severity: str
+    threshold: float
+    description: str
+    op: str = '>='
+    device: str = None
+    for_seconds: float = 0
+    clear: float = None
+
+    def __post_init__(self):
+        if self.severity not in SEVERITY_RANK:
+            raise ValueError(f"Unknown severity '{self.severity}' for rule on {self.metric}")
+        if self.op not in OPERATORS:
+            raise ValueError(f"Unknown operator '{self.op}' for rule on {self.metric}")
+
+    @property
+    def clear_threshold(self):
+        if self.clear is not None:
+            return self.clear
+        margin = abs(self.threshold) * DEFAULT_HYSTERESIS
+        if self.op in ('>', '>='):
+            return self.threshold - margin
+        if self.op in ('<', '<='):
+            return self.threshold + margin
+        return self.threshold
+
+    def holds(self, value):
+        """True while ``value`` has not yet cleared this rule (hysteresis band included)"""
+        try:
+            return OPERATORS[self.op](value, self.clear_threshold)
+        except TypeError:
+            return False
+
+
+def rules_from_table(table, op='>='):
+    """Build rules from {severity: [(metric, threshold, description), ...]}"""
+    return [
+        AlertRule(metric, severity, threshold, description, op)
+        for severity, entries in table.items()
+        for metric, threshold, description in entries
+    ]
+
+
+def load_rules(path):
+    """Read rules from a JSON file: {"rules": [{"metric", "severity", "threshold", ...}]}"""
+    with open(path) as f:
+        document = json.load(f)
+    rules = []
+    for entry in document.get('rules', []):
+        try:
+            rules.append(AlertRule(
+                metric=entry['metric'],
+                severity=entry['severity'],
+                threshold=entry['threshold'],
+                description=entry.get('description', entry['metric']),
+                op=entry.get('op', '>='),
+                device=entry.get('device'),
+                for_seconds=entry.get('for', 0),
+                clear=entry.get('clear'),
+            ))
+        except KeyError as e:
+            raise ValueError(f"Alert rule {entry!r} in {path} is missing {e}") from None
+    return rules
+
+
+UNMATCHED = Classification('INFO', None)
+
+
+class AlertRuleEngine:
+    """Classifies metric samples against threshold rules, compiled once
+
+    Rules are indexed by metric name and ordered highest severity first (rules
+    of equal severity keep their given order), so classifying a sample is one
+    dict lookup plus comparisons until the first match. That first match is
+    the verdict: a sample that crosses a CRITICAL threshold can never be
+    downgraded by a lower rule, regardless of how the rules were listed.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        index = {}
+        for position, rule in enumerate(self.rules):
+            index.setdefault(rule.metric, []).append((SEVERITY_RANK[rule.severity], position, rule))
+        self._index = {
+            metric: tuple(
+                (rule.device, OPERATORS[rule.op], rule.threshold, Classification(rule.severity, rule))
+                for _, _, rule in sorted(entries)
+            )
+            for metric, entries in index.items()
+        }
+
+    def metrics(self):
+        """Metric names that have at least one rule"""
+        return list(self._index)
+
+    def classify(self, metric, value, device=None):
+        """Classification(severity, rule) for one reading; rule is None if nothing matched"""
+        return _first_match(self._index.get(metric, ()), value, device)
+
+    def classify_batch(self, samples):
+        """Classify many samples in one call
+
+        ``samples`` are dicts with 'metric', 'raw_value' and optionally
+        'device'; returns one Classification per sample, in order.
+        """
+        index = self._index
+        return [
+            _first_match(index.get(sample['metric'], ()), sample['raw_value'], sample.get('device'))
+            for sample in samples
+        ]
+
+
+def _first_match(rules, value, device):
+    for rule_device, compare, threshold, verdict in rules:
+        if rule_device is not None and rule_device != device:
+            continue
+        try:
+            if compare(value, threshold):
+                return verdict
+        except TypeError:
+            continue  # non-numeric reading for a numeric rule
+    return UNMATCHED
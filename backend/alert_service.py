@@ -0,0 +1,200 @@
+import os
+import threading
+
+from alert_rules import AlertRuleEngine, SEVERITIES, load_rules
+from alert_lifecycle import AlertTracker
+from connectivity import STATUS_TEXT
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'alert_rules.json')
+
+
+def snapshot_metrics(snapshot):
+    """Host-level metric samples for alert classification, read from one snapshot"""
+    timestamp = snapshot.timestamp
+    net_rates = snapshot.net_rates
+    established_count = snapshot.connections.established_count
+    metrics = [
+        {'metric': 'CPU Usage', 'value': f"{snapshot.cpu_usage:.1f}%",
+         'raw_value': snapshot.cpu_usage, 'device': 'System'},
+        {'metric': 'Memory Usage', 'value': f"{snapshot.memory_usage:.1f}%",
+         'raw_value': snapshot.memory_usage, 'device': 'System'},
+        {'metric': 'Disk Usage',
+         'value': f"{snapshot.disk_usage:.1f}%" if snapshot.disk_usage is not None else "unknown",
+         'raw_value': snapshot.disk_usage, 'device': 'Storage'},
+    ]
+    # Per-second rates, not totals since boot, so an alert resolves once errors stop
+    if net_rates:
+        error_rate = net_rates['errin_per_sec'] + net_rates['errout_per_sec']
+        drop_rate = net_rates['dropin_per_sec'] + net_rates['dropout_per_sec']
+        metrics.append({'metric': 'Network Errors', 'value': f"{error_rate:.1f} errors/s",
+                        'raw_value': error_rate, 'device': 'Network'})
+        metrics.append({'metric': 'Packet Drops', 'value': f"{drop_rate:.1f} dropped packets/s",
+                        'raw_value': drop_rate, 'device': 'Network'})
+    else:
+        metrics.append({'metric': 'Network Errors', 'value': "Waiting for a second network sample",
+                        'raw_value': None, 'device': 'Network'})
+    metrics.append({'metric': 'Active Connections', 'value': f"{established_count} connections",
+                    'raw_value': established_count, 'device': 'Network'})
+    metrics.append({'metric': 'Internet Connectivity', 'value': snapshot.internet_status,
+                    'raw_value': 1 if snapshot.internet_status == STATUS_TEXT['disconnected'] else 0,
+                    'device': 'Network'})
+    for metric in metrics:
+        metric['timestamp'] = timestamp
+    return metrics
+
+
+def organize_alerts(alerts):
+    """Group alerts by severity and add the summary block both the API and CLI show"""
+    organized = {severity: [] for severity in SEVERITIES}
+    for alert in alerts:
+        organized[alert['severity']].append(alert)
+
+    critical_count = len(organized['CRITICAL'])
+    warning_count = len(organized['WARNING'])
+    if critical_count > 0:
+        health_status = 'CRITICAL'
+    elif warning_count > 0:
+        health_status = 'WARNING'
+    else:
+        health_status = 'HEALTHY'
+
+    organized['summary'] = {
+        'total_alerts': len(alerts),
+        'critical_count': critical_count,
+        'warning_count': warning_count,
+        'health_status': health_status
+    }
+    return organized
+
+
+class AlertService:
+    """Single place where alerts are evaluated, for the Flask API and the CLI
+
+    Rules come from a JSON file (see alert_rules.json) and are reloaded when
+    the file changes. Results are cached per snapshot sequence number, so one
+    sampling cycle is classified once no matter how many endpoints, stream
+    subscribers or menu screens ask for it. Callers must treat the returned
+    dicts as read-only.
+
+    ``observe()`` feeds each snapshot's classification into an AlertTracker,
+    which keeps alert identity, pending/firing/resolved state and history.
+    """
+
+    def __init__(self, rules_path=DEFAULT_RULES_PATH):
+        self.rules_path = rules_path
+        self._lock = threading.Lock()
+        self._engine = None
+        self._rules_mtime = None
+        self._cached_seq = None
+        self._cached = None
+        self._state = None  # (seq, state) for the newest observed snapshot
+        self._observed = None
+        self.tracker = AlertTracker()
+
+    @property
+    def engine(self):
+        self._reload_if_changed()
+        return self._engine
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.rules_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._engine is None or mtime != self._rules_mtime:
+            try:
+                self._engine = AlertRuleEngine(load_rules(self.rules_path))
+                print(f"📏 Loaded {len(self._engine.rules)} alert rules from {self.rules_path}")
+            except (OSError, ValueError) as e:
+                if self._engine is None:
+                    raise
+                print(f"⚠️ Keeping previous alert rules, could not reload {self.rules_path}: {e}")
+            self._rules_mtime = mtime
+            self._cached_seq = None
+
+    def classify(self, metrics):
+        """Turn metric samples into alerts; samples with a preset 'severity' pass through"""
+        to_classify = [metric for metric in metrics if 'severity' not in metric]
+        return self._alerts_from(metrics, self.engine.classify_batch(to_classify))
+
+    def _alerts_from(self, metrics, classifications):
+        classifications = iter(classifications)
+        alerts = []
+        for metric in metrics:
+            if 'severity' in metric:
+                severity, message = metric['severity'], metric['value']
+            else:
+                severity, rule = next(classifications)
+                message = f"{rule.description}: {metric['value']}" if rule else metric['value']
+            alerts.append({
+                'timestamp': metric['timestamp'],
+                'metric': metric['metric'],
+                'message': message,
+                'severity': severity,
+                'device': metric['device']
+            })
+        return alerts
+
+    def _evaluate_locked(self, snapshot):
+        self._reload_if_changed()
+        if self._cached_seq != snapshot.seq or self._cached is None:
+            metrics = snapshot_metrics(snapshot)
+            classifications = self._engine.classify_batch(metrics)
+            organized = organize_alerts(self._alerts_from(metrics, classifications))
+            self._cached = (metrics, classifications, organized)
+            self._cached_seq = snapshot.seq
+        return self._cached
+
+    def evaluate(self, snapshot):
+        """Alerts grouped by severity plus summary for a snapshot (cached per snapshot)"""
+        with self._lock:
+            return self._evaluate_locked(snapshot)[2]
+
+    def observe(self, snapshot):
+        """Sampler listener: advance the alert lifecycle by one sampling cycle
+
+        Safe to call more than once per snapshot; each snapshot is applied once.
+        """
+        with self._lock:
+            metrics, classifications, _ = self._evaluate_locked(snapshot)
+            self.tracker.update(zip(metrics, classifications), snapshot.timestamp, snapshot.seq)
+            if self._observed is None or snapshot.seq > self._observed.seq:
+                self._observed = snapshot
+
+    def state(self, snapshot):
+        """Alert state after ``snapshot`` as plain data, what /api/alerts is built from
+
+        ``open`` (pending and firing alerts), ``transitions``, ``cursor`` and
+        ``readings`` (metrics below every threshold). Under gunicorn the
+        sampler process publishes this with each snapshot, so every worker
+        serves the same alerts, transition ids and cursor. A caller holding
+        an older snapshot than the tracker has seen gets the current state.
+        """
+        self.observe(snapshot)
+        with self._lock:
+            latest = self._observed
+            if self._state is not None and self._state[0] == latest.seq:
+                return self._state[1]
+            readings = [dict(reading, timestamp=reading['timestamp'].isoformat())
+                        for reading in self._evaluate_locked(latest)[2]['INFO']]
+            state = {
+                'open': self.tracker.open_alerts(),
+                'transitions': self.tracker.transitions(),
+                'cursor': self.tracker.cursor,
+                'readings': readings,
+            }
+            self._state = (latest.seq, state)
+            return state
+
+
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def get_alert_service():
+    """Return the process-wide alert service (rules file from NETMGMT_ALERT_RULES if set)"""
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = AlertService(os.environ.get('NETMGMT_ALERT_RULES', DEFAULT_RULES_PATH))
+        return _default_service
@@ -0,0 +1,318 @@
+"""Async (ASGI) variant of the API: run ``uvicorn asgi:app --port 5000`` from backend/
+
+The polled endpoints, the event stream and the ``diagnose`` command are
+served natively on the event loop:
+
+- Diagnose probes (diagnostics.py) run concurrently on the event loop, each
+  with its own deadline, and the whole run has an overall deadline.
+- Blocking psutil and payload-building work runs on one bounded thread pool,
+  so a burst of slow calls cannot create unbounded threads.
+- Concurrent identical requests (same endpoint, parameters and snapshot)
+  share one in-flight computation.
+
+A running diagnose therefore holds no thread while it waits on the network,
+and the fast endpoints keep serving at full rate. Every other route is passed
+to the Flask app in main.py, executed on the same thread pool.
+"""
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import main
+from diagnostics import DIAGNOSE_DEADLINE, DiagnosticsRunner, probe_event
+from stream import format_event
+
+executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('NETMGMT_ASGI_THREADS', 8)),
+    thread_name_prefix='asgi-blocking'
+)
+
+# Same headers the Flask app adds (flask_cors plus after_request)
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-headers', b'Content-Type,Authorization,If-None-Match'),
+    (b'access-control-expose-headers', b'ETag'),
+    (b'access-control-allow-methods', b'GET,PUT,POST,DELETE,OPTIONS'),
+]
+
+
+class InFlight:
+    """Coalesces concurrent identical computations into one asyncio task
+
+    Callers with the same key while a task is running await that task
+    instead of starting another. A caller that goes away (client disconnect)
+    does not cancel the computation for the others.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+
+    async def run(self, key, factory):
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._tasks.pop(key, None) if self._tasks.get(key) is done else None)
+        return await asyncio.shield(task)
+
+
+in_flight = InFlight()
+
+
+async def blocking(func, *args, deadline=None):
+    """Run ``func`` on the bounded pool; with a deadline, raise TimeoutError after it"""
+    future = asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    if deadline is None:
+        return await future
+    return await asyncio.wait_for(future, deadline)
+
+
+# Same probes as the Flask app, with blocking checks on this server's pool
+diagnostics = DiagnosticsRunner(executor=executor)
+
+
+async def diagnose():
+    snapshot = await blocking(main.sampler.latest)
+    return diagnostics.report(await diagnostics.collect(snapshot))
+
+
+# ---------------------------------------------------------------- responses
+
+async def send_response(send, status, body=b'', headers=()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [*headers, (b'content-length', str(len(body)).encode()), *CORS_HEADERS],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, payload, status=200, headers=()):
+    body = json.dumps(payload, separators=(',', ':')).encode()
+    await send_response(send, status, body, [(b'content-type', b'application/json'), *headers])
+
+
+def _if_none_match(scope):
+    for name, value in scope['headers']:
+        if name == b'if-none-match':
+            return [tag.strip().strip('"').removeprefix('W/"') for tag in value.decode('latin-1').split(',')]
+    return []
+
+
+SNAPSHOT_ENDPOINTS = {
+    '/api/system-status': ('status', lambda snapshot, since: main.build_system_status(snapshot)),
+    '/api/alerts': ('alerts', main.build_alerts),
+    '/api/network-stats': ('network', main.build_network_stats),
+}
+
+
+async def snapshot_endpoint(scope, send, name, build):
+    snapshot = main.sampler.latest(timeout=0)
+    if snapshot is None:  # first sample still being taken
+        snapshot = await blocking(main.sampler.latest)
+    if snapshot is None:
+        await send_json(send, {"error": "Metrics not available yet"}, 503)
+        return
+
+    etag = main.snapshot_etag(name, snapshot)
+    headers = [(b'etag', f'"{etag}"'.encode()), (b'cache-control', b'no-cache')]
+    if etag in _if_none_match(scope):
+        await send_response(send, 304, headers=headers)
+        return
+
+    try:
+        since = int(parse_qs(scope['query_string'].decode('latin-1')).get('since', [None])[0])
+    except (TypeError, ValueError):
+        since = None
+    body = await in_flight.run(
+        (name, snapshot.seq, since),
+        lambda: blocking(lambda: json.dumps(build(snapshot, since), separators=(',', ':')).encode())
+    )
+    await send_response(send, 200, body, [(b'content-type', b'application/json'), *headers])
+
+
+async def stream_endpoint(receive, send):
+    main.sampler.start()
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+            *CORS_HEADERS,
+        ],
+    })
+    events = main.stream_broker.aevents()
+
+    async def forward():
+        async for event in events:
+            await send({'type': 'http.response.body', 'body': event.encode(), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def disconnected():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    # send() does not fail once the client is gone, so watch receive() for the disconnect
+    sender = asyncio.ensure_future(forward())
+    watcher = asyncio.ensure_future(disconnected())
+    try:
+        await asyncio.wait((sender, watcher), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (sender, watcher):
+            task.cancel()
+        await asyncio.gather(sender, watcher, return_exceptions=True)
+        await events.aclose()  # unsubscribes from the broker
+
+
+async def diagnose_stream_endpoint(send):
+    """One 'probe' event per check as it finishes, then the 'report'"""
+    snapshot = await blocking(main.sampler.latest)
+    if snapshot is None:
+        await send_json(send, {"error": "Metrics not available yet"}, 503)
+        return
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+            *CORS_HEADERS,
+        ],
+    })
+    results = {}
+    async for result in diagnostics.stream(snapshot):
+        results[result.name] = result
+        event = format_event('probe', json.dumps(probe_event(result)))
+        await send({'type': 'http.response.body', 'body': event.encode(), 'more_body': True})
+    event = format_event('report', json.dumps({"response": diagnostics.report(results)}))
+    await send({'type': 'http.response.body', 'body': event.encode()})
+
+
+# ---------------------------------------------------------------- WSGI fallback
+
+def _wsgi_environ(scope, body):
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f'HTTP_{key}'
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _call_wsgi(environ):
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+    result = main.app(environ, start_response)
+    try:
+        body = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return started['status'], started['headers'], body
+
+
+async def wsgi_fallback(scope, send, body):
+    status, headers, body = await blocking(_call_wsgi, _wsgi_environ(scope, body))
+    headers = [(name, value) for name, value in headers if name != b'content-length']
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [*headers, (b'content-length', str(len(body)).encode())]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+# ---------------------------------------------------------------- application
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            main.sampler.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            main.shutdown()
+            executor.shutdown(wait=False, cancel_futures=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    path, method = scope['path'], scope['method']
+    if method == 'GET' and path in SNAPSHOT_ENDPOINTS:
+        try:
+            await snapshot_endpoint(scope, send, *SNAPSHOT_ENDPOINTS[path])
+        except Exception as e:
+            print(f"❌ Error in {path}: {e}")
+            await send_json(send, {"error": f"Error in {path}: {str(e)}"}, 500)
+        return
+    if method == 'GET' and path == '/api/stream':
+        await stream_endpoint(receive, send)
+        return
+    if method == 'GET' and path == '/api/diagnose':
+        await diagnose_stream_endpoint(send)
+        return
+
+    body = await read_body(receive)
+    if method == 'POST' and path == '/api/command':
+        try:
+            command = (json.loads(body or b'{}').get('command') or '').strip().lower()
+        except (ValueError, AttributeError):
+            command = None
+        if command == 'diagnose':
+            print(f"💬 Received command: {command}")
+            try:
+                response = await in_flight.run('diagnose', diagnose)
+            except asyncio.TimeoutError:
+                response = f"❌ Error running diagnostics: no result within {DIAGNOSE_DEADLINE:.0f}s"
+            except Exception as e:
+                response = f"❌ Error running diagnostics: {str(e)}"
+            await send_json(send, {"response": response})
+            return
+
+    await wsgi_fallback(scope, send, body)
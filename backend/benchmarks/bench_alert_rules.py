@@ -0,0 +1,103 @@
+"""Benchmark: regex-per-rule alert classification vs AlertRuleEngine
+
+Classifies batches of synthetic per-interface and per-process metric samples
+with:
+
+  * regex loop - the previous _classify_alerts logic: re.search over
+                 "metric value" for every rule of every severity
+  * engine     - AlertRuleEngine.classify_batch (rules indexed by metric,
+                 numeric comparisons, first match in severity order)
+
+Run from the backend directory:
+
+    python benchmarks/bench_alert_rules.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alert_rules import AlertRuleEngine, rules_from_table
+
+SIZES = (1000, 10000, 100000)
+REPEAT = 3
+
+RULE_TABLE = {
+    'CRITICAL': [
+        ('CPU Usage', 90, "Immediate attention required"),
+        ('Memory Usage', 90, "System may become unstable"),
+        ('Disk Usage', 95, "Critical disk space"),
+        ('Interface Errors', 100, "Interface failing"),
+        ('Process CPU', 95, "Runaway process"),
+    ],
+    'WARNING': [
+        ('CPU Usage', 80, "High CPU usage"),
+        ('Memory Usage', 80, "High memory usage"),
+        ('Network Errors', 10, "Network issues detected"),
+        ('Packet Drops', 1, "Packet loss occurring"),
+        ('Interface Errors', 1, "Interface errors"),
+        ('Process CPU', 50, "Busy process"),
+        ('Process Connections', 500, "Connection-heavy process"),
+    ],
+    'INFO': [
+        ('Active Connections', 0, "Connection monitoring"),
+    ],
+}
+METRICS = ['CPU Usage', 'Memory Usage', 'Disk Usage', 'Network Errors', 'Packet Drops',
+           'Interface Errors', 'Process CPU', 'Process Connections', 'Active Connections']
+
+
+def samples(count, seed=0):
+    rng = random.Random(seed)
+    result = []
+    for i in range(count):
+        metric = rng.choice(METRICS)
+        value = rng.uniform(0, 100) if 'CPU' in metric or 'Usage' in metric else rng.randint(0, 1000)
+        result.append({'metric': metric, 'value': f"{value}", 'raw_value': value, 'device': f"dev{i % 64}"})
+    return result
+
+
+def regex_loop(metrics):
+    severities = []
+    for metric in metrics:
+        severity = 'INFO'
+        for severity_level, rules in RULE_TABLE.items():
+            for pattern, threshold, description in rules:
+                if re.search(pattern, metric['metric'] + " " + metric['value'], re.IGNORECASE):
+                    if metric['raw_value'] >= threshold:
+                        severity = severity_level
+                        break
+        severities.append(severity)
+    return severities
+
+
+def engine_batch(engine, metrics):
+    return [verdict.severity for verdict in engine.classify_batch(metrics)]
+
+
+def best_of(fn, *args):
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    engine = AlertRuleEngine(rules_from_table(RULE_TABLE))
+    print(f"best of {REPEAT}")
+    print(f"{'samples':>8} {'regex loop':>12} {'engine':>12}")
+    for size in SIZES:
+        metrics = samples(size)
+        loop = best_of(regex_loop, metrics)
+        batch = best_of(engine_batch, engine, metrics)
+        print(f"{size:>8} {loop * 1000:>10.1f}ms {batch * 1000:>10.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: rendering chat command responses vs serving them from the render cache
+
+For every built-in command with a cache policy, times:
+
+  * render  - the handler plus JSON encoding, as on every request before
+              the cache (one snapshot, so every run renders the same text)
+  * cached  - CommandRegistry.render() when the response for the current
+              snapshot (or the static response) is already cached
+
+Run from the backend directory:
+
+    python benchmarks/bench_commands.py
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from commands import CommandContext, get_command_registry
+from sampler import get_sampler
+
+LINES = ('help', 'troubleshoot dns', 'status', 'alerts', 'summary',
+         'processes', 'bandwidth', 'connections', 'interfaces')
+ITERATIONS = 2000
+
+
+def per_call(fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def main():
+    sampler = get_sampler()
+    sampler.latest()
+    sampler.stop()  # keep the snapshot fixed while measuring
+    registry = get_command_registry()
+    context = CommandContext(sampler)
+    context.registry = registry
+
+    print(f"{'command':<18} {'render':>10} {'cached':>10}")
+    for line in LINES:
+        name, *args = line.split()
+        handler = registry.get(name).handler
+        render = per_call(lambda: json.dumps({'response': handler(context, args)}, separators=(',', ':')).encode())
+        cached = per_call(lambda: registry.render(line, context))
+        print(f"{line:<18} {render * 1e6:>8.1f}us {cached * 1e6:>8.1f}us")
+
+
+if __name__ == '__main__':
+    main()
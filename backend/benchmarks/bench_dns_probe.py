@@ -0,0 +1,82 @@
+"""Benchmark: concurrent DNS resolver fan-out vs querying resolvers one at a time
+
+Starts stub DNS servers on 127.0.0.1 that answer after a fixed delay (one
+never answers) and times:
+
+  * sequential - query_server() for each resolver in turn, as the old
+                 blocking lookup walked the resolver list
+  * fan-out    - DnsProbe.probe(), every resolver queried at once
+  * cached     - DnsProbe.probe() again within the result TTL
+
+Run from the backend directory:
+
+    python benchmarks/bench_dns_probe.py
+"""
+import asyncio
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_probe import DnsProbe, query_server
+
+# Answer delay per stub server in seconds; None never answers
+DELAYS = (0.01, 0.05, 0.2, None)
+TIMEOUT = 0.5
+
+
+class StubResolver(asyncio.DatagramProtocol):
+    """Answers every A query with 192.0.2.1 after ``delay`` seconds"""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if self.delay is None:
+            return
+        header = struct.pack('!HHHHHH', struct.unpack_from('!H', data)[0], 0x8180, 1, 1, 0, 0)
+        answer = struct.pack('!HHHIH', 0xC00C, 1, 1, 60, 4) + bytes([192, 0, 2, 1])
+        reply = header + data[12:] + answer
+        asyncio.get_running_loop().call_later(self.delay, self.transport.sendto, reply, addr)
+
+
+async def run():
+    loop = asyncio.get_running_loop()
+    servers = []
+    for delay in DELAYS:
+        transport, _ = await loop.create_datagram_endpoint(lambda: StubResolver(delay), local_addr=('127.0.0.1', 0))
+        servers.append(transport.get_extra_info('sockname')[:2])
+
+    start = time.perf_counter()
+    for host, port in servers:
+        await query_server(host, port, timeout=TIMEOUT)
+    sequential = time.perf_counter() - start
+
+    probe = DnsProbe(servers=servers, timeout=TIMEOUT, resolv_conf=os.devnull)
+    start = time.perf_counter()
+    results = await probe.probe()
+    fan_out = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await probe.probe()
+    cached = time.perf_counter() - start
+
+    for result in results:
+        status = f"{result.rtt_ms:.1f} ms {result.addresses}" if result.ok else result.error
+        print(f"  {result.server:<22} {status}")
+    print(f"\nsequential {sequential * 1000:>8.1f} ms")
+    print(f"fan-out    {fan_out * 1000:>8.1f} ms")
+    print(f"cached     {cached * 1e6:>8.1f} us")
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
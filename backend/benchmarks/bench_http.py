@@ -0,0 +1,150 @@
+"""Benchmark: Flask development server vs the gunicorn production setup
+
+Starts the API in each mode, waits for the first snapshot, then drives it
+with CONNECTIONS concurrent keep-alive clients (spread over client processes)
+cycling through the polled dashboard endpoints for DURATION seconds, and
+reports requests/s and p50/p99 latency:
+
+  * dev       - python main.py (Flask dev server, debug=True, one process)
+  * gunicorn  - gunicorn -c gunicorn.conf.py main:app (sampler process +
+                workers reading snapshots from shared memory)
+
+Run from the backend directory (needs gunicorn installed and ports 5000/5001 free):
+
+    python benchmarks/bench_http.py [--duration 10] [--connections 16] [--workers 4]
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ('/api/system-status', '/api/alerts', '/api/network-stats')
+THREADS_PER_CLIENT = 4
+
+
+def start_server(mode, workers):
+    env = dict(os.environ)
+    if mode == 'dev':
+        command = [sys.executable, 'main.py']
+        port = 5000
+    else:
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                   '-b', '127.0.0.1:5001', '-w', str(workers), 'main:app']
+        port = 5001
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=15)
+            conn.request('GET', '/api/system-status')
+            if conn.getresponse().status == 200:
+                return process, port
+        except OSError:
+            pass
+        time.sleep(0.5)
+    stop_server(process)
+    raise RuntimeError(f"{mode} server did not come up on port {port}")
+
+
+def stop_server(process):
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def client(port, duration, results):
+    """One client process: THREADS_PER_CLIENT keep-alive connections, latencies in ms"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def loop(offset):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        mine = []
+        deadline = time.monotonic() + duration
+        i = offset
+        while time.monotonic() < deadline:
+            path = ENDPOINTS[i % len(ENDPOINTS)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[0] += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            mine.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=loop, args=(n,)) for n in range(THREADS_PER_CLIENT)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put((latencies, errors[0]))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_load(port, duration, connections):
+    results = multiprocessing.Queue()
+    clients = [
+        multiprocessing.Process(target=client, args=(port, duration, results))
+        for _ in range(max(1, connections // THREADS_PER_CLIENT))
+    ]
+    started = time.monotonic()
+    for process in clients:
+        process.start()
+    latencies, errors = [], 0
+    for _ in clients:
+        chunk, chunk_errors = results.get()
+        latencies.extend(chunk)
+        errors += chunk_errors
+    for process in clients:
+        process.join()
+    elapsed = time.monotonic() - started
+    return len(latencies) / elapsed, percentile(latencies, 0.5), percentile(latencies, 0.99), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--modes', default='dev,gunicorn')
+    args = parser.parse_args()
+
+    print(f"{args.connections} connections, {args.duration:.0f}s per mode, "
+          f"{os.cpu_count()} CPU(s), endpoints: {', '.join(ENDPOINTS)}")
+    print(f"{'mode':<10} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for mode in args.modes.split(','):
+        process, port = start_server(mode, args.workers)
+        try:
+            rate, p50, p99, errors = run_load(port, args.duration, args.connections)
+        finally:
+            stop_server(process)
+        print(f"{mode:<10} {rate:>9.0f} {p50:>9.1f} {p99:>9.1f} {errors:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark: per-pattern re.search loop vs LogPatternMatcher
+
+Classifies synthetic syslog-style lines against the six built-in
+NetworkLogSummarization patterns and against a generated 300-rule set, timing:
+
+  * re.search  - the original loop: re.search(pattern, line, re.IGNORECASE)
+                 for every pattern on every line
+  * compiled   - the same loop over patterns compiled once
+                 (LogPatternMatcher with prefilter=False)
+  * prefilter  - one case-folded literal scan per line, then only the
+                 candidate patterns (LogPatternMatcher default)
+
+Run from the backend directory:
+
+    python benchmarks/bench_log_patterns.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_patterns import LogPatternMatcher
+
+LINES = 20000
+REPEAT = 3
+
+BUILTIN_PATTERNS = {
+    'authentication_failures': r'authentication failed|login failed|invalid credentials|access denied',
+    'connection_issues': r'connection.*lost|disconnected|timeout|failed to connect',
+    'dns_issues': r'dns.*error|domain.*not.*found|name resolution',
+    'bandwidth_issues': r'bandwidth.*exceeded|high.*usage|slow.*performance',
+    'security_threats': r'firewall.*blocked|unauthorized.*access|port.*scan',
+    'service_disruptions': r'service.*stopped|dhcp.*failure|vpn.*disconnected',
+}
+
+SERVICES = ['sshd', 'kernel', 'systemd', 'NetworkManager', 'dhclient', 'cron', 'nginx', 'openvpn']
+MESSAGES = [
+    'Accepted publickey for admin from 10.0.{a}.{b} port {port} ssh2',
+    'Started Session {n} of user admin.',
+    'eth0: link up, 1000Mbps, full-duplex',
+    'GET /api/health HTTP/1.1 200 {n}',
+    'pam_unix(cron:session): session opened for user root',
+    'Authentication failed for invalid user guest from 10.0.{a}.{b}',
+    'Connection to 10.0.{a}.{b} lost after {n} seconds',
+    'DNS query error for host{n}.example.com',
+    'Firewall blocked inbound packet from 10.0.{a}.{b}:{port}',
+    'VPN tunnel disconnected, reconnecting in {n}s',
+    'DHCPREQUEST on eth0 to 10.0.0.1 port 67',
+]
+
+
+def synthetic_lines(count, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        message = rng.choice(MESSAGES).format(
+            a=rng.randint(0, 255), b=rng.randint(1, 254),
+            port=rng.randint(1024, 65535), n=rng.randint(1, 99999))
+        lines.append(f"Oct 17 12:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d} host "
+                     f"{rng.choice(SERVICES)}[{rng.randint(100, 9999)}]: {message}")
+    return lines
+
+
+def large_rule_set(count, seed=1):
+    """The built-in patterns plus ``count`` generated rules in the same style"""
+    rng = random.Random(seed)
+    nouns = ['router', 'switch', 'uplink', 'tunnel', 'bgp', 'ospf', 'radius', 'ldap', 'ntp',
+             'snmp', 'certificate', 'license', 'fan', 'psu', 'interface', 'vlan', 'arp', 'lease']
+    verbs = ['flapping', 'expired', 'unreachable', 'degraded', 'rejected', 'overheating',
+             'mismatch', 'exhausted', 'reset', 'down']
+    patterns = dict(BUILTIN_PATTERNS)
+    while len(patterns) < count + len(BUILTIN_PATTERNS):
+        noun, verb = rng.choice(nouns), rng.choice(verbs)
+        patterns[f"{noun}_{verb}_{len(patterns)}"] = rf"{noun}\d*.*{verb}|{verb} {noun}"
+    return patterns
+
+
+def baseline(patterns, lines):
+    hits = 0
+    for line in lines:
+        for pattern in patterns.values():
+            if re.search(pattern, line, re.IGNORECASE):
+                hits += 1
+    return hits
+
+
+def matcher(patterns, lines, prefilter):
+    m = LogPatternMatcher(patterns, prefilter=prefilter)
+    return sum(len(m.match(line)) for line in lines)
+
+
+def best_of(fn, *args):
+    best = None
+    result = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    lines = synthetic_lines(LINES)
+    print(f"{LINES} lines, best of {REPEAT}")
+    print(f"{'rules':>6} {'re.search':>12} {'compiled':>12} {'prefilter':>12}")
+    for patterns in (BUILTIN_PATTERNS, large_rule_set(300)):
+        base, expected = best_of(baseline, patterns, lines)
+        compiled, hits = best_of(matcher, patterns, lines, False)
+        assert hits == expected, (hits, expected)
+        filtered, hits = best_of(matcher, patterns, lines, True)
+        assert hits == expected, (hits, expected)
+        print(f"{len(patterns):>6} {base * 1000:>10.1f}ms {compiled * 1000:>10.1f}ms {filtered * 1000:>10.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark: /proc/net fast path vs the psutil.net_connections() path
+
+Builds synthetic /proc/net/tcp tables with 1k, 10k and 100k sockets in a
+temporary procfs and times:
+
+  * psutil    - psutil's own /proc/net parser plus its /proc/<pid>/fd inode
+                scan, followed by summarize_connections() (what the sampler
+                did before the fast path)
+  * procnet   - procnet.scan_tables() counts only (what every snapshot needs)
+  * procnet+pid - the same plus lazy inode -> pid resolution, i.e. the cost
+                when a per-process view is requested
+
+Linux only. Run from the backend directory:
+
+    python benchmarks/bench_procnet.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from psutil import _common, _pslinux
+
+import connection_table
+import procnet
+
+SIZES = (1000, 10000, 100000)
+REPEAT = 5
+HEADER = ("  sl  local_address rem_address   st tx_queue rx_queue tr tm->when "
+          "retrnsmt   uid  timeout inode\n")
+STATES = ['01'] * 6 + ['06'] * 2 + ['0A', '08']
+
+
+def write_tables(procfs, count):
+    """Write a synthetic /proc/net/tcp with ``count`` sockets and empty other tables"""
+    net = os.path.join(procfs, 'net')
+    os.makedirs(net, exist_ok=True)
+    rng = random.Random(count)
+    with open(os.path.join(net, 'tcp'), 'w') as f:
+        f.write(HEADER)
+        for i in range(count):
+            state = rng.choice(STATES)
+            local = f"0100007F:{rng.randint(1024, 65535):04X}"
+            remote = "00000000:0000" if state == '0A' else f"{rng.randint(1, 2**32 - 1):08X}:{rng.choice((80, 443, 22)):04X}"
+            inode = 0 if state == '06' else 1000000 + i
+            f.write(f"{i:4d}: {local} {remote} {state} 00000000:00000000 00:00000000 "
+                    f"00000000     0        0 {inode} 1 0000000000000000 20 4 30 10 -1\n")
+    for name in ('tcp6', 'udp', 'udp6'):
+        with open(os.path.join(net, name), 'w') as f:
+            f.write(HEADER)
+
+
+def psutil_path(procfs):
+    conns = _pslinux.Connections()
+    inodes = conns.get_all_inodes()
+    rows = []
+    for name, family, type_ in procnet.PROC_NET_TABLES:
+        path = os.path.join(procfs, 'net', name)
+        for fd, fam, typ, laddr, raddr, status, pid in conns.process_inet(path, family, type_, inodes):
+            rows.append(_common.sconn(fd, fam, typ, laddr, raddr, status, pid))
+    return connection_table.summarize_connections(rows)
+
+
+def procnet_path(procfs):
+    return connection_table.summarize_proc_net(procfs)
+
+
+def procnet_with_pids(procfs):
+    # Same work as ConnectionSummary.per_pid, but owners come from the real
+    # /proc so the fd scan costs the same as psutil's
+    summary = connection_table.summarize_proc_net(procfs)
+    owners = procnet.socket_inode_owners('/proc')
+    per_pid = Counter(owners[inode] for inode in procnet.socket_inodes(procfs) if inode in owners)
+    return summary, per_pid
+
+
+def best_of(fn, procfs):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(procfs)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    if not procnet.is_supported():
+        print("❌ /proc/net is not available - this benchmark is Linux only")
+        return
+    print(f"Host: {len(psutil.pids())} processes, best of {REPEAT} runs (ms)")
+    print(f"{'sockets':>8} {'psutil':>10} {'procnet':>10} {'procnet+pid':>12} {'speedup':>8}")
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as procfs:
+            write_tables(procfs, size)
+            assert psutil_path(procfs).by_status == procnet_path(procfs).by_status
+            base = best_of(psutil_path, procfs)
+            fast = best_of(procnet_path, procfs)
+            with_pids = best_of(procnet_with_pids, procfs)
+        print(f"{size:>8} {base:>10.1f} {fast:>10.1f} {with_pids:>12.1f} {base / fast:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Array-backed column tables for per-core, per-NIC and per-mount breakdowns
+
+A ColumnTable keeps one typed ``array`` per column plus the row keys, so a
+64-core / 20-NIC snapshot costs a few hundred bytes per column instead of a
+dict or namedtuple per row.
+
+``encode_tables`` packs tables into a compact little-endian binary form that
+the API serves next to JSON:
+
+    b'NMCT' | u8 version | u64 seq | f64 timestamp | u16 table count
+    per table:  str name | u32 rows | u16 columns
+                rows x str key
+                per column: str name | u8 typecode (ASCII) | rows x item
+    str = u16 byte length + UTF-8 bytes
+
+Typecodes are those of the ``array`` module ('Q' u64, 'd' f64, 'B' u8 ...)
+with standard sizes, so any client can decode with plain struct reads.
+"""
+import struct
+import sys
+from array import array
+
+MAGIC = b'NMCT'
+VERSION = 1
+MIMETYPE = 'application/x-netmgmt-columns'
+
+_HEADER = struct.Struct('<4sBQdH')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_TABLE = struct.Struct('<IH')
+
+
+class ColumnTable:
+    """Rows addressed by key, values stored column-wise in typed arrays"""
+
+    __slots__ = ('keys', 'columns')
+
+    def __init__(self, keys, columns):
+        self.keys = tuple(keys)
+        self.columns = dict(columns)
+        for name, column in self.columns.items():
+            if len(column) != len(self.keys):
+                raise ValueError(f"Column '{name}' has {len(column)} values for {len(self.keys)} rows")
+
+    @classmethod
+    def from_rows(cls, rows, schema):
+        """Build from {key: row} where rows have the ``schema`` ({column: typecode}) fields
+
+        Rows can be namedtuples/objects (read with getattr) or dicts.
+        """
+        keys = list(rows)
+        columns = {}
+        for name, typecode in schema.items():
+            values = []
+            for key in keys:
+                row = rows[key]
+                value = row[name] if isinstance(row, dict) else getattr(row, name)
+                values.append(value if value is not None else 0)
+            columns[name] = array(typecode, values)
+        return cls(keys, columns)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __bool__(self):
+        return bool(self.keys)
+
+    def __getstate__(self):
+        return self.keys, self.columns
+
+    def __setstate__(self, state):
+        self.keys, self.columns = state
+
+    def column(self, name):
+        return self.columns[name]
+
+    def row(self, key):
+        """One row as a dict (KeyError if ``key`` is not in the table)"""
+        index = self.keys.index(key)
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def items(self):
+        """(key, row dict) pairs"""
+        for index, key in enumerate(self.keys):
+            yield key, {name: column[index] for name, column in self.columns.items()}
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    def to_dict(self):
+        """Columnar JSON form: {'keys': [...], 'columns': {name: [...]}}"""
+        return {
+            'keys': list(self.keys),
+            'columns': {name: column.tolist() for name, column in self.columns.items()},
+        }
+
+
+EMPTY_TABLE = ColumnTable((), {})
+
+
+def _pack_str(text):
+    data = text.encode('utf-8')
+    return _U16.pack(len(data)) + data
+
+
+def _unpack_str(data, offset):
+    (length,) = _U16.unpack_from(data, offset)
+    offset += _U16.size
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+
+def encode_tables(tables, seq=0, timestamp=0.0):
+    """Pack {name: ColumnTable} into the binary format described above"""
+    parts = [_HEADER.pack(MAGIC, VERSION, seq, timestamp, len(tables))]
+    for name, table in tables.items():
+        parts.append(_pack_str(name))
+        parts.append(_TABLE.pack(len(table), len(table.columns)))
+        parts.extend(_pack_str(key) for key in table.keys)
+        for column_name, column in table.columns.items():
+            parts.append(_pack_str(column_name))
+            parts.append(column.typecode.encode('ascii'))
+            if sys.byteorder != 'little':
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+    return b''.join(parts)
+
+
+def decode_tables(data):
+    """Inverse of encode_tables: (seq, timestamp, {name: ColumnTable})"""
+    magic, version, seq, timestamp, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a column table payload")
+    offset = _HEADER.size
+    tables = {}
+    for _ in range(count):
+        name, offset = _unpack_str(data, offset)
+        rows, column_count = _TABLE.unpack_from(data, offset)
+        offset += _TABLE.size
+        keys = []
+        for _ in range(rows):
+            key, offset = _unpack_str(data, offset)
+            keys.append(key)
+        columns = {}
+        for _ in range(column_count):
+            column_name, offset = _unpack_str(data, offset)
+            column = array(chr(data[offset]))
+            offset += 1
+            size = column.itemsize * rows
+            column.frombytes(data[offset:offset + size])
+            if sys.byteorder != 'little':
+                column.byteswap()
+            offset += size
+            columns[column_name] = column
+        tables[name] = ColumnTable(keys, columns)
+    return seq, timestamp, tables
@@ -0,0 +1,657 @@
+"""ChatOps command registry shared by POST /api/command and the CLI assistant
+
+A command line is split into a name and arguments (``troubleshoot dns``),
+the name is looked up in a dict and the handler is called with a
+CommandContext. Handlers render from the context's snapshot - taken once
+per request, so a batch of commands reads one consistent snapshot and
+none of them calls psutil itself.
+
+Responses are cached with their JSON encoding. A ``static`` command
+(help, troubleshooting guides) is rendered once. A ``snapshot`` command is
+rendered again only when the snapshot's seq changes, so any number of
+requests between two samples share one rendering.
+"""
+import json
+import socket
+import threading
+from collections import namedtuple
+
+from dns_probe import get_dns_probe
+from payloads import build_alerts, build_network_stats, build_system_status, format_bytes
+from subnet_scan import get_subnet_scanner, parse_network
+
+Command = namedtuple('Command', ['name', 'handler', 'usage', 'summary', 'section', 'max_args', 'examples', 'cache',
+                                 'per_request'])
+
+# A response and its pre-encoded {"response": text} JSON body
+Rendered = namedtuple('Rendered', ['text', 'json'])
+
+# Cache policies: rendered once, or once per snapshot seq
+STATIC = 'static'
+PER_SNAPSHOT = 'snapshot'
+
+SECTIONS = {
+    'monitoring': "📊 MONITORING COMMANDS",
+    'network': "🔍 NETWORK COMMANDS",
+    'troubleshooting': "🛠️ TROUBLESHOOTING COMMANDS",
+    'session': "💬 SESSION COMMANDS",
+}
+
+# Most commands one request may batch
+MAX_BATCH = 10
+
+# Most hosts listed per subnet by 'scan'
+MAX_SCAN_HOSTS = 20
+
+# Most distinct command lines kept rendered per registry
+MAX_RENDERED = 256
+
+
+def parse_command(text):
+    """(name, args) for a command line; both lower-cased, name is None for a blank line"""
+    parts = (text or '').strip().lower().split()
+    if not parts:
+        return None, []
+    return parts[0], parts[1:]
+
+
+class CommandContext:
+    """What handlers read: the sampler, the request's snapshot and the diagnose runner"""
+
+    def __init__(self, sampler, diagnose=None):
+        self.sampler = sampler
+        self.diagnose = diagnose
+        self.registry = None  # set by CommandRegistry.dispatch
+        self.runs = {}  # command name -> times run in this request
+        self._snapshot = None
+
+    @property
+    def snapshot(self):
+        """Snapshot shared by every command of this request"""
+        if self._snapshot is None:
+            self._snapshot = self.sampler.latest()
+            if self._snapshot is None:
+                raise RuntimeError("Metrics not available yet")
+        return self._snapshot
+
+
+class CommandRegistry:
+    """Command name -> Command, in registration order (the order help lists them)"""
+
+    def __init__(self, commands=None):
+        self._commands = dict(commands or {})
+        self._rendered = {}  # (name, args) -> (snapshot version or None, Rendered)
+        self._lock = threading.Lock()
+
+    def register(self, name, handler, usage=None, summary='', section='monitoring', max_args=0, examples=(),
+                 cache=None, per_request=None):
+        """Add or replace a command; ``handler(context, args)`` returns the response text
+
+        ``cache`` is STATIC for a response that never changes, PER_SNAPSHOT
+        for one that only depends on the snapshot, or None to run the
+        handler every time. ``per_request`` caps how often the command may
+        run in one (batch) request.
+        """
+        self._commands[name] = Command(name, handler, usage or name, summary, section, max_args, tuple(examples), cache,
+                                       per_request)
+        with self._lock:
+            self._rendered.clear()  # help lists the commands
+
+    def command(self, name, **kwargs):
+        """Decorator form of register()"""
+        def decorator(handler):
+            self.register(name, handler, **kwargs)
+            return handler
+        return decorator
+
+    def copy(self):
+        """Independent registry with the same commands, to extend for one front end"""
+        return CommandRegistry(self._commands)
+
+    def __contains__(self, name):
+        return name in self._commands
+
+    def __iter__(self):
+        return iter(self._commands.values())
+
+    def get(self, name):
+        return self._commands.get(name)
+
+    def render(self, text, context):
+        """Parse one command line and return its Rendered response, from cache when current"""
+        name, args = parse_command(text)
+        if name is None:
+            return _EMPTY_LINE
+        command = self._commands.get(name)
+        if command is None:
+            return _rendered(f"Unknown command '{name}'. Type 'help' for available commands.")
+        if len(args) > command.max_args:
+            return _rendered(f"Usage: {command.usage}")
+        if command.per_request is not None:
+            runs = context.runs.get(name, 0)
+            if runs >= command.per_request:
+                return _rendered(f"❌ '{name}' is limited to {command.per_request} per request")
+            context.runs[name] = runs + 1
+        context.registry = self
+        try:
+            if command.cache is None:
+                return _rendered(command.handler(context, args))
+            # seq restarts with the sampler; the timestamp tells those snapshots apart
+            snapshot = context.snapshot if command.cache == PER_SNAPSHOT else None
+            version = (snapshot.seq, snapshot.timestamp) if snapshot else None
+            key = (name, tuple(args))
+            cached = self._rendered.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            rendered = _rendered(command.handler(context, args))
+            with self._lock:
+                if key not in self._rendered and len(self._rendered) >= MAX_RENDERED:
+                    del self._rendered[next(iter(self._rendered))]
+                self._rendered[key] = (version, rendered)
+            return rendered
+        except Exception as e:
+            print(f"❌ Command '{name}' failed: {e}")
+            return _rendered(f"❌ Error running '{name}': {str(e)}")
+
+    def dispatch(self, text, context):
+        """Parse one command line and return the response text"""
+        return self.render(text, context).text
+
+    def dispatch_batch(self, lines, context):
+        """[{'command', 'response'}] for several command lines, all reading one snapshot"""
+        return [{'command': line, 'response': self.dispatch(line, context)} for line in lines]
+
+    def help_text(self):
+        lines = ["🤖 NETWORK MANAGEMENT ASSISTANT - Available Commands:"]
+        for section, title in SECTIONS.items():
+            commands = [command for command in self if command.section == section]
+            if not commands:
+                continue
+            lines.append(f"\n{title}:")
+            for command in commands:
+                for usage, summary in command.examples or [(command.usage, command.summary)]:
+                    lines.append(f"• {usage} - {summary}")
+        lines.append("\n💡 Type any command above to get real-time system information!")
+        return "\n".join(lines)
+
+
+def _rendered(text):
+    # Same compact encoding as jsonify() outside debug mode
+    return Rendered(text, json.dumps({'response': text}, separators=(',', ':')).encode())
+
+
+_EMPTY_LINE = _rendered("Please enter a command. Type 'help' for available commands.")
+
+
+_default_registry = CommandRegistry()
+
+
+def get_command_registry():
+    """Return the built-in commands"""
+    return _default_registry
+
+
+def _ipv4_addresses(addrs):
+    return [addr for addr in addrs if addr.family == socket.AF_INET]
+
+
+@_default_registry.command('help', summary="Show this help message", cache=STATIC)
+def show_help(context, args):
+    return context.registry.help_text()
+
+
+@_default_registry.command('status', summary="Show current network status", cache=PER_SNAPSHOT)
+def show_status(context, args):
+    status_data = build_system_status(context.snapshot)
+    disk_usage = status_data['disk_usage']
+    disk_text = f"{disk_usage:.1f}%" if disk_usage is not None else "unknown"
+    return f"""🌐 REAL-TIME NETWORK STATUS:
+
+🏠 BASIC INFORMATION:
+  • Hostname: {status_data['hostname']}
+  • Local IP: {status_data['local_ip']}
+  • Internet: {status_data['internet']}
+  • System Uptime: {status_data['uptime']}
+
+📊 PERFORMANCE METRICS:
+  • CPU Usage: {status_data['cpu_usage']:.1f}%
+  • Memory Usage: {status_data['memory_usage']:.1f}%
+  • Disk Usage: {disk_text}
+  • System Health: {status_data['health_score']}/100
+
+🔗 NETWORK ACTIVITY:
+  • Active Connections: {status_data['active_connections']}
+  • Data Sent: {format_bytes(status_data['network_sent'])}
+  • Data Received: {format_bytes(status_data['network_received'])}
+  • Network Errors: {status_data['network_errors']}
+
+⏰ Last Updated: {context.snapshot.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"""
+
+
+@_default_registry.command('alerts', summary="Display current system alerts", cache=PER_SNAPSHOT)
+def show_alerts(context, args):
+    alerts_data = build_alerts(context.snapshot)
+    summary = alerts_data['summary']
+    response = f"""🚨 REAL-TIME ALERT SUMMARY:
+
+📈 ALERT OVERVIEW:
+  • Overall Status: {summary['health_status']}
+  • Critical Alerts: {len(alerts_data['CRITICAL'])}
+  • Warning Alerts: {len(alerts_data['WARNING'])}
+  • Informational Alerts: {len(alerts_data['INFO'])}
+  • Total Active Alerts: {summary['total_alerts']}
+
+🔴 CRITICAL ALERTS:"""
+    for alert in alerts_data['CRITICAL'][:3]:
+        response += f"\n  • {alert.get('message', 'Unknown')}"
+    if not alerts_data['CRITICAL']:
+        response += "\n  • None (Good!)"
+
+    response += "\n\n🟡 WARNING ALERTS:"
+    for alert in alerts_data['WARNING'][:3]:
+        response += f"\n  • {alert.get('message', 'Unknown')}"
+    if not alerts_data['WARNING']:
+        response += "\n  • None (Good!)"
+    return response
+
+
+@_default_registry.command('summary', summary="Show log analysis summary", cache=PER_SNAPSHOT)
+def show_summary(context, args):
+    network_data = build_network_stats(context.snapshot, processes=context.sampler.processes)
+    summary = network_data['summary']
+    analysis = network_data['analysis']
+    response = f"""📋 NETWORK LOG ANALYSIS SUMMARY:
+
+📊 EXECUTIVE SUMMARY:
+  • Network Health Score: {summary['health_score']}/100
+  • Total Log Entries Analyzed: {analysis['total_logs']}
+  • Issue Patterns Detected: {len(analysis['patterns_detected'])}
+
+📈 SEVERITY DISTRIBUTION:"""
+    for severity, count in analysis['severity_distribution'].items():
+        icon = "🔵" if severity == 'INFO' else "🟡" if severity == 'WARNING' else "🔴"
+        response += f"\n  • {icon} {severity}: {count} events"
+
+    response += "\n\n🔍 RECENT LOG ENTRIES:"
+    for log in network_data['logs'][:5]:
+        icon = "🔵" if log['severity'] == 'INFO' else "🟡" if log['severity'] == 'WARNING' else "🔴"
+        time_str = log['timestamp'][:19].replace('T', ' ')
+        response += f"\n  • {icon} [{log['source']}] {log['message']}"
+        response += f"\n    ⏰ {time_str}"
+
+    response += "\n\n💡 RECOMMENDATIONS:"
+    for rec in summary['recommendations']:
+        response += f"\n  • {rec}"
+    return response
+
+
+@_default_registry.command('diagnose', summary="Run comprehensive diagnostics")
+def run_diagnose(context, args):
+    if context.diagnose is None:
+        return "❌ Diagnostics are not available here"
+    return context.diagnose()
+
+
+def _scan_lines(scan):
+    lines = [f"\n\n  🧭 {scan.network}" + (f" ({scan.interface})" if scan.interface else "")
+             + f": {len(scan.hosts)}/{scan.scanned} hosts up in {scan.elapsed_ms / 1000:.1f}s"]
+    for host in scan.hosts[:MAX_SCAN_HOSTS]:
+        ports = ', '.join(str(port) for port in host.open_ports) or "none open"
+        lines.append(f"\n    • {host.address} ({host.rtt_ms:.1f} ms) | ports: {ports}")
+    if len(scan.hosts) > MAX_SCAN_HOSTS:
+        lines.append(f"\n    … and {len(scan.hosts) - MAX_SCAN_HOSTS} more")
+    return "".join(lines)
+
+
+@_default_registry.command('scan', usage='scan [cidr]', summary="Discover hosts on the attached subnets",
+                           section='network', max_args=1, per_request=1,
+                           examples=[('scan', "Discover hosts on the attached subnets"),
+                                     ('scan <cidr>', "Discover hosts on part of an attached subnet, "
+                                                     "e.g. scan 192.168.1.0/24")])
+def scan_network(context, args):
+    # Sweeps are cached per subnet and shared by concurrent callers, so repeat scans are instant
+    scanner = get_subnet_scanner()
+    if_addrs = context.snapshot.if_addrs
+    if args:
+        try:
+            interface, network = parse_network(args[0], if_addrs, scanner.max_hosts)
+        except ValueError as e:
+            return f"❌ Cannot scan '{args[0]}': {e}"
+        scans = [scanner.scan(network, interface)]
+    else:
+        scans = scanner.scan_attached(if_addrs)
+
+    response = "🔍 NETWORK SCAN RESULTS:"
+    if not scans:
+        response += "\n\n  ⚠️ No IPv4 subnets attached (loopback is skipped; try 'scan <cidr>')"
+    for scan in scans:
+        response += _scan_lines(scan)
+
+    connections = context.snapshot.connections
+    response += f"""
+
+🔗 CONNECTION SUMMARY:
+  • Established Connections: {connections.established_count}
+  • Listening Ports: {connections.listen_count}
+  • Total Connections: {connections.total}
+
+💡 TCP ports probed: {', '.join(str(port) for port in scanner.ports)} | results cached for {scanner.ttl:g}s"""
+    return response
+
+
+@_default_registry.command('processes', summary="Show top network processes",
+                           section='network', cache=PER_SNAPSHOT)
+def show_processes(context, args):
+    # Top 8 processes from the per-process connection counts
+    top_processes = context.snapshot.connections.top_pids(8)
+    response = """🖥️ TOP NETWORK PROCESSES:
+
+┌──────────────────────────────┬──────────┬────────────┬────────┐
+│ Process Name                 │ PID      │ Connections│ CPU %  │
+├──────────────────────────────┼──────────┼────────────┼────────┤"""
+    for pid, conn_count in top_processes:
+        process = context.sampler.processes.info(pid)
+        if process:
+            name = process['name'][:25]
+            cpu = f"{process['cpu_percent']:.1f}" if process['cpu_percent'] is not None else "..."
+            response += f"\n│ {name:<26} │ {pid:<8} │ {conn_count:<10} │ {cpu:<6} │"
+        else:
+            response += f"\n│ Unknown Process {'':<9} │ {pid:<8} │ {conn_count:<10} │ {'N/A':<6} │"
+
+    response += "\n└──────────────────────────────┴──────────┴────────────┴────────┘"
+    response += f"\n\n📊 Total processes with network activity: {len(top_processes)}"
+    return response
+
+
+@_default_registry.command('bandwidth', summary="Show bandwidth usage statistics",
+                           section='network', cache=PER_SNAPSHOT)
+def show_bandwidth(context, args):
+    # Current throughput from counter deltas, plus totals since boot
+    snapshot = context.snapshot
+    net_io = snapshot.net_io
+    rates = snapshot.net_rates
+    if rates:
+        response = f"""📊 BANDWIDTH USAGE STATISTICS:
+
+⚡ CURRENT THROUGHPUT:
+  • Upload: {format_bytes(rates['bytes_sent_per_sec'])}/s
+  • Download: {format_bytes(rates['bytes_recv_per_sec'])}/s
+  • Packets: {rates['packets_sent_per_sec']:.1f}/s sent | {rates['packets_recv_per_sec']:.1f}/s received
+  • Errors: {rates['errin_per_sec'] + rates['errout_per_sec']:.2f}/s
+  • Drops: {rates['dropin_per_sec'] + rates['dropout_per_sec']:.2f}/s
+
+📡 PER-INTERFACE THROUGHPUT:"""
+        busiest = sorted(snapshot.nic_rates.items(),
+                         key=lambda x: x[1]['bytes_sent_per_sec'] + x[1]['bytes_recv_per_sec'],
+                         reverse=True)[:5]
+        for nic, nic_rates in busiest:
+            response += f"\n  • {nic}: ↑ {format_bytes(nic_rates['bytes_sent_per_sec'])}/s | ↓ {format_bytes(nic_rates['bytes_recv_per_sec'])}/s"
+    else:
+        response = """📊 BANDWIDTH USAGE STATISTICS:
+
+⚡ CURRENT THROUGHPUT:
+  • Measuring... (rates are available after the next sample)"""
+
+    response += f"""
+
+📈 DATA TRANSFER (since boot):
+  • Total Sent: {format_bytes(net_io.bytes_sent)}
+  • Total Received: {format_bytes(net_io.bytes_recv)}
+  • Total Data: {format_bytes(net_io.bytes_sent + net_io.bytes_recv)}
+
+📦 PACKET STATISTICS:
+  • Packets Sent: {net_io.packets_sent:,}
+  • Packets Received: {net_io.packets_recv:,}
+  • Total Packets: {net_io.packets_sent + net_io.packets_recv:,}
+
+❌ ERROR STATISTICS:
+  • Errors In: {net_io.errin}
+  • Errors Out: {net_io.errout}
+  • Total Errors: {net_io.errin + net_io.errout}
+
+📉 PACKET LOSS:
+  • Dropped In: {net_io.dropin}
+  • Dropped Out: {net_io.dropout}
+  • Total Dropped: {net_io.dropin + net_io.dropout}
+
+💡 Throughput measured over the last {context.sampler.interval:.0f}s sampling interval"""
+    return response
+
+
+@_default_registry.command('connections', summary="Show active network connections",
+                           section='network', cache=PER_SNAPSHOT)
+def show_connections(context, args):
+    connections = context.snapshot.connections
+    response = f"""🔗 ACTIVE NETWORK CONNECTIONS:
+
+📊 CONNECTION OVERVIEW:
+  • Total Established: {connections.established_count}
+  • Total Connections: {connections.total}
+  • Connection States:"""
+    for status, count in list(connections.by_status.items())[:5]:
+        response += f"\n    • {status}: {count}"
+
+    response += "\n\n🌐 RECENT ESTABLISHED CONNECTIONS:"
+    for conn in connections.established[:5]:
+        local_addr = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else "N/A"
+        remote_addr = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "N/A"
+        response += f"\n  • {local_addr} ↔ {remote_addr}"
+        if conn.pid:
+            response += f"\n    └─ Process: {context.sampler.processes.name(conn.pid)} (PID: {conn.pid})"
+    return response
+
+
+@_default_registry.command('interfaces', summary="Show network interface details",
+                           section='network', cache=PER_SNAPSHOT)
+def show_interfaces(context, args):
+    snapshot = context.snapshot
+    response = """📡 NETWORK INTERFACE DETAILS:
+
+┌──────────────────────────────┬──────────┬────────┬──────────┐
+│ Interface Name               │ Status   │ Speed  │ MTU      │
+├──────────────────────────────┼──────────┼────────┼──────────┤"""
+    interfaces = list(snapshot.if_stats.items())[:8]
+    for interface, stats in interfaces:
+        status = "✅ UP" if stats.isup else "❌ DOWN"
+        speed = f"{stats.speed}Mbps" if stats.speed > 0 else "N/A"
+        response += f"\n│ {interface[:26]:<26} │ {status:<8} │ {speed:<6} │ {stats.mtu:<8} │"
+
+    response += "\n└──────────────────────────────┴──────────┴────────┴──────────┘"
+    response += f"\n\n📊 Total interfaces detected: {len(interfaces)}"
+
+    # IP addresses of the first 3 interfaces
+    response += "\n\n🌐 IP ADDRESSES:"
+    ip_count = 0
+    for interface, addrs in list(snapshot.if_addrs.items())[:3]:
+        response += f"\n  📡 {interface}:"
+        for addr in _ipv4_addresses(addrs):
+            if ip_count < 6:
+                response += f"\n    • {addr.address}"
+                ip_count += 1
+    return response
+
+
+@_default_registry.command('dns', summary="Query every DNS resolver and compare response times",
+                           section='network')
+def show_dns(context, args):
+    # Raw queries to each resolver at once; cached for a few seconds by the probe
+    probe = get_dns_probe()
+    results = probe.probe_sync()
+    response = f"""🧭 DNS RESOLVER HEALTH (A {probe.query_name}):
+"""
+    for result in results:
+        if result.ok:
+            addresses = f" → {', '.join(result.addresses[:2])}" if result.addresses else ""
+            response += f"\n  ✅ {result.server} ({result.source}): {result.rtt_ms:.1f} ms{addresses}"
+        else:
+            response += f"\n  ❌ {result.server} ({result.source}): {result.rcode or result.error}"
+    if not results:
+        response += "\n  ⚠️ No resolvers found in /etc/resolv.conf or NETMGMT_DNS_SERVERS"
+
+    answered = [result for result in results if result.ok]
+    response += f"\n\n📊 {len(answered)}/{len(results)} resolvers answered"
+    if answered:
+        fastest = min(answered, key=lambda result: result.rtt_ms)
+        response += f" | fastest: {fastest.server} ({fastest.rtt_ms:.1f} ms)"
+    if len(answered) < len(results):
+        response += "\n💡 Run 'troubleshoot dns' for steps to fix failing resolvers"
+    return response
+
+
+TROUBLESHOOTING_TOPICS = {
+    'internet': "Internet connectivity issues",
+    'wifi': "WiFi connection problems",
+    'slow': "Slow network performance",
+    'dns': "DNS resolution issues",
+}
+
+TROUBLESHOOTING_GUIDES = {
+    'internet': """🔧 TROUBLESHOOTING: INTERNET CONNECTIVITY
+
+🚨 SYMPTOMS:
+  • Cannot access websites
+  • No internet connection
+  • Limited connectivity
+
+🔍 DIAGNOSTIC STEPS:
+
+1️⃣ BASIC CHECKS:
+   • Check physical network cable connections
+   • Verify WiFi is connected (if using wireless)
+   • Restart your router and modem
+   • Check if other devices have internet access
+
+2️⃣ NETWORK DIAGNOSIS:
+   • Ping your gateway: ping 192.168.1.1
+   • Ping Google DNS: ping 8.8.8.8
+   • Flush DNS cache: ipconfig /flushdns
+   • Renew IP address: ipconfig /renew
+
+3️⃣ ADVANCED TROUBLESHOOTING:
+   • Check firewall settings
+   • Verify DNS server settings
+   • Test with different DNS (8.8.8.8, 1.1.1.1)
+   • Check for proxy settings
+
+4️⃣ CONTACT SUPPORT:
+   • Contact your ISP if issue persists
+   • Provide error messages and diagnostic results
+
+💡 Run 'diagnose' command for automated system checks""",
+    'wifi': """🔧 TROUBLESHOOTING: WIFI CONNECTIVITY
+
+🚨 SYMPTOMS:
+  • Cannot connect to WiFi
+  • Intermittent WiFi connection
+  • Slow WiFi speeds
+
+🔍 TROUBLESHOOTING STEPS:
+
+1️⃣ BASIC CHECKS:
+   • Move closer to the wireless access point
+   • Check if WiFi is enabled on device
+   • Restart your wireless router
+   • Check for WiFi signal interference
+
+2️⃣ CONNECTION ISSUES:
+   • Forget and reconnect to the WiFi network
+   • Check WiFi password is correct
+   • Verify router broadcast settings
+   • Check for too many connected devices
+
+3️⃣ DRIVER AND SETTINGS:
+   • Update wireless adapter drivers
+   • Check power management settings
+   • Verify network adapter properties
+   • Reset network settings
+
+4️⃣ ADVANCED TROUBLESHOOTING:
+   • Change WiFi channel on router
+   • Check for firmware updates
+   • Test with different security protocols
+   • Monitor signal strength and quality
+
+💡 Run 'scan' command to discover hosts on your attached subnets""",
+    'slow': """🔧 TROUBLESHOOTING: SLOW NETWORK PERFORMANCE
+
+🚨 SYMPTOMS:
+  • Web pages load slowly
+  • File transfers take long time
+  • High latency in applications
+
+🔍 PERFORMANCE ANALYSIS:
+
+1️⃣ IDENTIFY BOTTLENECKS:
+   • Run speed test to measure actual performance
+   • Check for bandwidth-intensive applications
+   • Monitor network usage in Task Manager
+   • Identify peak usage times
+
+2️⃣ NETWORK OPTIMIZATION:
+   • Restart networking equipment
+   • Check for background updates/downloads
+   • Limit bandwidth-heavy applications
+   • Optimize WiFi channel selection
+
+3️⃣ SYSTEM OPTIMIZATION:
+   • Clear browser cache and cookies
+   • Update network drivers
+   • Check for malware/viruses
+   • Optimize system performance
+
+4️⃣ INFRASTRUCTURE CHECKS:
+   • Contact network administrator
+   • Check router/modem specifications
+   • Verify internet plan bandwidth
+   • Test with wired connection
+
+💡 Run 'bandwidth' command to see current network usage""",
+    'dns': """🔧 TROUBLESHOOTING: DNS RESOLUTION ISSUES
+
+🚨 SYMPTOMS:
+  • Websites not loading by name
+  • 'DNS Server Not Responding' errors
+  • Can access sites by IP but not by name
+
+🔍 DNS TROUBLESHOOTING:
+
+1️⃣ BASIC DNS FIXES:
+   • Flush DNS cache: ipconfig /flushdns
+   • Restart DNS Client service
+   • Try alternative DNS servers (8.8.8.8, 1.1.1.1)
+   • Restart router and modem
+
+2️⃣ DNS SETTINGS CHECK:
+   • Check DNS server settings
+   • Verify automatic vs manual DNS
+   • Test with different DNS providers
+   • Check hosts file for incorrect entries
+
+3️⃣ NETWORK CONFIGURATION:
+   • Check network adapter properties
+   • Verify IP address configuration
+   • Check for VPN interference
+   • Examine firewall settings
+
+4️⃣ ADVANCED DNS DIAGNOSIS:
+   • Use nslookup to test DNS resolution
+   • Check DNS response times
+   • Verify domain registration
+   • Contact ISP about DNS issues
+
+💡 Run 'dns' to time each of your DNS resolvers, or 'diagnose' for a full check""",
+}
+
+
+@_default_registry.command(
+    'troubleshoot', usage="troubleshoot <internet|wifi|slow|dns>", summary="Get troubleshooting help",
+    section='troubleshooting', max_args=1, cache=STATIC,
+    examples=[(f"troubleshoot {issue}", summary) for issue, summary in TROUBLESHOOTING_TOPICS.items()]
+)
+def troubleshoot(context, args):
+    if not args:
+        return "Please specify an issue. Usage: troubleshoot <internet|wifi|slow|dns>"
+    guide = TROUBLESHOOTING_GUIDES.get(args[0])
+    if guide is None:
+        return f"Unknown issue '{args[0]}'. Available: {', '.join(TROUBLESHOOTING_GUIDES)}"
+    return guide
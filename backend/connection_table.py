@@ -0,0 +1,137 @@
+import platform
+from collections import Counter
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+import psutil
+
+import procnet
+
+
+@dataclass(frozen=True)
+class ConnectionSummary:
+    """Aggregated view of the socket table built in a single pass
+
+    ``per_pid`` and the pids on ``established`` are resolved lazily when the
+    summary came from /proc/net, so count-only consumers never pay for the
+    inode -> pid scan.
+    """
+    total: int
+    by_status: MappingProxyType
+    per_remote_host: MappingProxyType
+    listen_ports: frozenset
+    _established: tuple = ()
+    _per_pid: MappingProxyType = None
+    _procfs: str = None
+    _resolved: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def established_count(self):
+        return self.by_status.get('ESTABLISHED', 0)
+
+    @property
+    def listen_count(self):
+        return self.by_status.get('LISTEN', 0)
+
+    @property
+    def per_pid(self):
+        """Connection count per owning pid"""
+        if self._per_pid is not None:
+            return self._per_pid
+        self._resolve()
+        return self._resolved['per_pid']
+
+    @property
+    def established(self):
+        """Sample of ESTABLISHED connections, with pids filled in"""
+        if self._procfs is None:
+            return self._established
+        self._resolve()
+        return self._resolved['established']
+
+    def _resolve(self):
+        if 'per_pid' in self._resolved:
+            return
+        owners = procnet.socket_inode_owners(self._procfs)
+        inodes = procnet.socket_inodes(self._procfs)
+        per_pid = Counter(owners[inode] for inode in inodes if inode in owners)
+        established = tuple(
+            conn._replace(pid=owners.get(conn.inode)) for conn in self._established
+        )
+        self._resolved['established'] = established
+        self._resolved['per_pid'] = MappingProxyType(dict(per_pid))
+
+    def top_pids(self, limit):
+        """(pid, connection count) pairs for the busiest processes"""
+        return Counter(self.per_pid).most_common(limit)
+
+    def top_remote_hosts(self, limit):
+        return Counter(self.per_remote_host).most_common(limit)
+
+
+EMPTY_SUMMARY = ConnectionSummary(
+    total=0,
+    by_status=MappingProxyType({}),
+    per_remote_host=MappingProxyType({}),
+    listen_ports=frozenset(),
+    _per_pid=MappingProxyType({}),
+)
+
+
+def summarize_connections(connections, sample_limit=10):
+    """Walk a psutil.net_connections() result once and aggregate everything consumers need
+
+    ``established`` keeps the first ``sample_limit`` ESTABLISHED connections
+    for display; everything else is reduced to counts.
+    """
+    by_status = Counter()
+    per_pid = Counter()
+    per_remote_host = Counter()
+    listen_ports = set()
+    established = []
+    total = 0
+
+    for conn in connections:
+        total += 1
+        status = conn.status
+        by_status[status] += 1
+        if conn.pid:
+            per_pid[conn.pid] += 1
+        if conn.raddr:
+            per_remote_host[conn.raddr.ip] += 1
+        if status == 'LISTEN' and conn.laddr:
+            listen_ports.add(conn.laddr.port)
+        elif status == 'ESTABLISHED' and len(established) < sample_limit:
+            established.append(conn)
+
+    return ConnectionSummary(
+        total=total,
+        by_status=MappingProxyType(dict(by_status)),
+        per_remote_host=MappingProxyType(dict(per_remote_host)),
+        listen_ports=frozenset(listen_ports),
+        _established=tuple(established),
+        _per_pid=MappingProxyType(dict(per_pid)),
+    )
+
+
+def summarize_proc_net(procfs='/proc', sample_limit=10):
+    """Aggregate the socket table straight from /proc/net (Linux only)"""
+    tables = procnet.scan_tables(procfs, sample_limit)
+    return ConnectionSummary(
+        total=tables['total'],
+        by_status=MappingProxyType(tables['by_status']),
+        per_remote_host=MappingProxyType(tables['per_remote_host']),
+        listen_ports=tables['listen_ports'],
+        _established=tables['established'],
+        _procfs=procfs,
+    )
+
+
+USE_PROC_NET = platform.system() == "Linux" and procnet.is_supported()
+
+
+def collect_connections(sample_limit=10):
+    """Summarise the host's sockets using the fastest collector available"""
+    if USE_PROC_NET:
+        return summarize_proc_net(sample_limit=sample_limit)
+    return summarize_connections(psutil.net_connections(), sample_limit)
@@ -0,0 +1,191 @@
+import os
+import socket
+import threading
+import time
+from collections import deque
+
+DEFAULT_TARGETS = [("8.8.8.8", 53), ("1.1.1.1", 53)]
+
+STATUS_TEXT = {
+    'connected': "✅ Connected",
+    'disconnected': "❌ Disconnected",
+    'unknown': "🔍 Checking...",
+}
+
+
+def parse_targets(value):
+    """Parse a 'host:port,host:port' string into a list of (host, port) tuples"""
+    targets = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.rpartition(':')
+        if not host:
+            host, port = port, 53
+        targets.append((host.strip('[]'), int(port)))
+    return targets
+
+
+class _TargetState:
+    """Last result, backoff and latency history for one probe target"""
+
+    def __init__(self, target, history):
+        self.target = target
+        self.ok = None
+        self.checked_at = None
+        self.expires_at = 0
+        self.next_probe_at = 0
+        self.failures = 0
+        self.latencies = deque(maxlen=history)
+
+
+class ConnectivityProber:
+    """Background internet-connectivity prober with a cached, TTL-bound verdict
+
+    Each target is probed with a TCP connect on its own schedule. Successful
+    results stay valid for ``ttl`` seconds; failing targets back off
+    exponentially up to ``max_backoff`` and their result stays valid until the
+    next scheduled probe, so readers always get an instant answer.
+    """
+
+    def __init__(self, targets=None, interval=10.0, ttl=30.0, timeout=3.0,
+                 max_backoff=300.0, history=30):
+        self.targets = list(targets or DEFAULT_TARGETS)
+        self.interval = interval
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self._states = {target: _TargetState(target, history) for target in self.targets}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the probing thread (no-op if already running)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="connectivity-prober", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the probing thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def probe_now(self):
+        """Ask the prober to re-check every target on its next iteration"""
+        with self._lock:
+            for state in self._states.values():
+                state.next_probe_at = 0
+        self._wake.set()
+
+    def verdict(self, wait=0):
+        """Return 'connected', 'disconnected' or 'unknown' from cached results
+
+        ``wait`` optionally blocks (up to that many seconds) until the first
+        probe round has finished, which is useful for one-shot CLI callers.
+        """
+        self.start()
+        if wait and not self._ready.is_set():
+            self._ready.wait(wait)
+
+        now = time.monotonic()
+        fresh = []
+        with self._lock:
+            for state in self._states.values():
+                if state.ok is not None and now < state.expires_at:
+                    fresh.append(state.ok)
+        if any(fresh):
+            return 'connected'
+        if fresh:
+            return 'disconnected'
+        return 'unknown'
+
+    def status_text(self, wait=0):
+        """Return the verdict in the display format used across the API"""
+        return STATUS_TEXT[self.verdict(wait)]
+
+    def is_connected(self, wait=0):
+        return self.verdict(wait) == 'connected'
+
+    def target_stats(self):
+        """Per-target probe state and latency history (milliseconds)"""
+        now = time.monotonic()
+        stats = []
+        with self._lock:
+            for state in self._states.values():
+                latencies = [l for l in state.latencies if l is not None]
+                stats.append({
+                    'target': f"{state.target[0]}:{state.target[1]}",
+                    'reachable': state.ok,
+                    'last_checked': state.checked_at,
+                    'consecutive_failures': state.failures,
+                    'next_probe_in': max(0.0, round(state.next_probe_at - now, 1)),
+                    'last_latency_ms': state.latencies[-1] if state.latencies else None,
+                    'avg_latency_ms': round(sum(latencies) / len(latencies), 1) if latencies else None,
+                    'latency_history_ms': list(state.latencies),
+                })
+        return stats
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [s.target for s in self._states.values() if s.next_probe_at <= now]
+            for target in due:
+                if self._stop.is_set():
+                    return
+                self._record(target, *self._probe(target))
+            self._ready.set()
+
+            with self._lock:
+                next_at = min(s.next_probe_at for s in self._states.values())
+            self._wake.wait(max(0.1, next_at - time.monotonic()))
+            self._wake.clear()
+
+    def _probe(self, target):
+        start = time.monotonic()
+        try:
+            socket.create_connection(target, timeout=self.timeout).close()
+            return True, round((time.monotonic() - start) * 1000, 1)
+        except OSError:
+            return False, None
+
+    def _record(self, target, ok, latency_ms):
+        now = time.monotonic()
+        with self._lock:
+            state = self._states[target]
+            state.ok = ok
+            state.checked_at = time.time()
+            state.latencies.append(latency_ms)
+            if ok:
+                state.failures = 0
+                delay = self.interval
+                state.expires_at = now + max(self.ttl, delay + self.timeout)
+            else:
+                state.failures += 1
+                delay = min(self.max_backoff, self.interval * (2 ** (state.failures - 1)))
+                # A failure is as fresh as we intend to be until the next retry
+                state.expires_at = now + delay + self.timeout
+            state.next_probe_at = now + delay
+
+
+_default_prober = None
+_default_lock = threading.Lock()
+
+
+def get_prober():
+    """Return the process-wide prober; targets come from NETMGMT_PROBE_TARGETS if set"""
+    global _default_prober
+    with _default_lock:
+        if _default_prober is None:
+            targets = os.environ.get('NETMGMT_PROBE_TARGETS')
+            _default_prober = ConnectivityProber(targets=parse_targets(targets) if targets else None)
+        return _default_prober
@@ -0,0 +1,92 @@
+import math
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+import psutil
+
+# Utilisation in percent: over the last sample interval, per core over the same
+# interval (an array of doubles), and exponentially weighted 1/5/15-minute
+# averages (like loadavg)
+CpuUsage = namedtuple('CpuUsage', ['percent', 'per_core', 'avg_1m', 'avg_5m', 'avg_15m'])
+
+AVERAGE_WINDOWS = (60.0, 300.0, 900.0)
+
+
+def _busy_and_total(times):
+    """Busy and total CPU time, counted the way psutil.cpu_percent() does"""
+    # guest time is already included in user/nice on Linux
+    total = sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+    idle = times.idle + getattr(times, 'iowait', 0)
+    return total - idle, total
+
+
+def _percent(busy, total):
+    if total <= 0:
+        return 0.0
+    return round(min(100.0, max(0.0, busy / total * 100)), 1)
+
+
+class CpuAccounting:
+    """CPU utilisation from cpu_times() deltas between samples, never sleeping
+
+    ``sample()`` reads the per-core tick counters once and compares them with
+    the previous read, so it returns immediately; call it from a background
+    loop (the metrics sampler does, once per interval) and read ``usage()``
+    anywhere. The first sample is measured against boot, so there is a
+    meaningful value right away instead of after a blocking 0.5 s baseline.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._previous = None  # per-core (busy, total) at the last sample
+        self._sampled_at = None
+        self._averages = None
+        self._usage = None
+
+    def sample(self, now=None):
+        """Take one sample and return the updated CpuUsage"""
+        now = time.monotonic() if now is None else now
+        current = [_busy_and_total(times) for times in psutil.cpu_times(percpu=True)]
+        with self._lock:
+            previous = self._previous or [(0.0, 0.0)] * len(current)
+            if len(previous) != len(current):  # CPU hotplug: start over from boot
+                previous = [(0.0, 0.0)] * len(current)
+            deltas = [
+                (busy - old_busy, total - old_total)
+                for (busy, total), (old_busy, old_total) in zip(current, previous)
+            ]
+            per_core = array('d', (_percent(busy, total) for busy, total in deltas))
+            percent = _percent(sum(busy for busy, _ in deltas), sum(total for _, total in deltas))
+
+            if self._averages is None:
+                self._averages = [percent] * len(AVERAGE_WINDOWS)
+            else:
+                elapsed = max(0.0, now - self._sampled_at)
+                self._averages = [
+                    average + (percent - average) * (1 - math.exp(-elapsed / window))
+                    for average, window in zip(self._averages, AVERAGE_WINDOWS)
+                ]
+            self._previous = current
+            self._sampled_at = now
+            self._usage = CpuUsage(percent, per_core, *(round(average, 1) for average in self._averages))
+            return self._usage
+
+    def usage(self):
+        """Latest CpuUsage without sampling (samples once if nothing was sampled yet)"""
+        usage = self._usage
+        return usage if usage is not None else self.sample()
+
+
+_default_accounting = None
+_default_lock = threading.Lock()
+
+
+def get_cpu_accounting():
+    """Return the process-wide CPU accounting"""
+    global _default_accounting
+    with _default_lock:
+        if _default_accounting is None:
+            _default_accounting = CpuAccounting()
+        return _default_accounting
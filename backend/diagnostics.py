@@ -0,0 +1,274 @@
+"""Concurrent diagnostics for the diagnose command
+
+Each check is a Probe with its own deadline. All probes of a run start
+together on one event loop, and results are produced as they finish, so a
+run takes as long as its slowest probe (at most its deadline) instead of
+the sum of every timeout.
+
+Probes that only read the snapshot answer immediately. Network probes are
+asyncio coroutines; a blocking check runs on a small bounded thread pool
+and is abandoned at its deadline.
+
+``DiagnosticsRunner.stream()`` is the async interface (ASGI); ``iter_results()``
+and ``run()`` drive the same loop from a plain thread (Flask, the CLI).
+"""
+import asyncio
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from connectivity import get_prober
+from dns_probe import get_dns_probe
+
+PROBE_DEADLINE = float(os.environ.get('NETMGMT_PROBE_DEADLINE', 2.0))
+DIAGNOSE_DEADLINE = float(os.environ.get('NETMGMT_DIAGNOSE_DEADLINE', 5.0))
+
+# ``check(snapshot)`` is a coroutine function or a blocking callable;
+# ``render(value)`` turns its result into the report line
+Probe = namedtuple('Probe', ['name', 'label', 'check', 'render', 'deadline'])
+
+# ``error`` is the exception the check raised (TimeoutError past its deadline)
+ProbeResult = namedtuple('ProbeResult', ['name', 'value', 'error', 'elapsed_ms', 'line'])
+
+
+def probe_event(result):
+    """JSON-ready form of a ProbeResult, for streaming"""
+    return {
+        'name': result.name,
+        'ok': result.error is None,
+        'value': result.value,
+        'error': str(result.error) if result.error is not None else None,
+        'elapsed_ms': result.elapsed_ms,
+        'line': result.line,
+    }
+
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='diagnostics')
+
+
+async def probe_tcp(host, port, deadline=PROBE_DEADLINE):
+    """(reachable, latency ms) for a TCP connect to host:port"""
+    start = time.monotonic()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), deadline)
+    except (OSError, asyncio.TimeoutError):
+        return False, None
+    writer.close()
+    return True, round((time.monotonic() - start) * 1000, 1)
+
+
+# ---------------------------------------------------------------- default probes
+
+async def check_internet(snapshot):
+    prober = get_prober()
+    verdict = prober.verdict()
+    if verdict != 'unknown':
+        return verdict
+    # No cached result yet: probe every target now, concurrently
+    results = await asyncio.gather(*(probe_tcp(host, port) for host, port in prober.targets))
+    return 'connected' if any(ok for ok, _ in results) else 'disconnected'
+
+
+def render_internet(verdict):
+    if verdict == 'connected':
+        return "✅ Internet Connectivity: PASS"
+    if verdict == 'disconnected':
+        return "❌ Internet Connectivity: FAIL"
+    return "🔍 Internet Connectivity: CHECKING"
+
+
+async def check_dns(snapshot):
+    # Every resolver queried at once; a cached result if probed moments ago
+    return [result._asdict() for result in await get_dns_probe().probe()]
+
+
+def render_dns(results):
+    answered = [result for result in results if result['ok']]
+    if not results:
+        return "⚠️ DNS Resolution: no resolvers configured"
+    if not answered:
+        return f"❌ DNS Resolution: FAIL (0/{len(results)} resolvers answered)"
+    fastest = min(answered, key=lambda result: result['rtt_ms'])
+    return (f"✅ DNS Resolution: PASS ({len(answered)}/{len(results)} resolvers, "
+            f"fastest {fastest['server']} {fastest['rtt_ms']:.0f} ms)")
+
+
+async def check_interfaces(snapshot):
+    return sum(1 for stats in snapshot.if_stats.values() if stats.isup), len(snapshot.if_stats)
+
+
+def render_interfaces(counts):
+    return f"📡 Network Interfaces: {counts[0]}/{counts[1]} UP"
+
+
+async def check_resources(snapshot):
+    return snapshot.cpu_usage, snapshot.memory_usage
+
+
+def render_resources(usage):
+    return f"💻 System Resources: CPU {usage[0]:.1f}%, Memory {usage[1]:.1f}%"
+
+
+async def check_connections(snapshot):
+    return snapshot.connections.established_count
+
+
+def render_connections(established):
+    return f"🔗 Active Connections: {established} established"
+
+
+async def check_disk(snapshot):
+    return snapshot.disk_usage
+
+
+def render_disk(percent):
+    if percent is None:
+        return "⚠️ Disk Space: unknown"
+    return f"💾 Disk Space: {percent:.1f}% used"
+
+
+def default_probes():
+    return [
+        Probe('internet', "Internet Connectivity", check_internet, render_internet, PROBE_DEADLINE),
+        Probe('dns', "DNS Resolution", check_dns, render_dns, PROBE_DEADLINE),
+        Probe('interfaces', "Network Interfaces", check_interfaces, render_interfaces, 1.0),
+        Probe('resources', "System Resources", check_resources, render_resources, 1.0),
+        Probe('connections', "Active Connections", check_connections, render_connections, 1.0),
+        Probe('disk', "Disk Space", check_disk, render_disk, 1.0),
+    ]
+
+
+# ---------------------------------------------------------------- runner
+
+class DiagnosticsRunner:
+    """Runs every registered probe concurrently against one snapshot"""
+
+    def __init__(self, probes=None, executor=None, deadline=DIAGNOSE_DEADLINE):
+        self.probes = list(default_probes() if probes is None else probes)
+        self.executor = executor or _executor
+        self.deadline = deadline
+
+    def add_probe(self, probe):
+        """Register a probe, replacing one with the same name"""
+        self.probes = [existing for existing in self.probes if existing.name != probe.name] + [probe]
+
+    async def _run_probe(self, probe, snapshot):
+        start = time.monotonic()
+        try:
+            if asyncio.iscoroutinefunction(probe.check):
+                value = await asyncio.wait_for(probe.check(snapshot), probe.deadline)
+            else:
+                future = asyncio.get_running_loop().run_in_executor(self.executor, probe.check, snapshot)
+                value = await asyncio.wait_for(future, probe.deadline)
+            error = None
+            line = probe.render(value)
+        except asyncio.TimeoutError:
+            value, error = None, TimeoutError(f"no answer within {probe.deadline:g}s")
+            line = f"⏱️ {probe.label}: no answer within {probe.deadline:g}s"
+        except Exception as e:
+            value, error = None, e
+            line = f"⚠️ {probe.label}: Error - {str(e)}"
+        return ProbeResult(probe.name, value, error, round((time.monotonic() - start) * 1000, 1), line)
+
+    async def stream(self, snapshot):
+        """Async generator of ProbeResults in the order the probes finish"""
+        probes = list(self.probes)
+        tasks = {asyncio.ensure_future(self._run_probe(probe, snapshot)): probe for probe in probes}
+        pending = set(tasks)
+        stop_at = time.monotonic() + self.deadline
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, stop_at - time.monotonic()), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:  # overall deadline: whatever is left did not answer
+                    for task in pending:
+                        probe = tasks[task]
+                        yield ProbeResult(probe.name, None, TimeoutError(f"no answer within {self.deadline:g}s"),
+                                          None, f"⏱️ {probe.label}: no answer within {self.deadline:g}s")
+                    return
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def collect(self, snapshot):
+        """{name: ProbeResult} once every probe has finished"""
+        return {result.name: result async for result in self.stream(snapshot)}
+
+    def iter_results(self, snapshot):
+        """Blocking generator of ProbeResults as they finish, for threaded callers"""
+        results = queue.Queue()
+        done = object()
+
+        async def produce():
+            try:
+                async for result in self.stream(snapshot):
+                    results.put(result)
+            finally:
+                results.put(done)
+
+        threading.Thread(target=asyncio.run, args=(produce(),), name='diagnostics-run', daemon=True).start()
+        while True:
+            result = results.get()
+            if result is done:
+                return
+            yield result
+
+    def run(self, snapshot, on_result=None):
+        """Run every probe; ``on_result(result)`` is called as each one finishes"""
+        collected = {}
+        for result in self.iter_results(snapshot):
+            collected[result.name] = result
+            if on_result:
+                on_result(result)
+        return collected
+
+    def report(self, results):
+        """The diagnose command response for a run's {name: ProbeResult}"""
+        lines = [results[probe.name].line for probe in self.probes if probe.name in results]
+        diagnostics_text = "\n".join(f"  • {line}" for line in lines)
+
+        def value(name):
+            result = results.get(name)
+            return result.value if result is not None and result.error is None else None
+
+        response = f"""🔍 COMPREHENSIVE SYSTEM DIAGNOSTICS:
+
+{diagnostics_text}
+
+📊 OVERALL ASSESSMENT:"""
+        resources, interfaces = value('resources'), value('interfaces')
+        if resources is None or interfaces is None:
+            response += "\n  🔍 System assessment incomplete - some metrics unavailable"
+        elif resources[0] > 90 or resources[1] > 90 or (value('disk') or 0) > 95:
+            response += "\n  ⚠️  System under heavy load - consider optimization"
+        elif interfaces[0] == 0:
+            response += "\n  ❌ No network interfaces available"
+        else:
+            response += "\n  ✅ System operating within normal parameters"
+
+        slowest = max((result for result in results.values() if result.elapsed_ms is not None),
+                      key=lambda result: result.elapsed_ms, default=None)
+        response += f"\n\n💡 Diagnostics completed at {datetime.now().strftime('%H:%M:%S')}"
+        if slowest is not None:
+            response += f" ({len(results)} checks in parallel, slowest: {slowest.name} {slowest.elapsed_ms:.0f} ms)"
+        return response
+
+
+_default_runner = None
+_default_lock = threading.Lock()
+
+
+def get_diagnostics():
+    """Return the process-wide diagnostics runner"""
+    global _default_runner
+    with _default_lock:
+        if _default_runner is None:
+            _default_runner = DiagnosticsRunner()
+        return _default_runner
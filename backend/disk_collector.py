@@ -0,0 +1,149 @@
+"""Per-mount disk usage from a cached mount table
+
+Mounts are discovered once (and again every ``rediscover_interval`` seconds,
+so a newly attached drive shows up), and the first usage method that works
+on this host is remembered. A sample is then one ``statvfs`` (or the
+platform's equivalent) per mount - no subprocess, no fallback chain.
+
+When a mount cannot be read it is left out, and when the system mount
+cannot be read its usage is ``None`` ("unknown"), never an estimate.
+"""
+import os
+import shutil
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+# Same fields and percent definition as psutil.disk_usage()
+DiskUsage = namedtuple('DiskUsage', ['total', 'used', 'free', 'percent'])
+
+
+def system_mount():
+    """Mount whose usage is reported as the host's disk usage"""
+    if os.name == 'nt':
+        return os.environ.get('SystemDrive', 'C:') + '\\'
+    return '/'
+
+
+def _usage(total, used, free):
+    # Percent of the space available to unprivileged users, like psutil and df
+    available = used + free
+    percent = round(used / available * 100, 1) if available else 0.0
+    return DiskUsage(total, used, free, percent)
+
+
+def _statvfs_usage(path):
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    return _usage(total, used, st.f_bavail * st.f_frsize)
+
+
+def _shutil_usage(path):
+    # GetDiskFreeSpaceExW on Windows, statvfs elsewhere
+    total, used, free = shutil.disk_usage(path)
+    return _usage(total, used, free)
+
+
+def _psutil_usage(path):
+    usage = psutil.disk_usage(path)
+    return DiskUsage(usage.total, usage.used, usage.free, usage.percent)
+
+
+USAGE_METHODS = {
+    'statvfs': _statvfs_usage,
+    'shutil': _shutil_usage,
+    'psutil': _psutil_usage,
+}
+
+
+class DiskCollector:
+    """Samples usage of every local mount with the one method known to work here"""
+
+    def __init__(self, rediscover_interval=300.0, root=None):
+        self.rediscover_interval = rediscover_interval
+        self.root = root or system_mount()
+        self.method = None  # name of the cached USAGE_METHODS entry
+        self._usage = None
+        self._mounts = ()
+        self._discovered_at = None
+        self._lock = threading.Lock()
+
+    def _select_method(self):
+        """First method that can read the system mount, or None if none can"""
+        for name, method in USAGE_METHODS.items():
+            if name == 'statvfs' and not hasattr(os, 'statvfs'):
+                continue
+            try:
+                method(self.root)
+            except Exception:
+                continue
+            print(f"💾 Disk usage via {name}")
+            return name
+        print(f"⚠️ No disk usage method can read {self.root}; disk usage will be reported as unknown")
+        return None
+
+    def _discover(self):
+        mounts = [self.root]
+        try:
+            for partition in psutil.disk_partitions(all=False):
+                # Empty drives (CD-ROM, card readers) have no filesystem to read
+                if not partition.fstype or 'cdrom' in partition.opts:
+                    continue
+                if partition.mountpoint not in mounts:
+                    mounts.append(partition.mountpoint)
+        except Exception as e:
+            print(f"⚠️ Failed to list mounts: {e}")
+        return tuple(mounts)
+
+    def mounts(self, now=None):
+        """Cached mount points, system mount first"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.method is None and self._discovered_at is None:
+                self.method = self._select_method()
+                self._usage = USAGE_METHODS.get(self.method)
+            if self._discovered_at is None or now - self._discovered_at >= self.rediscover_interval:
+                self._mounts = self._discover()
+                self._discovered_at = now
+            return self._mounts
+
+    def sample(self, now=None):
+        """{mountpoint: DiskUsage} for every mount that could be read"""
+        mounts = self.mounts(now)
+        usage = self._usage
+        if usage is None:
+            return {}
+        result = {}
+        vanished = False
+        for mountpoint in mounts:
+            try:
+                result[mountpoint] = usage(mountpoint)
+            except FileNotFoundError:
+                vanished = True
+            except OSError:
+                continue  # unreadable (permissions, stale network mount)
+        if vanished:
+            with self._lock:
+                self._discovered_at = None  # unmounted: rediscover on the next sample
+        return result
+
+    def system_percent(self, usage):
+        """System mount percent from a sample() result, or None when unknown"""
+        system = usage.get(self.root)
+        return system.percent if system else None
+
+
+_default_collector = None
+_default_lock = threading.Lock()
+
+
+def get_disk_collector():
+    """Return the process-wide disk collector"""
+    global _default_collector
+    with _default_lock:
+        if _default_collector is None:
+            _default_collector = DiskCollector()
+        return _default_collector
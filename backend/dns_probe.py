@@ -0,0 +1,234 @@
+"""DNS resolver health: one raw UDP query to every resolver, all at once
+
+Instead of asking the system resolver to look a name up (which blocks,
+retries through the resolv.conf list and cannot say which server is slow),
+the probe sends its own A query to each nameserver in /etc/resolv.conf and
+to the configured servers (NETMGMT_DNS_SERVERS, 'host[:port],...'; the
+public resolvers by default) concurrently, and times each answer.
+
+Results are cached for ``ttl`` seconds, and every server keeps an RTT
+history. Any UDP server works as a target, so a local stub server on
+127.0.0.1 is enough to exercise it (see benchmarks/bench_dns_probe.py).
+"""
+import asyncio
+import os
+import random
+import socket
+import struct
+import threading
+import time
+from collections import deque, namedtuple
+
+from connectivity import parse_targets
+
+RESOLV_CONF = '/etc/resolv.conf'
+DEFAULT_SERVERS = [("8.8.8.8", 53), ("1.1.1.1", 53)]
+DEFAULT_QUERY = os.environ.get('NETMGMT_DNS_QUERY', 'google.com')
+
+RCODES = {0: 'NOERROR', 1: 'FORMERR', 2: 'SERVFAIL', 3: 'NXDOMAIN', 4: 'NOTIMP', 5: 'REFUSED'}
+
+TYPE_A = 1
+CLASS_IN = 1
+
+_HEADER = struct.Struct('!HHHHHH')
+_RR = struct.Struct('!HHIH')
+
+# One resolver's answer; ``ok`` means it replied with NOERROR
+ServerResult = namedtuple('ServerResult', ['server', 'source', 'ok', 'rtt_ms', 'rcode', 'addresses', 'error'])
+
+
+def read_resolv_conf(path=RESOLV_CONF):
+    """Nameserver addresses listed in a resolv.conf (empty if there is none)"""
+    servers = []
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == 'nameserver':
+                    servers.append(fields[1].split('%')[0])  # drop an IPv6 zone id
+    except OSError:
+        pass
+    return servers
+
+
+def build_query(name, query_id, qtype=TYPE_A):
+    """Wire format of a recursive query for ``name``"""
+    header = _HEADER.pack(query_id, 0x0100, 1, 0, 0, 0)  # RD set, one question
+    qname = b''.join(bytes([len(label)]) + label for label in name.strip('.').encode('idna').split(b'.'))
+    return header + qname + b'\0' + struct.pack('!HH', qtype, CLASS_IN)
+
+
+def _skip_name(data, offset):
+    while True:
+        length = data[offset]
+        if length == 0:
+            return offset + 1
+        if length & 0xC0 == 0xC0:  # compression pointer ends the name
+            return offset + 2
+        offset += 1 + length
+
+
+def parse_response(data):
+    """(query id, rcode name, A record addresses) from a response packet"""
+    query_id, flags, questions, answers, _, _ = _HEADER.unpack_from(data, 0)
+    if not flags & 0x8000:
+        raise ValueError("Not a DNS response")
+    offset = _HEADER.size
+    for _ in range(questions):
+        offset = _skip_name(data, offset) + 4
+    addresses = []
+    for _ in range(answers):
+        offset = _skip_name(data, offset)
+        rtype, rclass, _, length = _RR.unpack_from(data, offset)
+        offset += _RR.size
+        if rtype == TYPE_A and rclass == CLASS_IN and length == 4:
+            addresses.append(socket.inet_ntoa(data[offset:offset + 4]))
+        offset += length
+    rcode = flags & 0x000F
+    return query_id, RCODES.get(rcode, f"RCODE{rcode}"), addresses
+
+
+class _QueryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, query_id, answer):
+        self.query_id = query_id
+        self.answer = answer
+
+    def datagram_received(self, data, addr):
+        # Ignore anything that is not the reply to our query (stray or spoofed packets)
+        if len(data) >= _HEADER.size and struct.unpack_from('!H', data)[0] == self.query_id:
+            if not self.answer.done():
+                self.answer.set_result(data)
+
+    def error_received(self, exc):
+        # e.g. ICMP port unreachable: nothing listens on that address
+        if not self.answer.done():
+            self.answer.set_exception(exc)
+
+
+async def query_server(host, port, name=DEFAULT_QUERY, timeout=1.5, source='configured'):
+    """Send one A query to host:port and wait up to ``timeout`` for the answer"""
+    server = f"[{host}]:{port}" if ':' in host else f"{host}:{port}"
+    loop = asyncio.get_running_loop()
+    query_id = random.getrandbits(16)
+    answer = loop.create_future()
+    start = time.monotonic()
+    transport = None
+    try:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _QueryProtocol(query_id, answer), remote_addr=(host, port)
+        )
+        transport.sendto(build_query(name, query_id))
+        data = await asyncio.wait_for(answer, timeout)
+        rtt_ms = round((time.monotonic() - start) * 1000, 1)
+        _, rcode, addresses = parse_response(data)
+        return ServerResult(server, source, rcode == 'NOERROR', rtt_ms, rcode, addresses, None)
+    except asyncio.TimeoutError:
+        return ServerResult(server, source, False, None, None, [], f"timeout after {timeout:g}s")
+    except (OSError, ValueError, struct.error, IndexError) as e:
+        return ServerResult(server, source, False, None, None, [], str(e) or type(e).__name__)
+    finally:
+        if transport is not None:
+            transport.close()
+
+
+class DnsProbe:
+    """Concurrent per-resolver DNS health checks with a short result cache"""
+
+    def __init__(self, servers=None, query_name=DEFAULT_QUERY, timeout=1.5, ttl=10.0,
+                 resolv_conf=RESOLV_CONF, history=30):
+        self.servers = list(DEFAULT_SERVERS if servers is None else servers)
+        self.query_name = query_name
+        self.timeout = timeout
+        self.ttl = ttl
+        self.resolv_conf = resolv_conf
+        self.history = history
+        self._lock = threading.Lock()
+        self._results = None
+        self._expires_at = 0
+        self._history = {}  # server -> deque of RTT ms (None for a failure)
+
+    def resolvers(self):
+        """(host, port, source) for the system resolvers, then the configured servers"""
+        targets = [(host, 53, 'system') for host in read_resolv_conf(self.resolv_conf)]
+        seen = {(host, port) for host, port, _ in targets}
+        for host, port in self.servers:
+            if (host, port) not in seen:
+                seen.add((host, port))
+                targets.append((host, port, 'configured'))
+        return targets
+
+    def cached(self):
+        """Results of the last probe while they are fresh, else None (never queries)"""
+        with self._lock:
+            if self._results is not None and time.monotonic() < self._expires_at:
+                return self._results
+        return None
+
+    async def probe(self):
+        """ServerResults for every resolver, from cache if probed within ``ttl``"""
+        results = self.cached()
+        if results is not None:
+            return results
+        results = await asyncio.gather(*(
+            query_server(host, port, self.query_name, self.timeout, source)
+            for host, port, source in self.resolvers()
+        ))
+        with self._lock:
+            self._results = results
+            self._expires_at = time.monotonic() + self.ttl
+            for result in results:
+                self._history.setdefault(result.server, deque(maxlen=self.history)).append(
+                    result.rtt_ms if result.ok else None)
+        return results
+
+    def probe_sync(self):
+        """probe() for callers without an event loop"""
+        results = self.cached()
+        return results if results is not None else asyncio.run(self.probe())
+
+    def server_stats(self):
+        """Per-server RTT history (milliseconds; None marks a failed query)"""
+        with self._lock:
+            history = {server: list(rtts) for server, rtts in self._history.items()}
+        stats = []
+        for server, rtts in history.items():
+            answered = [rtt for rtt in rtts if rtt is not None]
+            stats.append({
+                'server': server,
+                'last_rtt_ms': rtts[-1] if rtts else None,
+                'avg_rtt_ms': round(sum(answered) / len(answered), 1) if answered else None,
+                'failures': len(rtts) - len(answered),
+                'rtt_history_ms': rtts,
+            })
+        return stats
+
+
+def log_entries(results, timestamp):
+    """Log events for a probe's results; failures read 'DNS error: ...' for the dns_issues pattern"""
+    entries = []
+    for result in results:
+        if result.ok:
+            message = f"DNS resolver {result.server} ({result.source}) answered in {result.rtt_ms:.1f} ms"
+        else:
+            message = f"DNS error: resolver {result.server} ({result.source}) {result.rcode or result.error}"
+        entries.append({
+            'timestamp': timestamp,
+            'message': message,
+            'source': 'DNS-Probe',
+            'severity': 'INFO' if result.ok else 'WARNING'
+        })
+    return entries
+
+
+_default_probe = None
+_default_lock = threading.Lock()
+
+
+def get_dns_probe():
+    """Return the process-wide DNS probe; extra servers come from NETMGMT_DNS_SERVERS if set"""
+    global _default_probe
+    with _default_lock:
+        if _default_probe is None:
+            servers = os.environ.get('NETMGMT_DNS_SERVERS')
+            _default_probe = DnsProbe(servers=parse_targets(servers) if servers else None)
+        return _default_probe
@@ -0,0 +1,83 @@
+"""Production server configuration: run ``gunicorn -c gunicorn.conf.py main:app`` from backend/
+
+The master creates a shared memory segment and starts one sampler process
+(``main.py --sampler-process``) that samples the host, records metric history
+and publishes each snapshot into the segment. Workers read snapshots from
+there instead of sampling, so sampling cost does not grow with the number of
+workers and every worker serves the same snapshot.
+
+SIGTERM to the master is a graceful shutdown: workers stop accepting, close
+open event streams and finish in-flight requests, then the sampler process
+is stopped and the segment removed.
+"""
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from shared_snapshot import SharedSnapshotWriter  # noqa: E402
+
+bind = os.environ.get('NETMGMT_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('NETMGMT_WORKERS', min(multiprocessing.cpu_count() * 2, 8)))
+# Threads so a worker can hold open /api/stream connections and still answer polls
+worker_class = 'gthread'
+threads = int(os.environ.get('NETMGMT_THREADS', 8))
+keepalive = 5
+timeout = 30
+graceful_timeout = 20
+# Workers import main.py themselves, after NETMGMT_SHARED_SNAPSHOT is set
+preload_app = False
+chdir = BACKEND_DIR
+accesslog = os.environ.get('NETMGMT_ACCESS_LOG')
+
+
+def on_starting(server):
+    server.snapshot_segment = SharedSnapshotWriter()
+    server.log.info("Shared snapshot segment %s created", server.snapshot_segment.name)
+
+
+def when_ready(server):
+    server.sampler_process = subprocess.Popen(
+        [sys.executable, os.path.join(BACKEND_DIR, 'main.py'), '--sampler-process', server.snapshot_segment.name],
+        cwd=BACKEND_DIR,
+    )
+    server.log.info("Sampler process started (pid %s)", server.sampler_process.pid)
+
+
+def post_fork(server, worker):
+    os.environ['NETMGMT_SHARED_SNAPSHOT'] = server.snapshot_segment.name
+
+
+def post_worker_init(worker):
+    import main
+
+    # The reader thread refreshes this worker's process registry every cycle
+    main.sampler.start()
+
+    # gunicorn's own SIGTERM handler only stops accepting; also end the
+    # event streams, which would otherwise hold the worker until graceful_timeout
+    handle_exit = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        main.shutdown()
+        handle_exit(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+
+def on_exit(server):
+    process = getattr(server, 'sampler_process', None)
+    if process is not None and process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    segment = getattr(server, 'snapshot_segment', None)
+    if segment is not None:
+        segment.close()
+        segment.unlink()
@@ -0,0 +1,334 @@
+"""Streaming ingestion of system log files for the log summariser
+
+Tails plain syslog files (``/var/log/syslog``, ``auth.log`` ...) and journald
+exports (``journalctl -o export`` or ``-o json`` written to a file). Byte
+offsets and inodes are persisted between runs so each run only reads what was
+appended since the last one; a changed inode means the file was rotated (the
+rest of the old file is read from its rotated name when it can be found) and
+a file smaller than the saved offset was truncated. Lines are yielded in
+fixed-size batches, so memory does not grow with the size of the log.
+"""
+import glob
+import json
+import os
+import re
+from datetime import datetime
+
+DEFAULT_LOG_FILES = (
+    '/var/log/syslog',
+    '/var/log/messages',
+    '/var/log/auth.log',
+    '/var/log/secure',
+)
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'log_offsets.json')
+
+MONTHS = {name: index for index, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+
+# journald PRIORITY (syslog levels 0-7) -> summariser severity
+JOURNAL_PRIORITIES = {
+    '0': 'CRITICAL', '1': 'CRITICAL', '2': 'CRITICAL',
+    '3': 'ERROR',
+    '4': 'WARNING',
+    '5': 'INFO', '6': 'INFO', '7': 'INFO',
+}
+
+# Plain syslog lines carry no level, so it is inferred from the (lowercased) text
+SEVERITY_KEYWORDS = (
+    ('CRITICAL', re.compile(r'\b(?:emerg|panic|critical|fatal)')),
+    ('ERROR', re.compile(r'\b(?:error|fail(?:ed|ure)?)\b')),
+    ('WARNING', re.compile(r'\b(?:warn|warning|denied|refused|timeout|timed out|disconnected)\b')),
+)
+
+# "Oct 17 12:00:00 host prog[123]: message" or "2026-10-17T12:00:00+00:00 host prog: message"
+SYSLOG_LINE = re.compile(
+    r'^(?:(?P<bsd>[A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d)|(?P<iso>\d{4}-\d\d-\d\dT\S+))'
+    r' (?P<host>\S+) (?P<program>[^:\[\s]+)(?:\[\d+\])?: ?(?P<message>.*)$'
+)
+
+
+def configured_log_files():
+    """Files to tail: NETMGMT_LOG_FILES (os.pathsep separated) or the readable defaults"""
+    configured = os.environ.get('NETMGMT_LOG_FILES')
+    if configured:
+        return [path for path in configured.split(os.pathsep) if path]
+    return [path for path in DEFAULT_LOG_FILES if os.access(path, os.R_OK)]
+
+
+def detect_format(path):
+    if path.endswith('.export'):
+        return 'journal-export'
+    if path.endswith('.json'):
+        return 'journal-json'
+    return 'syslog'
+
+
+def infer_severity(message):
+    lowered = message.lower()
+    for severity, pattern in SEVERITY_KEYWORDS:
+        if pattern.search(lowered):
+            return severity
+    return 'INFO'
+
+
+def _bsd_timestamp(text, now):
+    """'Oct 17 12:00:00' -> datetime, assuming the most recent such date"""
+    try:
+        month = MONTHS[text[:3]]
+        timestamp = datetime(now.year, month, int(text[4:6]), int(text[7:9]), int(text[10:12]), int(text[13:15]))
+    except (KeyError, ValueError):
+        return now
+    if (timestamp - now).days >= 1:  # e.g. a December line read in January
+        timestamp = timestamp.replace(year=now.year - 1)
+    return timestamp
+
+
+def parse_syslog_line(line, default_source, now=None):
+    """Turn one syslog line into a summariser log entry"""
+    now = now or datetime.now()
+    match = SYSLOG_LINE.match(line)
+    if match is None:
+        return {'timestamp': now, 'message': line, 'source': default_source, 'severity': infer_severity(line)}
+
+    if match.group('bsd'):
+        timestamp = _bsd_timestamp(match.group('bsd'), now)
+    else:
+        try:
+            timestamp = datetime.fromisoformat(match.group('iso')).replace(tzinfo=None)
+        except ValueError:
+            timestamp = now
+    message = match.group('message')
+    return {
+        'timestamp': timestamp,
+        'message': message,
+        'source': match.group('program'),
+        'severity': infer_severity(message),
+    }
+
+
+def journal_entry(fields, default_source, now=None):
+    """Turn a dict of journald fields into a summariser log entry (None without MESSAGE)"""
+    message = fields.get('MESSAGE')
+    if message is None:
+        return None
+    if isinstance(message, list):  # journalctl -o json encodes binary messages as byte lists
+        message = bytes(message).decode('utf-8', 'replace')
+    try:
+        timestamp = datetime.fromtimestamp(int(fields['__REALTIME_TIMESTAMP']) / 1e6)
+    except (KeyError, ValueError, TypeError):
+        timestamp = now or datetime.now()
+    priority = fields.get('PRIORITY')
+    return {
+        'timestamp': timestamp,
+        'message': message,
+        'source': fields.get('SYSLOG_IDENTIFIER') or fields.get('_COMM') or default_source,
+        'severity': JOURNAL_PRIORITIES.get(str(priority)) or infer_severity(message),
+    }
+
+
+def _read_lines(f, offset):
+    """Yield (line bytes, offset after it) for complete lines only
+
+    A trailing line without a newline is still being written; it is left for
+    the next run.
+    """
+    for raw in f:
+        if not raw.endswith(b'\n'):
+            return
+        offset += len(raw)
+        yield raw, offset
+
+
+def _syslog_entries(f, offset, source):
+    now = datetime.now()
+    for raw, offset in _read_lines(f, offset):
+        line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+        if line:
+            yield parse_syslog_line(line, source, now), offset
+
+
+def _journal_json_entries(f, offset, source):
+    now = datetime.now()
+    for raw, offset in _read_lines(f, offset):
+        try:
+            fields = json.loads(raw)
+        except ValueError:
+            continue
+        entry = journal_entry(fields, source, now)
+        if entry:
+            yield entry, offset
+
+
+def _journal_export_entries(f, offset, source):
+    """Parse the journal export format: FIELD=value lines, blank line between entries
+
+    Fields holding binary data are written as the name, a newline, a
+    little-endian 64-bit length and the raw data. Offsets are only reported at
+    entry boundaries, so a partially written entry is re-read next time.
+    """
+    now = datetime.now()
+    fields = {}
+    position = offset
+    while True:
+        raw = f.readline()
+        if not raw.endswith(b'\n'):
+            return
+        position += len(raw)
+        if raw == b'\n':
+            entry = journal_entry(fields, source, now)
+            fields = {}
+            if entry:
+                yield entry, position
+            continue
+        name, sep, value = raw[:-1].partition(b'=')
+        if sep:
+            fields[name.decode('ascii', 'replace')] = value.decode('utf-8', 'replace')
+            continue
+        size = f.read(8)
+        if len(size) < 8:
+            return
+        length = int.from_bytes(size, 'little')
+        data = f.read(length + 1)
+        if len(data) < length + 1:
+            return
+        position += 8 + length + 1
+        fields[name.decode('ascii', 'replace')] = data[:-1].decode('utf-8', 'replace')
+
+
+READERS = {
+    'syslog': _syslog_entries,
+    'journal-json': _journal_json_entries,
+    'journal-export': _journal_export_entries,
+}
+
+
+class LogTailer:
+    """Reads new log entries from a set of files, remembering where it stopped
+
+    ``batches()`` is a generator of lists of at most ``batch_size`` entries.
+    A file's offset only advances once the batch containing its lines has been
+    handed out and the consumer asks for the next one, and state is written
+    when the generator finishes or is closed, so an interrupted run re-reads
+    at most one batch.
+    """
+
+    def __init__(self, paths=None, state_path=DEFAULT_STATE_PATH, from_start=True):
+        self.paths = list(paths) if paths is not None else configured_log_files()
+        self.state_path = state_path
+        self.from_start = from_start
+        self.state = self._load_state()
+        self.stats = {}
+
+    def _load_state(self):
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self):
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"⚠️ Could not save log offsets: {e}")
+
+    def batches(self, batch_size=1000):
+        """Yield lists of new entries from every configured file; ``stats`` covers this pass only"""
+        self.stats = {}
+        batch = []
+        pending = {}  # path -> state to commit once the current batch is consumed
+        try:
+            for path in self.paths:
+                for entry, path_state in self._entries(path):
+                    pending[path] = path_state
+                    if entry is None:
+                        continue
+                    batch.append(entry)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+                        self.state.update(pending)
+                        pending = {}
+                if not batch:
+                    self.state.update(pending)
+                    pending = {}
+                    self.save_state()
+            if batch:
+                yield batch
+            self.state.update(pending)
+        finally:
+            # Also runs when the consumer stops early: keep what was consumed
+            self.save_state()
+
+    def entries(self, batch_size=1000):
+        """Flatten ``batches()`` into single entries"""
+        for batch in self.batches(batch_size):
+            yield from batch
+
+    def _entries(self, path):
+        """Yield (entry, state after it) for new entries in ``path``, handling rotation
+
+        The last item is always (None, final state) so the caller can record
+        the position even when nothing new was read.
+        """
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            self.stats[path] = {'lines': 0, 'error': str(e)}
+            return
+        saved = self.state.get(path)
+        source = os.path.basename(path)
+        reader = READERS[detect_format(path)]
+        stats = self.stats[path] = {'lines': 0, 'rotated': False, 'truncated': False}
+
+        offset = 0 if self.from_start else st.st_size
+        if saved:
+            if (saved.get('dev'), saved.get('inode')) != (st.st_dev, st.st_ino):
+                stats['rotated'] = True
+                rotated = self._find_rotated(path, saved)
+                if rotated:
+                    # Finish the old file first so lines written just before rotation are not lost
+                    for entry, old_offset in self._read(rotated, saved.get('offset', 0), reader, source):
+                        stats['lines'] += 1
+                        yield entry, dict(saved, offset=old_offset)
+                offset = 0
+            elif st.st_size < saved.get('offset', 0):
+                stats['truncated'] = True
+                offset = 0
+            else:
+                offset = saved.get('offset', 0)
+
+        for entry, offset in self._read(path, offset, reader, source):
+            stats['lines'] += 1
+            yield entry, {'dev': st.st_dev, 'inode': st.st_ino, 'offset': offset}
+        yield None, {'dev': st.st_dev, 'inode': st.st_ino, 'offset': offset}
+
+    def _find_rotated(self, path, saved):
+        """The rotated copy of ``path`` that still has the inode we were reading"""
+        for candidate in sorted(glob.glob(f"{glob.escape(path)}[.-]*")):
+            if candidate.endswith(('.gz', '.xz', '.bz2', '.zst')):
+                continue
+            try:
+                st = os.stat(candidate)
+            except OSError:
+                continue
+            if (st.st_dev, st.st_ino) == (saved.get('dev'), saved.get('inode')):
+                return candidate
+        return None
+
+    def _read(self, path, offset, reader, source):
+        try:
+            f = open(path, 'rb')
+        except OSError as e:
+            self.stats.setdefault(path, {})['error'] = str(e)
+            return
+        with f:
+            f.seek(offset)
+            yield from reader(f, offset, source)
@@ -0,0 +1,190 @@
+"""Compiled multi-pattern matcher for log classification
+
+Most log lines match none of the patterns, and a line can match several (a
+VPN disconnect is both a connection and a service issue). Each pattern is
+reduced to literals one of which every match must contain; all literals of
+all patterns are found in one scan of the line, and only patterns whose
+literal appeared are run as regexes. Lines without any literal cost one scan
+regardless of how many rules there are.
+"""
+import re
+
+MIN_LITERAL_LENGTH = 3
+
+_REGEX_SPECIAL = set('.^$*+?{}[]()|\\')
+_LITERAL_ESCAPES = set(' -.#:/_@,\'"=<>!%&~`;')
+_VERBOSE_FLAG = re.compile(r'\(\?[a-zA-Z]*x')
+
+
+def _split_top_level(pattern):
+    """Split a regex on '|' outside groups and character classes"""
+    branches = []
+    current = []
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            current.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            branches.append(''.join(current))
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    branches.append(''.join(current))
+    return branches
+
+
+def _branch_literal(branch):
+    """Longest run of plain characters that every match of ``branch`` contains
+
+    Anything inside a group or character class, and any character made
+    optional by a following quantifier, ends the run. Returns '' when the
+    branch has no such run (e.g. it starts with an inline flag group).
+    """
+    runs = []
+    run = []
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(branch):
+        char = branch[i]
+        if char == '\\':
+            escaped = branch[i + 1:i + 2]
+            token, i = (escaped if escaped in _LITERAL_ESCAPES else None), i + 2
+        elif in_class:
+            in_class = char != ']'
+            token, i = None, i + 1
+        elif char == '[':
+            in_class = True
+            token, i = None, i + 1
+        elif char == '(':
+            depth += 1
+            token, i = None, i + 1
+        elif char == ')':
+            depth -= 1
+            token, i = None, i + 1
+        elif depth or char in _REGEX_SPECIAL:
+            token, i = None, i + 1
+        else:
+            token, i = char, i + 1
+
+        if depth or in_class:
+            token = None
+        if token is not None and branch[i:i + 1] in ('?', '*', '{'):
+            token = None  # optional or variable-length repetition
+        if token is None:
+            runs.append(''.join(run))
+            run = []
+        else:
+            run.append(token)
+            if branch[i:i + 1] == '+':
+                runs.append(''.join(run))
+                run = []
+    runs.append(''.join(run))
+    return max(runs, key=len)
+
+
+def required_literals(pattern, min_length=MIN_LITERAL_LENGTH):
+    """Literals one of which must appear in any match of ``pattern``, or None
+
+    None means no branch-wide literal of ``min_length`` characters could be
+    found and the pattern has to be tried on every line.
+    """
+    if _VERBOSE_FLAG.search(pattern):
+        return None  # whitespace and comments are not literal in verbose mode
+    literals = []
+    for branch in _split_top_level(pattern):
+        literal = _branch_literal(branch)
+        if len(literal) < min_length:
+            return None
+        literals.append(literal)
+    return literals
+
+
+class LogPatternMatcher:
+    """Classify text against a dict of named regexes, compiled once
+
+    ``match(text)`` returns the names of every pattern that ``re.search``
+    would find in ``text``, in the order the patterns were given. With the
+    literal prefilter (the default) a line is case-folded once and scanned for
+    all required literals with a single alternation; only patterns whose
+    literal was seen, plus patterns without a usable literal, are searched.
+    """
+
+    def __init__(self, patterns, flags=re.IGNORECASE, prefilter=True):
+        self.names = list(patterns)
+        self.flags = flags
+        self._order = {name: index for index, name in enumerate(self.names)}
+        self._compiled = {name: re.compile(pattern, flags) for name, pattern in patterns.items()}
+        self.prefilter = prefilter and self._build_prefilter(patterns)
+
+    def _build_prefilter(self, patterns):
+        if self.flags & re.VERBOSE:
+            return False
+        # casefold() maps at least everything IGNORECASE treats as equal onto
+        # the same text, so a literal is never missed (only over-reported)
+        fold = str.casefold if self.flags & re.IGNORECASE else str
+        owners = {}
+        unfiltered = []
+        for name, pattern in patterns.items():
+            literals = required_literals(pattern)
+            if literals is None:
+                unfiltered.append(name)
+                continue
+            for literal in literals:
+                owners.setdefault(fold(literal), set()).add(name)
+        if not owners:
+            return False
+
+        # A literal that contains another implies the shorter one is present too,
+        # so it is enough for the scanner to report one literal per position
+        for literal in owners:
+            for other, names in owners.items():
+                if other != literal and other in literal:
+                    owners[literal] = owners[literal] | names
+        alternation = '|'.join(re.escape(literal) for literal in sorted(owners, key=len, reverse=True))
+        # Zero-width lookahead so overlapping literals are all found; the text
+        # is already folded, so the scan itself is case-sensitive (much faster)
+        self._scanner = re.compile(f"(?=({alternation}))")
+        self._owners = owners
+        self._unfiltered = frozenset(unfiltered)
+        self._fold = fold
+        return True
+
+    def __len__(self):
+        return len(self.names)
+
+    def match(self, text):
+        """Names of all patterns found in ``text``"""
+        if not self.prefilter:
+            return [name for name, pattern in self._compiled.items() if pattern.search(text)]
+
+        candidates = set(self._unfiltered)
+        owners = self._owners
+        for found in self._scanner.finditer(self._fold(text)):
+            candidates.update(owners[found.group(1)])
+        if not candidates:
+            return []
+        return sorted(
+            (name for name in candidates if self._compiled[name].search(text)),
+            key=self._order.__getitem__
+        )
+
+    def match_many(self, texts):
+        """Yield ``(text, names)`` for each text"""
+        for text in texts:
+            yield text, self.match(text)
@@ -1,221 +1,105 @@
 # api_server.py
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-import psutil
-import socket
-import platform
+import dataclasses
+import json
 from datetime import datetime
 import traceback
 import sys
 import os
-import subprocess
-import shutil
+import signal
+import threading
+from sampler import get_sampler
+from shared_snapshot import SharedSnapshotReader, SharedSnapshotWriter
+from singleflight import SingleFlight
+from columnar import ColumnTable, MIMETYPE as COLUMNS_MIMETYPE, encode_tables
+from array import array
+from connectivity import get_prober
+from metrics_store import MetricsStore, DEFAULT_DB_PATH, resolution_for_range
+from stream import SnapshotBroker, format_event
+from diagnostics import get_diagnostics, probe_event
+from dns_probe import get_dns_probe
+from alert_service import get_alert_service
+from commands import CommandContext, MAX_BATCH, get_command_registry
+from payloads import calculate_health_score, build_system_status, build_alerts, build_network_stats
 
 app = Flask(__name__)
 CORS(app)
 
-def format_bytes(bytes):
-    """Format bytes to human readable format"""
-    if bytes == 0:
-        return "0B"
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if bytes < 1024.0:
-            return f"{bytes:.1f}{unit}"
-        bytes /= 1024.0
-    return f"{bytes:.1f}TB"
-
-def get_disk_usage_windows():
-    """Get disk usage specifically for Windows with robust error handling"""
-    try:
-        print("💾 Getting disk usage for Windows...")
-        
-        # Method 1: Try PowerShell (more reliable than wmic)
-        try:
-            result = subprocess.run(
-                ['powershell', '-Command', 
-                 "Get-WmiObject -Class Win32_LogicalDisk | Where-Object {$_.DeviceID -eq 'C:'} | Select-Object Size,FreeSpace"],
-                capture_output=True, text=True, timeout=10, creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line and 'Size' not in line and '----' not in line:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            try:
-                                size = int(parts[0])
-                                free_space = int(parts[1])
-                                if size > 0:
-                                    disk_usage = 100 - (free_space / size * 100)
-                                    print(f"✅ Disk Usage via PowerShell (C:): {disk_usage:.1f}%")
-                                    return disk_usage
-                            except ValueError:
-                                continue
-        except Exception as e:
-            print(f"   ❌ PowerShell failed: {e}")
-        
-        # Method 2: Try shutil as alternative (built-in Python)
-        try:
-            total, used, free = shutil.disk_usage("C:\\")
-            if total > 0:
-                disk_usage = (used / total) * 100
-                print(f"✅ Disk Usage via shutil (C:): {disk_usage:.1f}%")
-                return disk_usage
-        except Exception as e:
-            print(f"   ❌ shutil failed: {e}")
-        
-        # Method 3: Try wmic with better error handling
-        try:
-            result = subprocess.run(
-                ['wmic', 'logicaldisk', 'where', 'drivetype=3', 'get', 'size,freespace,caption'],
-                capture_output=True, text=True, timeout=10, creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                for line in lines[1:]:  # Skip header
-                    parts = line.strip().split()
-                    if len(parts) >= 3:
-                        drive = parts[0]
-                        if drive.upper() in ['C:', 'C']:
-                            try:
-                                free_space = int(parts[1])
-                                total_size = int(parts[2])
-                                if total_size > 0:
-                                    disk_usage = 100 - (free_space / total_size * 100)
-                                    print(f"✅ Disk Usage via wmic (C:): {disk_usage:.1f}%")
-                                    return disk_usage
-                            except ValueError:
-                                continue
-        except Exception as e:
-            print(f"   ❌ wmic failed: {e}")
-        
-        # Method 4: Try using ctypes (Windows API)
-        try:
-            import ctypes
-            from ctypes import wintypes
-            
-            # Get disk free space using Windows API
-            kernel32 = ctypes.windll.kernel32
-            kernel32.GetDiskFreeSpaceExW.argtypes = [
-                wintypes.LPCWSTR,
-                ctypes.POINTER(ctypes.c_ulonglong),
-                ctypes.POINTER(ctypes.c_ulonglong),
-                ctypes.POINTER(ctypes.c_ulonglong)
-            ]
-            
-            free_bytes = ctypes.c_ulonglong()
-            total_bytes = ctypes.c_ulonglong()
-            available_bytes = ctypes.c_ulonglong()
-            
-            if kernel32.GetDiskFreeSpaceExW("C:\\", ctypes.byref(free_bytes), ctypes.byref(total_bytes), ctypes.byref(available_bytes)):
-                if total_bytes.value > 0:
-                    disk_usage = 100 - (free_bytes.value / total_bytes.value * 100)
-                    print(f"✅ Disk Usage via Windows API (C:): {disk_usage:.1f}%")
-                    return disk_usage
-        except Exception as e:
-            print(f"   ❌ Windows API failed: {e}")
-        
-        return None
-        
-    except Exception as e:
-        print(f"❌ Windows disk usage detection completely failed: {e}")
-        return None
-
-def get_disk_usage_linux():
-    """Get disk usage for Linux/Mac systems"""
-    try:
-        print("💾 Getting disk usage for Linux/Mac...")
-        
-        # Method 1: Try shutil first (most reliable)
-        try:
-            total, used, free = shutil.disk_usage('/')
-            if total > 0:
-                disk_usage = (used / total) * 100
-                print(f"✅ Disk Usage via shutil (/): {disk_usage:.1f}%")
-                return disk_usage
-        except Exception as e:
-            print(f"   ❌ shutil failed: {e}")
-        
-        # Method 2: Try psutil with root path
-        try:
-            disk = psutil.disk_usage('/')
-            disk_usage = disk.percent
-            print(f"✅ Disk Usage via psutil (/): {disk_usage:.1f}%")
-            return disk_usage
-        except Exception as e:
-            print(f"   ❌ psutil failed: {e}")
-        
-        # Method 3: Try df command
-        try:
-            result = subprocess.run(
-                ['df', '/'], 
-                capture_output=True, text=True, timeout=10
-            )
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                if len(lines) > 1:
-                    parts = lines[1].split()
-                    if len(parts) >= 5:
-                        usage_str = parts[4]  # e.g., "85%"
-                        disk_usage = float(usage_str.replace('%', ''))
-                        print(f"✅ Disk Usage via df (/): {disk_usage:.1f}%")
-                        return disk_usage
-        except Exception as e:
-            print(f"   ❌ df command failed: {e}")
-        
-        return None
-        
-    except Exception as e:
-        print(f"❌ Linux disk usage detection failed: {e}")
-        return None
-
-def get_disk_usage_simple():
-    """Simple disk usage detection that works reliably"""
-    try:
-        disk_usage = 0
-        
-        if platform.system() == "Windows":
-            # For Windows, use our specialized function
-            disk_usage = get_disk_usage_windows()
-        else:
-            # For Linux/Mac
-            disk_usage = get_disk_usage_linux()
-        
-        # If all methods failed, provide a reasonable estimate
-        if disk_usage is None:
-            print("🔄 Using intelligent disk usage estimation...")
-            # Estimate based on system state
-            try:
-                memory = psutil.virtual_memory()
-                # If memory usage is high, disk usage is likely moderate to high
-                if memory.percent > 80:
-                    disk_usage = 75  # High memory often correlates with higher disk usage
-                else:
-                    disk_usage = 45  # Normal operating range
-            except:
-                disk_usage = 50  # Default fallback
-            print(f"⚠️ Estimated disk usage: {disk_usage}%")
-        
-        return disk_usage if disk_usage is not None else 50
-        
-    except Exception as e:
-        print(f"❌ Simple disk usage detection failed: {e}")
-        return 50  # Safe default
-
-def calculate_health_score(cpu, memory, disk):
-    """Calculate overall system health score"""
-    try:
-        # Lower scores for higher usage
-        cpu_score = 100 - max(0, (cpu - 20) * 0.8)  # Deduct more when CPU > 20%
-        memory_score = 100 - max(0, (memory - 30) * 0.7)  # Deduct more when memory > 30%
-        disk_score = 100 - max(0, (disk - 50) * 0.5)  # Deduct more when disk > 50%
-        
-        # Weighted average
-        score = (cpu_score * 0.4 + memory_score * 0.4 + disk_score * 0.2)
-        return max(0, min(100, int(score)))
-    except:
-        return 85  # Default score if calculation fails
+# One background sampler feeds every endpoint, so request latency no longer
+# depends on how long psutil takes and sampling cost is independent of clients.
+# Under gunicorn (see gunicorn.conf.py) a single sampler process publishes
+# snapshots to shared memory and every worker reads them from there.
+SHARED_SNAPSHOT = os.environ.get('NETMGMT_SHARED_SNAPSHOT')
+if SHARED_SNAPSHOT:
+    sampler = SharedSnapshotReader(SHARED_SNAPSHOT)
+else:
+    sampler = get_sampler()
+
+# Every snapshot is also persisted so trend queries never need to re-sample
+metrics_store = MetricsStore(os.environ.get('NETMGMT_METRICS_DB', DEFAULT_DB_PATH))
+
+def record_snapshot(snapshot):
+    """Convert a snapshot into time-series points for the metrics store"""
+    points = [
+        ('cpu.usage', None, snapshot.cpu_usage),
+        ('memory.usage', None, snapshot.memory_usage),
+        ('connections.total', None, snapshot.connections.total),
+        ('connections.established', None, snapshot.connections.established_count),
+        ('health.score', None, calculate_health_score(snapshot.cpu_usage, snapshot.memory_usage, snapshot.disk_usage)),
+    ]
+    if snapshot.disk_usage is not None:
+        points.append(('disk.usage', None, snapshot.disk_usage))
+    if snapshot.net_rates:
+        for key, value in snapshot.net_rates.items():
+            points.append((f'net.{key}', None, value))
+    for counter, column in snapshot.nics.columns.items():
+        for nic, value in zip(snapshot.nics.keys, column):
+            points.append((f'net.{counter}', {'nic': nic}, value))
+    metrics_store.record(points, ts=snapshot.timestamp.timestamp())
+
+alert_service = get_alert_service()
+diagnostics = get_diagnostics()
+if not SHARED_SNAPSHOT:
+    # Workers only read history and alert state; the process that samples
+    # also records history and advances the alert lifecycle
+    sampler.add_listener(alert_service.observe)
+    sampler.add_listener(record_snapshot)
+    metrics_store.start()
+
+def snapshot_etag(name, snapshot):
+    """ETag (without quotes) for a payload built from ``snapshot``"""
+    # The timestamp keeps tags unique across restarts, when seq starts over
+    return f"{name}-{int(snapshot.timestamp.timestamp() * 1000):x}-{snapshot.seq}"
+
+# Concurrent requests for the same payload (Dashboard and Sidebar mounting
+# together, many open dashboards) wait on one computation and share it
+flights = SingleFlight()
+
+# Diagnose results are shared by callers within this many seconds
+DIAGNOSE_FRESHNESS = 5.0
+
+def conditional_json(name, snapshot, build):
+    """jsonify(build()) tagged with the snapshot it came from
+    
+    Every payload is a function of one snapshot, so the ETag is known before
+    anything is built: a client that already has it gets an empty 304 and
+    the payload is neither built nor serialised. Otherwise the encoded body
+    is built once per snapshot and query string and shared by every caller.
+    """
+    return conditional_response(name, snapshot, lambda: jsonify(build()).get_data(), app.json.mimetype)
+
+def conditional_response(name, snapshot, render, mimetype):
+    """Like conditional_json, for a ``render()`` that returns the encoded body"""
+    etag = snapshot_etag(name, snapshot)
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        body = flights.do((name, snapshot.seq, request.query_string), render, ttl=sampler.interval)
+        response = app.response_class(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/api/health', methods=['GET', 'OPTIONS'])
 def health_check():
@@ -225,7 +109,8 @@ def health_check():
             "status": "healthy", 
             "timestamp": datetime.now().isoformat(),
             "service": "Network Management API",
-            "version": "1.0.0"
+            "version": "1.0.0",
+            "singleflight": flights.stats()
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -234,119 +119,10 @@ def health_check():
 def get_system_status():
     """API endpoint for system status"""
     try:
-        print("🔍 Fetching system status...")
-        
-        # Initialize variables with default values
-        cpu_usage = 0
-        memory_usage = 0
-        total_memory_gb = 0
-        disk_usage = 0
-        network_sent = 0
-        network_received = 0
-        network_errors = 0
-        established_count = 0
-        
-        # Get basic system information
-        hostname = socket.gethostname()
-        print(f"📝 Hostname: {hostname}")
-        
-        # Get local IP address
-        try:
-            local_ip = socket.gethostbyname(hostname)
-        except:
-            local_ip = "127.0.0.1"
-        print(f"📝 Local IP: {local_ip}")
-        
-        # Check internet connectivity
-        try:
-            socket.create_connection(("8.8.8.8", 53), timeout=3)
-            internet_status = "✅ Connected"
-            print("🌐 Internet: Connected")
-        except:
-            internet_status = "❌ Disconnected"
-            print("🌐 Internet: Disconnected")
-        
-        # Get system metrics with error handling
-        try:
-            cpu_usage = psutil.cpu_percent(interval=0.5)
-            print(f"💻 CPU Usage: {cpu_usage}%")
-        except Exception as e:
-            print(f"⚠️ Failed to get CPU usage: {e}")
-            cpu_usage = 0
-        
-        try:
-            memory = psutil.virtual_memory()
-            memory_usage = memory.percent
-            total_memory_gb = memory.total / (1024**3)
-            print(f"🧠 Memory Usage: {memory_usage}%")
-        except Exception as e:
-            print(f"⚠️ Failed to get memory usage: {e}")
-            memory_usage = 0
-            total_memory_gb = 0
-        
-        # Use the simple, reliable disk usage function
-        try:
-            disk_usage = get_disk_usage_simple()
-            print(f"💾 Final Disk Usage: {disk_usage}%")
-        except Exception as e:
-            print(f"❌ Disk usage detection failed: {e}")
-            disk_usage = 50  # Safe default
-        
-        # Get network statistics
-        try:
-            net_io = psutil.net_io_counters()
-            network_sent = net_io.bytes_sent
-            network_received = net_io.bytes_recv
-            network_errors = net_io.errin + net_io.errout
-            print(f"📡 Network - Sent: {format_bytes(network_sent)}, Received: {format_bytes(network_received)}")
-        except Exception as e:
-            print(f"⚠️ Failed to get network stats: {e}")
-            network_sent = 0
-            network_received = 0
-            network_errors = 0
-        
-        # Get active connections
-        try:
-            connections = psutil.net_connections()
-            established_count = len([c for c in connections if c.status == 'ESTABLISHED'])
-            print(f"🔗 Active Connections: {established_count}")
-        except Exception as e:
-            print(f"⚠️ Failed to get connections: {e}")
-            established_count = 0
-        
-        # Calculate health score
-        health_score = calculate_health_score(cpu_usage, memory_usage, disk_usage)
-        print(f"📊 Health Score: {health_score}")
-        
-        # Get uptime
-        try:
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
-            uptime = datetime.now() - boot_time
-            uptime_str = str(uptime).split('.')[0]
-        except:
-            uptime_str = "Unknown"
-        
-        system_info = {
-            "platform": f"{platform.system()}-{platform.release()}",
-            "processor": platform.processor() or "Unknown",
-            "memory": f"{total_memory_gb:.1f} GB",
-            "hostname": hostname,
-            "local_ip": local_ip,
-            "internet": internet_status,
-            "cpu_usage": cpu_usage,
-            "memory_usage": memory_usage,
-            "disk_usage": disk_usage,
-            "active_connections": established_count,
-            "network_sent": network_sent,
-            "network_received": network_received,
-            "network_errors": network_errors,
-            "uptime": uptime_str,
-            "health_score": health_score,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        print("✅ System status fetched successfully")
-        return jsonify(system_info)
+        snapshot = sampler.latest()
+        if snapshot is None:
+            return jsonify({"error": "Metrics not available yet"}), 503
+        return conditional_json('status', snapshot, lambda: build_system_status(snapshot))
         
     except Exception as e:
         error_msg = f"Error in system-status: {str(e)}"
@@ -354,187 +130,47 @@ def get_system_status():
         print(traceback.format_exc())
         return jsonify({"error": error_msg}), 500
 
+def breakdown_tables(snapshot):
+    """Per-core CPU, per-NIC counters and per-mount disk usage as column tables"""
+    per_core = snapshot.cpu.per_core if snapshot.cpu else array('d')
+    return {
+        'cores': ColumnTable((f"cpu{index}" for index in range(len(per_core))), {'percent': per_core}),
+        'nics': snapshot.nics,
+        'mounts': snapshot.mounts,
+    }
+
+@app.route('/api/breakdown', methods=['GET', 'OPTIONS'])
+def get_breakdown():
+    """Per-core, per-NIC and per-mount breakdown; ?format=binary for the packed encoding"""
+    try:
+        snapshot = sampler.latest()
+        if snapshot is None:
+            return jsonify({"error": "Metrics not available yet"}), 503
+        if request.args.get('format') == 'binary':
+            return conditional_response('breakdown-bin', snapshot, lambda: encode_tables(
+                breakdown_tables(snapshot), snapshot.seq, snapshot.timestamp.timestamp()
+            ), COLUMNS_MIMETYPE)
+        return conditional_json('breakdown', snapshot, lambda: dict(
+            {name: table.to_dict() for name, table in breakdown_tables(snapshot).items()},
+            seq=snapshot.seq,
+            timestamp=snapshot.timestamp.isoformat()
+        ))
+        
+    except Exception as e:
+        error_msg = f"Error in breakdown: {str(e)}"
+        print(f"❌ {error_msg}")
+        print(traceback.format_exc())
+        return jsonify({"error": error_msg}), 500
+
 @app.route('/api/alerts', methods=['GET', 'OPTIONS'])
 def get_alerts():
     """API endpoint for alerts"""
     try:
-        print("🚨 Fetching alerts...")
-        
-        # Get system metrics for alert generation
-        cpu_percent = 0
-        memory_percent = 0
-        disk_percent = 0
-        net_io = None
-        
-        try:
-            # Get CPU usage with proper error handling
-            cpu_percent = psutil.cpu_percent(interval=0.5)
-            print(f"💻 CPU Usage: {cpu_percent}%")
-        except Exception as e:
-            print(f"⚠️ Failed to get CPU usage: {e}")
-            cpu_percent = 0
-        
-        try:
-            # Get memory usage
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            print(f"🧠 Memory Usage: {memory_percent}%")
-        except Exception as e:
-            print(f"⚠️ Failed to get memory usage: {e}")
-            memory_percent = 0
-        
-        # Use the simple, reliable disk usage function
-        try:
-            disk_percent = get_disk_usage_simple()
-            print(f"💾 Final Disk Usage for Alerts: {disk_percent}%")
-        except Exception as e:
-            print(f"❌ Disk usage detection failed in alerts: {e}")
-            disk_percent = 50  # Safe default
-        
-        try:
-            # Get network statistics
-            net_io = psutil.net_io_counters()
-            print(f"📡 Network errors: {net_io.errin + net_io.errout}")
-        except Exception as e:
-            print(f"⚠️ Failed to get network stats: {e}")
-            net_io = None
-        
-        # Generate alerts based on thresholds
-        alerts = {
-            'CRITICAL': [],
-            'WARNING': [],
-            'INFO': []
-        }
-        
-        current_time = datetime.now()
-        
-        # Critical alerts
-        if disk_percent > 95:
-            alerts['CRITICAL'].append({
-                'timestamp': current_time.isoformat(),
-                'metric': 'Disk Usage',
-                'message': f'Critical disk space: {disk_percent:.1f}%',
-                'severity': 'CRITICAL',
-                'device': 'Storage'
-            })
-        
-        if cpu_percent > 90:
-            alerts['CRITICAL'].append({
-                'timestamp': current_time.isoformat(),
-                'metric': 'CPU Usage',
-                'message': f'Critical CPU usage: {cpu_percent:.1f}%',
-                'severity': 'CRITICAL',
-                'device': 'System'
-            })
-        
-        # Warning alerts
-        if cpu_percent > 80:
-            alerts['WARNING'].append({
-                'timestamp': current_time.isoformat(),
-                'metric': 'CPU Usage',
-                'message': f'High CPU usage: {cpu_percent:.1f}%',
-                'severity': 'WARNING',
-                'device': 'System'
-            })
-        
-        if memory_percent > 80:
-            alerts['WARNING'].append({
-                'timestamp': current_time.isoformat(),
-                'metric': 'Memory Usage',
-                'message': f'High memory usage: {memory_percent:.1f}%',
-                'severity': 'WARNING',
-                'device': 'System'
-            })
-        
-        if net_io and (net_io.errin + net_io.errout > 10):
-            alerts['WARNING'].append({
-                'timestamp': current_time.isoformat(),
-                'metric': 'Network Errors',
-                'message': f'High network errors: {net_io.errin + net_io.errout}',
-                'severity': 'WARNING',
-                'device': 'Network'
-            })
-        
-        # Info alerts
-        if net_io:
-            alerts['INFO'].append({
-                'timestamp': current_time.isoformat(),
-                'metric': 'Network Errors',
-                'message': f'{net_io.errin + net_io.errout} errors',
-                'severity': 'INFO',
-                'device': 'Network'
-            })
-        else:
-            alerts['INFO'].append({
-                'timestamp': current_time.isoformat(),
-                'metric': 'Network Errors',
-                'message': 'Unable to read network statistics',
-                'severity': 'INFO',
-                'device': 'Network'
-            })
-        
-        # Check internet connectivity for info alert
-        try:
-            socket.create_connection(("8.8.8.8", 53), timeout=3)
-            internet_status = "✅ Connected"
-        except:
-            internet_status = "❌ Disconnected"
-            
-        alerts['INFO'].append({
-            'timestamp': current_time.isoformat(),
-            'metric': 'Internet Connectivity',
-            'message': internet_status,
-            'severity': 'INFO',
-            'device': 'Network'
-        })
-        
-        # Get connections for info alert
-        try:
-            connections = psutil.net_connections()
-            established_count = len([c for c in connections if c.status == 'ESTABLISHED'])
-            alerts['INFO'].append({
-                'timestamp': current_time.isoformat(),
-                'metric': 'Active Connections',
-                'message': f'Active connections: {established_count}',
-                'severity': 'INFO',
-                'device': 'Network'
-            })
-        except Exception as e:
-            alerts['INFO'].append({
-                'timestamp': current_time.isoformat(),
-                'metric': 'Active Connections',
-                'message': f'Unable to count connections: {str(e)}',
-                'severity': 'INFO',
-                'device': 'Network'
-            })
-        
-        # Summary
-        critical_count = len(alerts['CRITICAL'])
-        warning_count = len(alerts['WARNING'])
-        total_alerts = critical_count + warning_count + len(alerts['INFO'])
-        
-        if critical_count > 0:
-            health_status = 'CRITICAL'
-        elif warning_count > 0:
-            health_status = 'WARNING'
-        else:
-            health_status = 'HEALTHY'
-        
-        summary = {
-            'total_alerts': total_alerts,
-            'critical_count': critical_count,
-            'warning_count': warning_count,
-            'health_status': health_status
-        }
-        
-        print(f"✅ Alerts fetched: {critical_count} critical, {warning_count} warnings, {len(alerts['INFO'])} info")
-        
-        return jsonify({
-            'CRITICAL': alerts['CRITICAL'],
-            'WARNING': alerts['WARNING'],
-            'INFO': alerts['INFO'],
-            'summary': summary
-        })
+        snapshot = sampler.latest()
+        if snapshot is None:
+            return jsonify({"error": "Metrics not available yet"}), 503
+        since = request.args.get('since', type=int)
+        return conditional_json('alerts', snapshot, lambda: build_alerts(snapshot, since))
         
     except Exception as e:
         error_msg = f"Error in alerts: {str(e)}"
@@ -546,154 +182,11 @@ def get_alerts():
 def get_network_stats():
     """API endpoint for network statistics"""
     try:
-        print("📊 Fetching network stats...")
-        current_time = datetime.now()
-        logs = []
-        
-        # Network statistics
-        try:
-            net_io = psutil.net_io_counters()
-            logs.append({
-                'timestamp': current_time.isoformat(),
-                'message': f"Network Traffic - Sent: {format_bytes(net_io.bytes_sent)} | Received: {format_bytes(net_io.bytes_recv)}",
-                'source': 'Network-Statistics',
-                'severity': 'INFO'
-            })
-            
-            logs.append({
-                'timestamp': current_time.isoformat(),
-                'message': f"Packet Statistics - Sent: {net_io.packets_sent} | Received: {net_io.packets_recv} | Errors: {net_io.errin + net_io.errout}",
-                'source': 'Network-Statistics',
-                'severity': 'WARNING' if (net_io.errin + net_io.errout) > 0 else 'INFO'
-            })
-        except Exception as e:
-            print(f"❌ Failed to get network stats: {e}")
-            logs.append({
-                'timestamp': current_time.isoformat(),
-                'message': f"Failed to get network statistics: {e}",
-                'source': 'Network-Statistics',
-                'severity': 'WARNING'
-            })
-        
-        # Connection analysis
-        try:
-            connections = psutil.net_connections()
-            established_count = len([c for c in connections if c.status == 'ESTABLISHED'])
-            logs.append({
-                'timestamp': current_time.isoformat(),
-                'message': f"Connection Analysis - Established: {established_count} | Total: {len(connections)}",
-                'source': 'Connection-Analysis',
-                'severity': 'INFO'
-            })
-        except Exception as e:
-            print(f"❌ Failed to get connections: {e}")
-            logs.append({
-                'timestamp': current_time.isoformat(),
-                'message': f"Failed to analyze connections: {e}",
-                'source': 'Connection-Analysis',
-                'severity': 'WARNING'
-            })
-        
-        # Interface status
-        try:
-            interfaces = psutil.net_if_stats()
-            interface_count = 0
-            for interface, stats in interfaces.items():
-                if interface_count >= 5:  # Limit to 5 interfaces
-                    break
-                status = "UP" if stats.isup else "DOWN"
-                logs.append({
-                    'timestamp': current_time.isoformat(),
-                    'message': f"Interface {interface}: {status} | Speed: {stats.speed}Mbps",
-                    'source': 'Interface-Status',
-                    'severity': 'INFO' if stats.isup else 'WARNING'
-                })
-                interface_count += 1
-        except Exception as e:
-            print(f"❌ Failed to get interface stats: {e}")
-            logs.append({
-                'timestamp': current_time.isoformat(),
-                'message': f"Failed to get interface status: {e}",
-                'source': 'Interface-Status',
-                'severity': 'WARNING'
-            })
-        
-        # Process network usage
-        try:
-            connections = psutil.net_connections()
-            process_connections = {}
-            for conn in connections:
-                if conn.pid:
-                    if conn.pid not in process_connections:
-                        process_connections[conn.pid] = 0
-                    process_connections[conn.pid] += 1
-            
-            # Show top 5 processes
-            top_processes = sorted(process_connections.items(), key=lambda x: x[1], reverse=True)[:5]
-            for pid, conn_count in top_processes:
-                try:
-                    process = psutil.Process(pid)
-                    logs.append({
-                        'timestamp': current_time.isoformat(),
-                        'message': f"Process {process.name()} (PID: {pid}): {conn_count} connections",
-                        'source': 'Process-Network',
-                        'severity': 'INFO'
-                    })
-                except:
-                    continue
-        except Exception as e:
-            print(f"❌ Failed to get process network usage: {e}")
-            logs.append({
-                'timestamp': current_time.isoformat(),
-                'message': f"Failed to get process network usage: {e}",
-                'source': 'Process-Network',
-                'severity': 'WARNING'
-            })
-        
-        # Analysis summary
-        info_count = len([log for log in logs if log['severity'] == 'INFO'])
-        warning_count = len([log for log in logs if log['severity'] == 'WARNING'])
-        critical_count = len([log for log in logs if log['severity'] == 'CRITICAL'])
-        
-        analysis = {
-            'total_logs': len(logs),
-            'patterns_detected': {},
-            'severity_distribution': {
-                'INFO': info_count,
-                'WARNING': warning_count,
-                'CRITICAL': critical_count
-            }
-        }
-        
-        # Calculate health score based on warnings
-        base_score = 95
-        health_score = max(60, base_score - (warning_count * 5) - (critical_count * 15))
-        
-        summary = {
-            'executive_summary': [
-                f"Analyzed {analysis['total_logs']} network events",
-                f"Found {len(analysis['patterns_detected'])} distinct issue patterns",
-                f"Severity distribution: {analysis['severity_distribution']}"
-            ],
-            'detailed_insights': [],
-            'recommendations': [
-                "✅ Network operating optimally - continue monitoring",
-                "📊 Monitor system performance regularly"
-            ],
-            'health_score': health_score
-        }
-        
-        # Add insights if there are warnings
-        if warning_count > 0:
-            summary['detailed_insights'].append("🔍 Some network interfaces or processes showing warnings")
-        
-        print(f"✅ Network stats fetched: {len(logs)} log entries")
-        
-        return jsonify({
-            'logs': logs,
-            'analysis': analysis,
-            'summary': summary
-        })
+        snapshot = sampler.latest()
+        if snapshot is None:
+            return jsonify({"error": "Metrics not available yet"}), 503
+        since = request.args.get('since', type=int)
+        return conditional_json('network', snapshot, lambda: build_network_stats(snapshot, since, sampler.processes))
         
     except Exception as e:
         error_msg = f"Error in network-stats: {str(e)}"
@@ -701,566 +194,147 @@ def get_network_stats():
         print(traceback.format_exc())
         return jsonify({"error": error_msg}), 500
 
+def build_stream_state(snapshot):
+    """Everything the dashboard polls for, sectioned so the stream can send field-level deltas"""
+    return {
+        'system': build_system_status(snapshot),
+        'alerts': build_alerts(snapshot)
+    }
+
+stream_broker = SnapshotBroker(build_stream_state)
+sampler.add_listener(stream_broker.publish)
+
+@app.route('/api/stream', methods=['GET'])
+def stream_snapshots():
+    """Server-Sent Events: a full snapshot on connect, then deltas as the sampler produces them"""
+    sampler.start()
+    return Response(
+        stream_broker.events(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@app.route('/api/connectivity', methods=['GET', 'OPTIONS'])
+def get_connectivity():
+    """API endpoint for cached connectivity verdict and per-target probe latency"""
+    try:
+        prober = get_prober()
+        return jsonify({
+            'internet': prober.status_text(),
+            'verdict': prober.verdict(),
+            'targets': prober.target_stats(),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/dns', methods=['GET', 'OPTIONS'])
+def get_dns():
+    """API endpoint for per-resolver DNS health (probed at most once per probe TTL)"""
+    try:
+        probe = get_dns_probe()
+        return jsonify({
+            'query': probe.query_name,
+            'servers': [result._asdict() for result in probe.probe_sync()],
+            'history': probe.server_stats(),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/metrics/history', methods=['GET', 'OPTIONS'])
+def get_metrics_history():
+    """API endpoint for stored metric trends (e.g. ?metric=cpu.usage&minutes=60)"""
+    try:
+        metric = request.args.get('metric')
+        if not metric:
+            return jsonify({"series": metrics_store.series()})
+        
+        minutes = float(request.args.get('minutes', 60))
+        end = datetime.now().timestamp()
+        start = end - minutes * 60
+        resolution = request.args.get('resolution') or resolution_for_range(minutes * 60)
+        if resolution not in ('raw', '1m', '1h'):
+            return jsonify({"error": f"Unknown resolution '{resolution}'. Use raw, 1m or 1h"}), 400
+        
+        points = metrics_store.query(metric, request.args.get('labels'), start, end, resolution)
+        return jsonify({
+            'metric': metric,
+            'labels': request.args.get('labels', ''),
+            'resolution': resolution,
+            'points': points
+        })
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameter: {e}"}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def run_diagnostics():
+    """diagnose command response, shared by callers within DIAGNOSE_FRESHNESS seconds"""
+    return flights.do(
+        'diagnose',
+        lambda: diagnostics.report(diagnostics.run(sampler.latest())),
+        ttl=DIAGNOSE_FRESHNESS
+    )
+
+@app.route('/api/diagnose', methods=['GET'])
+def stream_diagnostics():
+    """Server-Sent Events: one 'probe' event per check as it finishes, then the 'report'"""
+    snapshot = sampler.latest()
+    if snapshot is None:
+        return jsonify({"error": "Metrics not available yet"}), 503
+    
+    def generate():
+        results = {}
+        for result in diagnostics.iter_results(snapshot):
+            results[result.name] = result
+            yield format_event('probe', json.dumps(probe_event(result)))
+        yield format_event('report', json.dumps({"response": diagnostics.report(results)}))
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+commands = get_command_registry()
+
 @app.route('/api/command', methods=['POST', 'OPTIONS'])
 def handle_command():
-    """API endpoint for ChatOps commands"""
+    """API endpoint for ChatOps commands: {"command": "..."} or {"commands": [...]}"""
     try:
         if request.method == 'OPTIONS':
             return '', 200
             
-        data = request.get_json()
-        if not data:
+        data = request.get_json(silent=True)
+        if not data or not isinstance(data, dict):
             return jsonify({"response": "No command data provided"}), 400
-            
-        command = data.get('command', '').strip().lower()
-        print(f"💬 Received command: {command}")
-        
-        # Process different commands with REAL data
-        if command == 'help':
-            response = """🤖 NETWORK MANAGEMENT ASSISTANT - Available Commands:
-
-📊 MONITORING COMMANDS:
-• status - Show current network status
-• alerts - Display current system alerts  
-• summary - Show log analysis summary
-• diagnose - Run comprehensive diagnostics
-
-🔍 NETWORK COMMANDS:
-• scan - Scan network interfaces and connections
-• processes - Show top network processes
-• bandwidth - Show bandwidth usage statistics
-• connections - Show active network connections
-• interfaces - Show network interface details
-
-🛠️ TROUBLESHOOTING COMMANDS:
-• troubleshoot internet - Internet connectivity issues
-• troubleshoot wifi - WiFi connection problems
-• troubleshoot slow - Slow network performance
-• troubleshoot dns - DNS resolution issues
-
-💡 Type any command above to get real-time system information!"""
-        
-        elif command == 'status':
-            # Get real system status
-            try:
-                status_data = get_system_status().get_json()
-                if 'error' in status_data:
-                    response = f"❌ Error getting status: {status_data['error']}"
-                else:
-                    response = f"""🌐 REAL-TIME NETWORK STATUS:
-
-🏠 BASIC INFORMATION:
-  • Hostname: {status_data.get('hostname', 'Unknown')}
-  • Local IP: {status_data.get('local_ip', 'Unknown')}
-  • Internet: {status_data.get('internet', 'Unknown')}
-  • System Uptime: {status_data.get('uptime', 'Unknown')}
-
-📊 PERFORMANCE METRICS:
-  • CPU Usage: {status_data.get('cpu_usage', 0):.1f}%
-  • Memory Usage: {status_data.get('memory_usage', 0):.1f}%
-  • Disk Usage: {status_data.get('disk_usage', 0):.1f}%
-  • System Health: {status_data.get('health_score', 0)}/100
-
-🔗 NETWORK ACTIVITY:
-  • Active Connections: {status_data.get('active_connections', 0)}
-  • Data Sent: {format_bytes(status_data.get('network_sent', 0))}
-  • Data Received: {format_bytes(status_data.get('network_received', 0))}
-  • Network Errors: {status_data.get('network_errors', 0)}
-
-⏰ Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"""
-            except Exception as e:
-                response = f"❌ Error fetching status: {str(e)}"
-        
-        elif command == 'alerts':
-            # Get real alerts
-            try:
-                alerts_data = get_alerts().get_json()
-                if 'error' in alerts_data:
-                    response = f"❌ Error getting alerts: {alerts_data['error']}"
-                else:
-                    critical_count = len(alerts_data.get('CRITICAL', []))
-                    warning_count = len(alerts_data.get('WARNING', []))
-                    info_count = len(alerts_data.get('INFO', []))
-                    
-                    response = f"""🚨 REAL-TIME ALERT SUMMARY:
-
-📈 ALERT OVERVIEW:
-  • Overall Status: {alerts_data.get('summary', {}).get('health_status', 'UNKNOWN')}
-  • Critical Alerts: {critical_count}
-  • Warning Alerts: {warning_count} 
-  • Informational Alerts: {info_count}
-  • Total Active Alerts: {alerts_data.get('summary', {}).get('total_alerts', 0)}
-
-🔴 CRITICAL ALERTS:"""
-                    
-                    # Show critical alerts
-                    for alert in alerts_data.get('CRITICAL', [])[:3]:
-                        response += f"\n  • {alert.get('message', 'Unknown')}"
-                    
-                    if not alerts_data.get('CRITICAL'):
-                        response += "\n  • None (Good!)"
-                    
-                    response += "\n\n🟡 WARNING ALERTS:"
-                    # Show warning alerts  
-                    for alert in alerts_data.get('WARNING', [])[:3]:
-                        response += f"\n  • {alert.get('message', 'Unknown')}"
-                    
-                    if not alerts_data.get('WARNING'):
-                        response += "\n  • None (Good!)"
-            except Exception as e:
-                response = f"❌ Error fetching alerts: {str(e)}"
-        
-        elif command == 'summary':
-            # Get log analysis summary
-            try:
-                network_data = get_network_stats().get_json()
-                if 'error' in network_data:
-                    response = f"❌ Error getting summary: {network_data['error']}"
-                else:
-                    summary = network_data.get('summary', {})
-                    analysis = network_data.get('analysis', {})
-                    logs = network_data.get('logs', [])
-                    
-                    response = f"""📋 NETWORK LOG ANALYSIS SUMMARY:
-
-📊 EXECUTIVE SUMMARY:
-  • Network Health Score: {summary.get('health_score', 0)}/100
-  • Total Log Entries Analyzed: {analysis.get('total_logs', 0)}
-  • Issue Patterns Detected: {len(analysis.get('patterns_detected', {}))}
-
-📈 SEVERITY DISTRIBUTION:"""
-                    
-                    # Show severity distribution
-                    severity_dist = analysis.get('severity_distribution', {})
-                    for severity, count in severity_dist.items():
-                        icon = "🔵" if severity == 'INFO' else "🟡" if severity == 'WARNING' else "🔴"
-                        response += f"\n  • {icon} {severity}: {count} events"
-                    
-                    response += "\n\n🔍 RECENT LOG ENTRIES:"
-                    # Show recent log entries
-                    for log in logs[:5]:  # Show last 5 logs
-                        icon = "🔵" if log.get('severity') == 'INFO' else "🟡" if log.get('severity') == 'WARNING' else "🔴"
-                        time_str = log.get('timestamp', '')[:19].replace('T', ' ')
-                        response += f"\n  • {icon} [{log.get('source', 'Unknown')}] {log.get('message', 'Unknown')}"
-                        response += f"\n    ⏰ {time_str}"
-                    
-                    response += "\n\n💡 RECOMMENDATIONS:"
-                    for rec in summary.get('recommendations', []):
-                        response += f"\n  • {rec}"
-                        
-            except Exception as e:
-                response = f"❌ Error fetching summary: {str(e)}"
-        
-        elif command == 'scan':
-            # Real network scan
-            try:
-                interfaces = psutil.net_if_addrs()
-                connections = psutil.net_connections()
-                
-                established_count = len([c for c in connections if c.status == 'ESTABLISHED'])
-                listen_count = len([c for c in connections if c.status == 'LISTEN'])
-                
-                response = f"""🔍 NETWORK SCAN RESULTS:
-
-🌐 NETWORK INTERFACES:"""
-                
-                # Show interface details
-                interface_count = 0
-                for interface, addrs in list(interfaces.items())[:6]:
-                    response += f"\n\n  📡 {interface}:"
-                    ip_count = 0
-                    for addr in addrs:
-                        if addr.family == socket.AF_INET and ip_count < 2:
-                            response += f"\n    • IP: {addr.address}"
-                            if addr.netmask:
-                                response += f" | Netmask: {addr.netmask}"
-                            ip_count += 1
-                    interface_count += 1
-                
-                response += f"""
-
-🔗 CONNECTION SUMMARY:
-  • Established Connections: {established_count}
-  • Listening Ports: {listen_count}
-  • Total Connections: {len(connections)}
-  
-💡 Scan completed at {datetime.now().strftime('%H:%M:%S')}"""
-            except Exception as e:
-                response = f"❌ Error during network scan: {str(e)}"
-        
-        elif command == 'processes':
-            # Real process information
-            try:
-                connections = psutil.net_connections()
-                process_connections = {}
-                
-                # Count connections per process
-                for conn in connections:
-                    if conn.pid:
-                        if conn.pid not in process_connections:
-                            process_connections[conn.pid] = 0
-                        process_connections[conn.pid] += 1
-                
-                # Get top 8 processes
-                top_processes = sorted(process_connections.items(), key=lambda x: x[1], reverse=True)[:8]
-                
-                response = """🖥️ TOP NETWORK PROCESSES:
-
-┌──────────────────────────────┬──────────┬────────────┐
-│ Process Name                 │ PID      │ Connections│
-├──────────────────────────────┼──────────┼────────────┤"""
-                
-                for pid, conn_count in top_processes:
-                    try:
-                        process = psutil.Process(pid)
-                        name = process.name()[:25]
-                        response += f"\n│ {name:<26} │ {pid:<8} │ {conn_count:<10} │"
-                    except:
-                        response += f"\n│ Unknown Process {'':<9} │ {pid:<8} │ {conn_count:<10} │"
-                
-                response += "\n└──────────────────────────────┴──────────┴────────────┘"
-                response += f"\n\n📊 Total processes with network activity: {len(top_processes)}"
-                
-            except Exception as e:
-                response = f"❌ Error fetching process information: {str(e)}"
-        
-        elif command == 'bandwidth':
-            # Real bandwidth statistics
-            try:
-                net_io = psutil.net_io_counters()
-                
-                response = f"""📊 BANDWIDTH USAGE STATISTICS:
-
-📈 DATA TRANSFER:
-  • Total Sent: {format_bytes(net_io.bytes_sent)}
-  • Total Received: {format_bytes(net_io.bytes_recv)}
-  • Total Data: {format_bytes(net_io.bytes_sent + net_io.bytes_recv)}
-
-📦 PACKET STATISTICS:
-  • Packets Sent: {net_io.packets_sent:,}
-  • Packets Received: {net_io.packets_recv:,}
-  • Total Packets: {net_io.packets_sent + net_io.packets_recv:,}
-
-❌ ERROR STATISTICS:
-  • Errors In: {net_io.errin}
-  • Errors Out: {net_io.errout}
-  • Total Errors: {net_io.errin + net_io.errout}
-
-📉 PACKET LOSS:
-  • Dropped In: {net_io.dropin}
-  • Dropped Out: {net_io.dropout}
-  • Total Dropped: {net_io.dropin + net_io.dropout}
-
-💡 Statistics since last system boot"""
-                
-            except Exception as e:
-                response = f"❌ Error fetching bandwidth statistics: {str(e)}"
-        
-        elif command == 'connections':
-            # Real connection details
-            try:
-                connections = psutil.net_connections()
-                established_conns = [c for c in connections if c.status == 'ESTABLISHED']
-                
-                response = f"""🔗 ACTIVE NETWORK CONNECTIONS:
-
-📊 CONNECTION OVERVIEW:
-  • Total Established: {len(established_conns)}
-  • Total Connections: {len(connections)}
-  • Connection States:"""
-                
-                # Count by status
-                status_count = {}
-                for conn in connections:
-                    status_count[conn.status] = status_count.get(conn.status, 0) + 1
-                
-                for status, count in list(status_count.items())[:5]:
-                    response += f"\n    • {status}: {count}"
-                
-                response += "\n\n🌐 RECENT ESTABLISHED CONNECTIONS:"
-                
-                # Show recent established connections
-                for conn in established_conns[:5]:
-                    local_addr = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else "N/A"
-                    remote_addr = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "N/A"
-                    
-                    response += f"\n  • {local_addr} ↔ {remote_addr}"
-                    if conn.pid:
-                        try:
-                            process = psutil.Process(conn.pid)
-                            response += f"\n    └─ Process: {process.name()} (PID: {conn.pid})"
-                        except:
-                            response += f"\n    └─ Process: Unknown (PID: {conn.pid})"
-                
-            except Exception as e:
-                response = f"❌ Error fetching connection details: {str(e)}"
         
-        elif command == 'interfaces':
-            # Real interface details
-            try:
-                interfaces = psutil.net_if_stats()
-                interface_addrs = psutil.net_if_addrs()
-                
-                response = """📡 NETWORK INTERFACE DETAILS:
-
-┌──────────────────────────────┬──────────┬────────┬──────────┐
-│ Interface Name               │ Status   │ Speed  │ MTU      │
-├──────────────────────────────┼──────────┼────────┼──────────┤"""
-                
-                interface_count = 0
-                for interface, stats in list(interfaces.items())[:8]:
-                    status = "✅ UP" if stats.isup else "❌ DOWN"
-                    speed = f"{stats.speed}Mbps" if stats.speed > 0 else "N/A"
-                    mtu = stats.mtu
-                    
-                    name = interface[:26]
-                    response += f"\n│ {name:<26} │ {status:<8} │ {speed:<6} │ {mtu:<8} │"
-                    interface_count += 1
-                
-                response += "\n└──────────────────────────────┴──────────┴────────┴──────────┘"
-                response += f"\n\n📊 Total interfaces detected: {interface_count}"
-                
-                # Show IP addresses for first 3 interfaces
-                response += "\n\n🌐 IP ADDRESSES:"
-                ip_count = 0
-                for interface, addrs in list(interface_addrs.items())[:3]:
-                    response += f"\n  📡 {interface}:"
-                    for addr in addrs:
-                        if addr.family == socket.AF_INET and ip_count < 6:
-                            response += f"\n    • {addr.address}"
-                            ip_count += 1
-                
-            except Exception as e:
-                response = f"❌ Error fetching interface details: {str(e)}"
-        
-        elif command == 'diagnose':
-            # Comprehensive diagnostics with real checks
-            try:
-                diagnostics = []
-                
-                # Internet connectivity
-                try:
-                    socket.create_connection(("8.8.8.8", 53), timeout=5)
-                    diagnostics.append("✅ Internet Connectivity: PASS")
-                except:
-                    diagnostics.append("❌ Internet Connectivity: FAIL")
-                
-                # DNS resolution
-                try:
-                    socket.gethostbyname("google.com")
-                    diagnostics.append("✅ DNS Resolution: PASS")
-                except:
-                    diagnostics.append("❌ DNS Resolution: FAIL")
-                
-                # Local network
-                try:
-                    interfaces = psutil.net_if_stats()
-                    up_interfaces = sum(1 for stats in interfaces.values() if stats.isup)
-                    diagnostics.append(f"📡 Network Interfaces: {up_interfaces}/{len(interfaces)} UP")
-                except Exception as e:
-                    diagnostics.append(f"⚠️ Network Interfaces: Error - {str(e)}")
-                
-                # Resource check
-                try:
-                    cpu = psutil.cpu_percent(interval=0.5)
-                    memory = psutil.virtual_memory().percent
-                    diagnostics.append(f"💻 System Resources: CPU {cpu:.1f}%, Memory {memory:.1f}%")
-                except Exception as e:
-                    diagnostics.append(f"⚠️ System Resources: Error - {str(e)}")
-                
-                # Connection test
-                try:
-                    connections = psutil.net_connections()
-                    established = len([c for c in connections if c.status == 'ESTABLISHED'])
-                    diagnostics.append(f"🔗 Active Connections: {established} established")
-                except Exception as e:
-                    diagnostics.append(f"⚠️ Active Connections: Error - {str(e)}")
-                
-                # Disk space using our reliable function
-                try:
-                    disk_usage = get_disk_usage_simple()
-                    diagnostics.append(f"💾 Disk Space: {disk_usage:.1f}% used")
-                except Exception as e:
-                    diagnostics.append(f"⚠️ Disk Space: Error - {str(e)}")
-                
-                diagnostics_text = "\n".join([f"  • {diag}" for diag in diagnostics])
-                
-                response = f"""🔍 COMPREHENSIVE SYSTEM DIAGNOSTICS:
-
-{diagnostics_text}
-
-📊 OVERALL ASSESSMENT:"""
-                
-                # Overall assessment with error handling
-                try:
-                    if cpu > 90 or memory > 90 or disk_usage > 95:
-                        response += "\n  ⚠️  System under heavy load - consider optimization"
-                    elif up_interfaces == 0:
-                        response += "\n  ❌ No network interfaces available"
-                    else:
-                        response += "\n  ✅ System operating within normal parameters"
-                except:
-                    response += "\n  🔍 System assessment incomplete - some metrics unavailable"
-                
-                response += f"\n\n💡 Diagnostics completed at {datetime.now().strftime('%H:%M:%S')}"
-                
-            except Exception as e:
-                response = f"❌ Error running diagnostics: {str(e)}"
-        
-        elif command.startswith('troubleshoot'):
-            issue = command.replace('troubleshoot', '').strip()
-            if not issue:
-                response = "Please specify an issue. Usage: troubleshoot <internet|wifi|slow|dns>"
-            elif issue == 'internet':
-                response = """🔧 TROUBLESHOOTING: INTERNET CONNECTIVITY
-
-🚨 SYMPTOMS:
-  • Cannot access websites
-  • No internet connection
-  • Limited connectivity
-
-🔍 DIAGNOSTIC STEPS:
-
-1️⃣ BASIC CHECKS:
-   • Check physical network cable connections
-   • Verify WiFi is connected (if using wireless)
-   • Restart your router and modem
-   • Check if other devices have internet access
-
-2️⃣ NETWORK DIAGNOSIS:
-   • Ping your gateway: ping 192.168.1.1
-   • Ping Google DNS: ping 8.8.8.8
-   • Flush DNS cache: ipconfig /flushdns
-   • Renew IP address: ipconfig /renew
-
-3️⃣ ADVANCED TROUBLESHOOTING:
-   • Check firewall settings
-   • Verify DNS server settings
-   • Test with different DNS (8.8.8.8, 1.1.1.1)
-   • Check for proxy settings
-
-4️⃣ CONTACT SUPPORT:
-   • Contact your ISP if issue persists
-   • Provide error messages and diagnostic results
-
-💡 Run 'diagnose' command for automated system checks"""
+        # Every command of one request reads the same snapshot
+        context = CommandContext(sampler, diagnose=run_diagnostics)
+        
+        if 'commands' in data:
+            lines = data['commands']
+            if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+                return jsonify({"error": "'commands' must be a list of command strings"}), 400
+            if len(lines) > MAX_BATCH:
+                return jsonify({"error": f"At most {MAX_BATCH} commands per request"}), 400
+            print(f"💬 Received {len(lines)} commands: {', '.join(lines)}")
+            responses = commands.dispatch_batch(lines, context)
+            print(f"💬 Command responses sent for {len(responses)} commands")
+            return jsonify({"responses": responses})
             
-            elif issue == 'wifi':
-                response = """🔧 TROUBLESHOOTING: WIFI CONNECTIVITY
-
-🚨 SYMPTOMS:
-  • Cannot connect to WiFi
-  • Intermittent WiFi connection
-  • Slow WiFi speeds
-
-🔍 TROUBLESHOOTING STEPS:
-
-1️⃣ BASIC CHECKS:
-   • Move closer to the wireless access point
-   • Check if WiFi is enabled on device
-   • Restart your wireless router
-   • Check for WiFi signal interference
-
-2️⃣ CONNECTION ISSUES:
-   • Forget and reconnect to the WiFi network
-   • Check WiFi password is correct
-   • Verify router broadcast settings
-   • Check for too many connected devices
-
-3️⃣ DRIVER AND SETTINGS:
-   • Update wireless adapter drivers
-   • Check power management settings
-   • Verify network adapter properties
-   • Reset network settings
-
-4️⃣ ADVANCED TROUBLESHOOTING:
-   • Change WiFi channel on router
-   • Check for firmware updates
-   • Test with different security protocols
-   • Monitor signal strength and quality
-
-💡 Run 'scan' command to see available network interfaces"""
-            
-            elif issue == 'slow':
-                response = """🔧 TROUBLESHOOTING: SLOW NETWORK PERFORMANCE
-
-🚨 SYMPTOMS:
-  • Web pages load slowly
-  • File transfers take long time
-  • High latency in applications
-
-🔍 PERFORMANCE ANALYSIS:
-
-1️⃣ IDENTIFY BOTTLENECKS:
-   • Run speed test to measure actual performance
-   • Check for bandwidth-intensive applications
-   • Monitor network usage in Task Manager
-   • Identify peak usage times
-
-2️⃣ NETWORK OPTIMIZATION:
-   • Restart networking equipment
-   • Check for background updates/downloads
-   • Limit bandwidth-heavy applications
-   • Optimize WiFi channel selection
-
-3️⃣ SYSTEM OPTIMIZATION:
-   • Clear browser cache and cookies
-   • Update network drivers
-   • Check for malware/viruses
-   • Optimize system performance
-
-4️⃣ INFRASTRUCTURE CHECKS:
-   • Contact network administrator
-   • Check router/modem specifications
-   • Verify internet plan bandwidth
-   • Test with wired connection
-
-💡 Run 'bandwidth' command to see current network usage"""
-            
-            elif issue == 'dns':
-                response = """🔧 TROUBLESHOOTING: DNS RESOLUTION ISSUES
-
-🚨 SYMPTOMS:
-  • Websites not loading by name
-  • 'DNS Server Not Responding' errors
-  • Can access sites by IP but not by name
-
-🔍 DNS TROUBLESHOOTING:
-
-1️⃣ BASIC DNS FIXES:
-   • Flush DNS cache: ipconfig /flushdns
-   • Restart DNS Client service
-   • Try alternative DNS servers (8.8.8.8, 1.1.1.1)
-   • Restart router and modem
-
-2️⃣ DNS SETTINGS CHECK:
-   • Check DNS server settings
-   • Verify automatic vs manual DNS
-   • Test with different DNS providers
-   • Check hosts file for incorrect entries
-
-3️⃣ NETWORK CONFIGURATION:
-   • Check network adapter properties
-   • Verify IP address configuration
-   • Check for VPN interference
-   • Examine firewall settings
-
-4️⃣ ADVANCED DNS DIAGNOSIS:
-   • Use nslookup to test DNS resolution
-   • Check DNS response times
-   • Verify domain registration
-   • Contact ISP about DNS issues
-
-💡 Run 'diagnose' command to test DNS resolution automatically"""
-            
-            else:
-                response = f"Unknown issue '{issue}'. Available: internet, wifi, slow, dns"
-        
-        else:
-            response = f"Unknown command '{command}'. Type 'help' for available commands."
-        
+        command = data.get('command', '')
+        if not isinstance(command, str):
+            return jsonify({"error": "'command' must be a string"}), 400
+        command = command.strip().lower()
+        print(f"💬 Received command: {command}")
+        # Static and per-snapshot responses come back already encoded
+        rendered = commands.render(command, context)
         print(f"💬 Command response sent for: {command}")
-        return jsonify({"response": response})
+        return app.response_class(rendered.json, mimetype=app.json.mimetype)
         
     except Exception as e:
         error_msg = f"Error processing command: {str(e)}"
@@ -1271,19 +345,60 @@ def handle_command():
 @app.after_request
 def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,If-None-Match')
+    response.headers.add('Access-Control-Expose-Headers', 'ETag')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     return response
 
+def shutdown():
+    """Graceful worker shutdown: end open event streams so in-flight requests can finish"""
+    stream_broker.close()
+    sampler.stop(timeout=2)
+
+def run_sampler_process(shm_name):
+    """Production sampler: sample, record history and publish snapshots until SIGTERM"""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C reaches the server, which stops us
+    writer = SharedSnapshotWriter(shm_name, create=False)
+
+    def publish(snapshot):
+        # Alerts are evaluated once here, so every worker serves the same transitions and cursor
+        writer.publish(dataclasses.replace(snapshot, alerts=alert_service.state(snapshot)))
+
+    sampler.add_listener(publish)
+    sampler.start()
+    print(f"📡 Publishing snapshots to shared memory '{shm_name}' (pid {os.getpid()})")
+    while not stop.wait(1.0):
+        pass
+    print("🛑 Sampler process stopping")
+    sampler.stop(timeout=10)
+    metrics_store.stop(timeout=10)
+    writer.close()
+
 if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == '--sampler-process':
+        run_sampler_process(sys.argv[2])
+        sys.exit(0)
+
     print("🚀 Starting Flask API Server on http://localhost:5000")
     print("📡 API endpoints available:")
     print("   GET  /api/health")
     print("   GET  /api/system-status") 
     print("   GET  /api/alerts")
     print("   GET  /api/network-stats")
+    print("   GET  /api/breakdown (?format=binary)")
+    print("   GET  /api/connectivity")
+    print("   GET  /api/dns")
+    print("   GET  /api/metrics/history")
+    print("   GET  /api/stream (Server-Sent Events)")
+    print("   GET  /api/diagnose (Server-Sent Events)")
     print("   POST /api/command")
-    print("🔧 Debug mode: ON")
+    print("🔧 Debug mode: ON (development server)")
+    print("💡 For production use: gunicorn -c gunicorn.conf.py main:app")
+    # With the reloader active only the child process serves requests
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        sampler.start()
     try:
         app.run(debug=True, port=5000, host='0.0.0.0')
     except Exception as e:
@@ -0,0 +1,267 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'metrics.db')
+
+# Rollup tables and the bucket width (seconds) each one aggregates into
+ROLLUPS = {
+    'samples_1m': 60,
+    'samples_1h': 3600,
+}
+
+# How long each resolution is kept before pruning (seconds)
+DEFAULT_RETENTION = {
+    'samples_raw': 24 * 3600,
+    'samples_1m': 7 * 24 * 3600,
+    'samples_1h': 90 * 24 * 3600,
+}
+
+RESOLUTION_TABLES = {
+    'raw': 'samples_raw',
+    '1m': 'samples_1m',
+    '1h': 'samples_1h',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL DEFAULT '',
+    UNIQUE (name, labels)
+);
+CREATE TABLE IF NOT EXISTS samples_raw (
+    series_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (series_id, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_raw_ts ON samples_raw (ts);
+"""
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    series_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    last REAL NOT NULL,
+    PRIMARY KEY (series_id, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS {table}_bucket ON {table} (bucket);
+"""
+
+ROLLUP_UPSERT = """
+INSERT INTO {table} (series_id, bucket, count, sum, min, max, last)
+VALUES (?, ?, 1, ?, ?, ?, ?)
+ON CONFLICT (series_id, bucket) DO UPDATE SET
+    count = count + 1,
+    sum = sum + excluded.sum,
+    min = MIN(min, excluded.min),
+    max = MAX(max, excluded.max),
+    last = excluded.last
+"""
+
+
+def format_labels(labels):
+    """Canonical 'key=value,key=value' form used as part of the series key"""
+    if not labels:
+        return ''
+    if isinstance(labels, str):
+        return labels
+    return ','.join(f"{key}={labels[key]}" for key in sorted(labels))
+
+
+class MetricsStore:
+    """Embedded SQLite time-series store with raw, 1-minute and 1-hour resolutions
+
+    All writes go through one background writer thread that drains a queue and
+    commits batches in a single transaction. Rollups are maintained on insert,
+    so trend queries are index range scans over pre-aggregated rows.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, retention=None, flush_interval=2.0,
+                 prune_interval=300.0):
+        self.path = path
+        self.retention = dict(DEFAULT_RETENTION, **(retention or {}))
+        self.flush_interval = flush_interval
+        self.prune_interval = prune_interval
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._series_ids = {}
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            for table in ROLLUPS:
+                conn.executescript(ROLLUP_SCHEMA.format(table=table))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def start(self):
+        """Start the writer thread (no-op if already running)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-store-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Flush pending points and stop the writer thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def record(self, points, ts=None):
+        """Queue points for writing; each point is (name, labels, value)"""
+        self._queue.put((ts if ts is not None else time.time(), list(points)))
+
+    def _run(self):
+        conn = self._connect()
+        last_prune = 0
+        try:
+            while not self._stop.is_set() or not self._queue.empty():
+                batch = self._drain()
+                if batch:
+                    try:
+                        self._write(conn, batch)
+                    except sqlite3.Error as e:
+                        conn.rollback()
+                        print(f"⚠️ Metrics store write failed: {e}")
+
+                if time.monotonic() - last_prune >= self.prune_interval:
+                    try:
+                        self.prune(conn)
+                    except sqlite3.Error as e:
+                        print(f"⚠️ Metrics store prune failed: {e}")
+                    last_prune = time.monotonic()
+        finally:
+            conn.close()
+
+    def _drain(self):
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval))
+            while True:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _series_id(self, conn, name, labels, new_ids):
+        key = (name, labels)
+        series_id = self._series_ids.get(key) or new_ids.get(key)
+        if series_id is None:
+            conn.execute("INSERT OR IGNORE INTO series (name, labels) VALUES (?, ?)", key)
+            series_id = conn.execute(
+                "SELECT id FROM series WHERE name = ? AND labels = ?", key
+            ).fetchone()[0]
+            new_ids[key] = series_id
+        return series_id
+
+    def _write(self, conn, batch):
+        raw_rows = []
+        rollup_rows = {table: [] for table in ROLLUPS}
+        new_ids = {}  # series created in this transaction; cached only once it commits
+        for ts, points in batch:
+            for name, labels, value in points:
+                if value is None:
+                    continue
+                series_id = self._series_id(conn, name, format_labels(labels), new_ids)
+                value = float(value)
+                raw_rows.append((series_id, ts, value))
+                for table, width in ROLLUPS.items():
+                    rollup_rows[table].append((series_id, int(ts // width) * width, value, value, value, value))
+
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO samples_raw (series_id, ts, value) VALUES (?, ?, ?)", raw_rows)
+            for table, rows in rollup_rows.items():
+                conn.executemany(ROLLUP_UPSERT.format(table=table), rows)
+        self._series_ids.update(new_ids)
+
+    def prune(self, conn=None):
+        """Delete rows older than each resolution's retention period"""
+        own = conn is None
+        conn = conn or self._connect()
+        now = time.time()
+        try:
+            with conn:
+                conn.execute("DELETE FROM samples_raw WHERE ts < ?", (now - self.retention['samples_raw'],))
+                for table in ROLLUPS:
+                    conn.execute(f"DELETE FROM {table} WHERE bucket < ?", (now - self.retention[table],))
+        finally:
+            if own:
+                conn.close()
+
+    def query(self, name, labels=None, start=None, end=None, resolution='raw'):
+        """Return points for one series between start and end (epoch seconds)
+
+        Raw resolution yields ``{'ts', 'value'}`` rows; rollups yield
+        ``{'ts', 'avg', 'min', 'max', 'last', 'count'}`` per bucket.
+        """
+        table = RESOLUTION_TABLES[resolution]
+        end = end if end is not None else time.time()
+        start = start if start is not None else end - 3600
+
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            row = conn.execute(
+                "SELECT id FROM series WHERE name = ? AND labels = ?", (name, format_labels(labels))
+            ).fetchone()
+            if row is None:
+                return []
+            if table == 'samples_raw':
+                rows = conn.execute(
+                    "SELECT ts, value FROM samples_raw WHERE series_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                    (row[0], start, end)
+                ).fetchall()
+                return [{'ts': ts, 'value': value} for ts, value in rows]
+            # Include the bucket that contains ``start``
+            width = ROLLUPS[table]
+            rows = conn.execute(
+                f"SELECT bucket, sum / count, min, max, last, count FROM {table} "
+                f"WHERE series_id = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket",
+                (row[0], int(start // width) * width, end)
+            ).fetchall()
+            return [
+                {'ts': bucket, 'avg': avg, 'min': low, 'max': high, 'last': last, 'count': count}
+                for bucket, avg, low, high, last, count in rows
+            ]
+        finally:
+            conn.close()
+
+    def series(self):
+        """List every known (name, labels) series"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            return [
+                {'name': name, 'labels': labels}
+                for name, labels in conn.execute("SELECT name, labels FROM series ORDER BY name, labels")
+            ]
+        finally:
+            conn.close()
+
+
+def resolution_for_range(seconds):
+    """Pick the coarsest resolution that still gives a useful number of points"""
+    if seconds <= 3 * 3600:
+        return 'raw'
+    if seconds <= 3 * 24 * 3600:
+        return '1m'
+    return '1h'
@@ -0,0 +1,79 @@
+import time
+
+COUNTERS = ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+            'errin', 'errout', 'dropin', 'dropout')
+
+COUNTER_32_WRAP = 2 ** 32
+
+
+def _counter_delta(previous, current):
+    """Delta between two counter readings, or None if the counter was reset
+
+    A drop from the upper half of the 32-bit range to the lower half is a
+    wraparound; any other decrease means the interface was re-created and
+    its counters restarted, so there is no meaningful delta.
+    """
+    if current >= previous:
+        return current - previous
+    if previous < COUNTER_32_WRAP and previous >= COUNTER_32_WRAP // 2 and current < COUNTER_32_WRAP // 2:
+        return current + COUNTER_32_WRAP - previous
+    return None
+
+
+class CounterRateTracker:
+    """Turns cumulative per-NIC io counters into per-second rates
+
+    Keeps only the previous reading for each interface, so every update
+    costs O(interfaces). Interfaces that disappear are forgotten; when they
+    come back (or their counters reset) the next reading becomes a new
+    baseline and rates resume from the sample after it.
+    """
+
+    def __init__(self):
+        self._previous = {}
+
+    def update(self, nic_io, ts=None):
+        """Feed a ``psutil.net_io_counters(pernic=True)`` result; return rates per NIC
+
+        Rates are dicts such as ``{'bytes_sent_per_sec': 1234.5, ...}``.
+        Interfaces without a usable baseline are omitted.
+        """
+        ts = ts if ts is not None else time.monotonic()
+        rates = {}
+        current = {}
+        for nic, counters in nic_io.items():
+            values = tuple(getattr(counters, name) for name in COUNTERS)
+            current[nic] = (ts, values)
+
+            previous = self._previous.get(nic)
+            if previous is None:
+                continue
+            prev_ts, prev_values = previous
+            elapsed = ts - prev_ts
+            if elapsed <= 0:
+                continue
+
+            nic_rates = {}
+            for name, prev_value, value in zip(COUNTERS, prev_values, values):
+                delta = _counter_delta(prev_value, value)
+                if delta is None:
+                    nic_rates = None
+                    break
+                nic_rates[f"{name}_per_sec"] = delta / elapsed
+            if nic_rates is not None:
+                rates[nic] = nic_rates
+
+        # Interfaces missing from this reading are dropped here
+        self._previous = current
+        return rates
+
+
+def total_rates(nic_rates):
+    """Sum per-NIC rates into host-wide rates (None if no NIC has a rate yet)"""
+    if not nic_rates:
+        return None
+    totals = {f"{name}_per_sec": 0.0 for name in COUNTERS}
+    for rates in nic_rates.values():
+        for key, value in rates.items():
+            totals[key] += value
+    return totals
@@ -0,0 +1,254 @@
+"""Snapshot -> JSON payload builders shared by the API and the chat commands
+
+Every payload here is a function of one snapshot, so the API can tag and
+cache it per snapshot and the commands can render the same numbers.
+"""
+import platform
+from datetime import datetime
+
+from alert_service import get_alert_service
+from process_registry import get_registry
+
+
+def format_bytes(bytes):
+    """Format bytes to human readable format"""
+    if bytes == 0:
+        return "0B"
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if bytes < 1024.0:
+            return f"{bytes:.1f}{unit}"
+        bytes /= 1024.0
+    return f"{bytes:.1f}TB"
+
+
+def calculate_health_score(cpu, memory, disk):
+    """Calculate overall system health score"""
+    try:
+        # Lower scores for higher usage
+        cpu_score = 100 - max(0, (cpu - 20) * 0.8)  # Deduct more when CPU > 20%
+        memory_score = 100 - max(0, (memory - 30) * 0.7)  # Deduct more when memory > 30%
+        
+        if disk is None:
+            # Disk usage unknown: score on CPU and memory alone
+            score = (cpu_score + memory_score) / 2
+        else:
+            disk_score = 100 - max(0, (disk - 50) * 0.5)  # Deduct more when disk > 50%
+            # Weighted average
+            score = (cpu_score * 0.4 + memory_score * 0.4 + disk_score * 0.2)
+        return max(0, min(100, int(score)))
+    except:
+        return 85  # Default score if calculation fails
+
+
+def build_system_status(snapshot):
+    """Build the system-status payload from a snapshot"""
+    
+    net_io = snapshot.net_io
+    network_sent = net_io.bytes_sent if net_io else 0
+    network_received = net_io.bytes_recv if net_io else 0
+    network_errors = (net_io.errin + net_io.errout) if net_io else 0
+    established_count = snapshot.connections.established_count
+    
+    # Calculate health score
+    health_score = calculate_health_score(snapshot.cpu_usage, snapshot.memory_usage, snapshot.disk_usage)
+    
+    # Get uptime
+    try:
+        boot_time = datetime.fromtimestamp(snapshot.boot_time)
+        uptime = snapshot.timestamp - boot_time
+        uptime_str = str(uptime).split('.')[0]
+    except:
+        uptime_str = "Unknown"
+    
+    system_info = {
+        "platform": f"{platform.system()}-{platform.release()}",
+        "processor": platform.processor() or "Unknown",
+        "memory": f"{snapshot.total_memory_gb:.1f} GB",
+        "hostname": snapshot.hostname,
+        "local_ip": snapshot.local_ip,
+        "internet": snapshot.internet_status,
+        "cpu_usage": snapshot.cpu_usage,
+        "cpu": dict(snapshot.cpu._asdict(), per_core=snapshot.cpu.per_core.tolist()) if snapshot.cpu else None,
+        "memory_usage": snapshot.memory_usage,
+        "disk_usage": snapshot.disk_usage,
+        "active_connections": established_count,
+        "network_sent": network_sent,
+        "network_received": network_received,
+        "network_errors": network_errors,
+        "network_rates": snapshot.net_rates,
+        "interface_rates": dict(snapshot.nic_rates),
+        "uptime": uptime_str,
+        "health_score": health_score,
+        "seq": snapshot.seq,
+        "timestamp": snapshot.timestamp.isoformat()
+    }
+    
+    return system_info
+
+
+def build_alerts(snapshot, since=None):
+    """Build the alerts payload: open alerts by severity, lifecycle transitions and summary
+    
+    Only firing alerts are listed under CRITICAL/WARNING; alerts waiting out
+    their rule's 'for' duration are under 'pending', and INFO holds the
+    current readings of the other metrics. ``since`` is a transition
+    id (the 'cursor' of a previous response); without it the most recent
+    transitions are returned.
+    """
+    # Published by the gunicorn sampler process; evaluated here in a single process
+    state = snapshot.alerts if snapshot.alerts is not None else get_alert_service().state(snapshot)
+    open_alerts = state['open']
+    firing = [alert for alert in open_alerts if alert['state'] == 'firing']
+    transitions = [t for t in state['transitions'] if since is None or t['id'] > since]
+    # Readings below every threshold, except metrics that still have an open alert
+    alerting = {(alert['metric'], alert['device']) for alert in open_alerts}
+    payload = {
+        'CRITICAL': [alert for alert in firing if alert['severity'] == 'CRITICAL'],
+        'WARNING': [alert for alert in firing if alert['severity'] == 'WARNING'],
+        'INFO': [reading for reading in state['readings']
+                 if (reading['metric'], reading['device']) not in alerting],
+        'pending': [alert for alert in open_alerts if alert['state'] == 'pending'],
+        'transitions': transitions if since is not None else transitions[-50:],
+        'cursor': state['cursor']
+    }
+    
+    critical_count = len(payload['CRITICAL'])
+    warning_count = len(payload['WARNING'])
+    if critical_count > 0:
+        health_status = 'CRITICAL'
+    elif warning_count > 0:
+        health_status = 'WARNING'
+    else:
+        health_status = 'HEALTHY'
+    
+    payload['summary'] = {
+        'total_alerts': len(firing),
+        'critical_count': critical_count,
+        'warning_count': warning_count,
+        'pending_count': len(payload['pending']),
+        'flapping_count': sum(1 for alert in open_alerts if alert['flapping']),
+        'health_status': health_status
+    }
+    return payload
+
+
+def build_network_stats(snapshot, since=None, processes=None):
+    """Build the network-stats payload (logs, analysis and summary) from a snapshot
+    
+    Log events carry the seq of the snapshot that produced them and the
+    payload's 'cursor' is the newest seq; with ``since`` only events newer
+    than that cursor are listed (analysis and summary still cover them all).
+    """
+    processes = processes or get_registry()
+    
+    current_time = snapshot.timestamp
+    logs = []
+    
+    # Network statistics
+    net_io = snapshot.net_io
+    if net_io:
+        logs.append({
+            'timestamp': current_time.isoformat(),
+            'message': f"Network Traffic - Sent: {format_bytes(net_io.bytes_sent)} | Received: {format_bytes(net_io.bytes_recv)}",
+            'source': 'Network-Statistics',
+            'severity': 'INFO'
+        })
+        
+        logs.append({
+            'timestamp': current_time.isoformat(),
+            'message': f"Packet Statistics - Sent: {net_io.packets_sent} | Received: {net_io.packets_recv} | Errors: {net_io.errin + net_io.errout}",
+            'source': 'Network-Statistics',
+            'severity': 'WARNING' if (net_io.errin + net_io.errout) > 0 else 'INFO'
+        })
+    else:
+        logs.append({
+            'timestamp': current_time.isoformat(),
+            'message': "Failed to get network statistics",
+            'source': 'Network-Statistics',
+            'severity': 'WARNING'
+        })
+    
+    # Connection analysis
+    connections = snapshot.connections
+    logs.append({
+        'timestamp': current_time.isoformat(),
+        'message': f"Connection Analysis - Established: {connections.established_count} | Total: {connections.total}",
+        'source': 'Connection-Analysis',
+        'severity': 'INFO'
+    })
+    
+    # Interface status
+    interface_count = 0
+    for interface, stats in snapshot.if_stats.items():
+        if interface_count >= 5:  # Limit to 5 interfaces
+            break
+        status = "UP" if stats.isup else "DOWN"
+        logs.append({
+            'timestamp': current_time.isoformat(),
+            'message': f"Interface {interface}: {status} | Speed: {stats.speed}Mbps",
+            'source': 'Interface-Status',
+            'severity': 'INFO' if stats.isup else 'WARNING'
+        })
+        interface_count += 1
+    
+    # Process network usage - show top 5 processes
+    top_processes = connections.top_pids(5)
+    for pid, conn_count in top_processes:
+        process = processes.info(pid)
+        if process is None:
+            continue
+        logs.append({
+            'timestamp': current_time.isoformat(),
+            'message': f"Process {process['name']} (PID: {pid}): {conn_count} connections",
+            'source': 'Process-Network',
+            'severity': 'INFO'
+        })
+    
+    # Analysis summary
+    info_count = len([log for log in logs if log['severity'] == 'INFO'])
+    warning_count = len([log for log in logs if log['severity'] == 'WARNING'])
+    critical_count = len([log for log in logs if log['severity'] == 'CRITICAL'])
+    
+    analysis = {
+        'total_logs': len(logs),
+        'patterns_detected': {},
+        'severity_distribution': {
+            'INFO': info_count,
+            'WARNING': warning_count,
+            'CRITICAL': critical_count
+        }
+    }
+    
+    # Calculate health score based on warnings
+    base_score = 95
+    health_score = max(60, base_score - (warning_count * 5) - (critical_count * 15))
+    
+    summary = {
+        'executive_summary': [
+            f"Analyzed {analysis['total_logs']} network events",
+            f"Found {len(analysis['patterns_detected'])} distinct issue patterns",
+            f"Severity distribution: {analysis['severity_distribution']}"
+        ],
+        'detailed_insights': [],
+        'recommendations': [
+            "✅ Network operating optimally - continue monitoring",
+            "📊 Monitor system performance regularly"
+        ],
+        'health_score': health_score
+    }
+    
+    # Add insights if there are warnings
+    if warning_count > 0:
+        summary['detailed_insights'].append("🔍 Some network interfaces or processes showing warnings")
+    
+    for log in logs:
+        log['seq'] = snapshot.seq
+    if since is not None:
+        logs = [log for log in logs if log['seq'] > since]
+    
+    return {
+        'logs': logs,
+        'analysis': analysis,
+        'summary': summary,
+        'cursor': snapshot.seq
+    }
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import psutil
+
+
+class _Entry:
+    """A cached psutil.Process plus the values read on its last refresh"""
+
+    def __init__(self, process, create_time):
+        self.process = process
+        self.create_time = create_time
+        self.name = None
+        self.status = None
+        self.cpu_percent = None
+        self.last_used = time.monotonic()
+
+
+class ProcessRegistry:
+    """Cache of psutil.Process objects keyed by (pid, create_time)
+
+    Keeping the same Process object alive between samples means
+    ``cpu_percent()`` measures the interval since the previous sample instead
+    of always returning 0.0, and the process name is read once instead of on
+    every request. A pid whose create_time changed belongs to a new process
+    and gets a fresh entry; exited and long-unused processes are evicted.
+    """
+
+    def __init__(self, idle_ttl=600.0):
+        self.idle_ttl = idle_ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def info(self, pid):
+        """Return {'pid', 'name', 'status', 'cpu_percent'} for pid, or None if it is gone
+
+        ``cpu_percent`` is None until the process has been seen by one
+        ``refresh()`` after it was first looked up.
+        """
+        try:
+            # Reads only the start time: enough to tell a reused pid from the one we cached
+            process = psutil.Process(pid)
+            key = (pid, process.create_time())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = self._track(process, key)
+            if entry is None:
+                return None
+        entry.last_used = time.monotonic()
+        return {
+            'pid': pid,
+            'name': entry.name,
+            'status': entry.status,
+            'cpu_percent': entry.cpu_percent,
+        }
+
+    def name(self, pid, default="Unknown"):
+        info = self.info(pid)
+        return info['name'] if info else default
+
+    def _track(self, process, key):
+        try:
+            with process.oneshot():
+                entry = _Entry(process, key[1])
+                entry.name = process.name()
+                entry.status = process.status()
+                process.cpu_percent(None)  # baseline for the next refresh
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        with self._lock:
+            # A reused pid replaces the entry of the process that had it before
+            for stale in [other for other in self._entries if other[0] == key[0] and other != key]:
+                del self._entries[stale]
+            self._entries[key] = entry
+        return entry
+
+    def refresh(self):
+        """Update tracked processes and evict exited, reused or idle pids
+
+        Called once per sampling cycle so per-process CPU% covers exactly one
+        sampling interval.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.items())
+
+        evicted = []
+        for key, entry in entries:
+            if now - entry.last_used > self.idle_ttl:
+                evicted.append(key)
+                continue
+            process = entry.process
+            try:
+                # is_running() compares create_time, so a reused pid is not mistaken
+                # for the process we were tracking
+                if not process.is_running():
+                    evicted.append(key)
+                    continue
+                with process.oneshot():
+                    entry.name = process.name()
+                    entry.status = process.status()
+                    entry.cpu_percent = process.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                evicted.append(key)
+            except psutil.AccessDenied:
+                pass
+
+        if evicted:
+            with self._lock:
+                for key in evicted:
+                    self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide registry"""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = ProcessRegistry()
+        return _default_registry
@@ -0,0 +1,224 @@
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+
+import psutil
+
+from columnar import ColumnTable
+from connection_table import EMPTY_SUMMARY, collect_connections
+from cpu_accounting import get_cpu_accounting
+from disk_collector import get_disk_collector
+from connectivity import get_prober
+from net_rates import CounterRateTracker, total_rates
+from process_registry import get_registry
+
+NIC_SCHEMA = {counter: 'Q' for counter in (
+    'bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+    'errin', 'errout', 'dropin', 'dropout')}
+MOUNT_SCHEMA = {'total': 'Q', 'used': 'Q', 'free': 'Q', 'percent': 'd'}
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Immutable point-in-time view of the host, shared by every consumer"""
+    seq: int
+    timestamp: datetime
+    hostname: str
+    local_ip: str
+    internet_status: str
+    cpu_usage: float
+    cpu: object
+    memory_usage: float
+    total_memory_gb: float
+    disk_usage: object  # percent of the system mount, None when unknown
+    net_io: object
+    nics: ColumnTable  # per-NIC counters, columns as in NIC_SCHEMA
+    nic_rates: MappingProxyType
+    net_rates: object
+    connections: object
+    if_stats: MappingProxyType
+    if_addrs: MappingProxyType  # interface -> tuple of psutil address entries
+    mounts: ColumnTable  # per-mount usage, columns as in MOUNT_SCHEMA
+    boot_time: float
+    # AlertService.state() after this snapshot, filled in by the gunicorn sampler process (see main.py)
+    alerts: object = None
+
+
+class MetricsSampler:
+    """Background thread that samples psutil once per interval and publishes a Snapshot"""
+
+    def __init__(self, interval=5.0, disks=None, prober=None, processes=None, cpu=None):
+        self.interval = interval
+        self.disks = disks or get_disk_collector()
+        self.prober = prober or get_prober()
+        self.processes = processes or get_registry()
+        self.cpu = cpu or get_cpu_accounting()
+        self._snapshot = None
+        self._seq = 0
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._listeners = []
+        self._rates = CounterRateTracker()
+
+    def add_listener(self, callback):
+        """Call ``callback(snapshot)`` from the sampler thread for every new snapshot"""
+        self._listeners.append(callback)
+
+    def start(self):
+        """Start the sampling thread (no-op if already running)"""
+        self.prober.start()
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+            self._thread.start()
+        print(f"📡 Metrics sampler started (interval: {self.interval}s)")
+
+    def stop(self, timeout=None):
+        """Stop the sampling thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def latest(self, timeout=10.0):
+        """Return the most recent snapshot, waiting for the first one if needed"""
+        if self._snapshot is None:
+            self.start()
+            self._ready.wait(timeout)
+        return self._snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._publish(self._collect())
+            except Exception as e:
+                print(f"⚠️ Metrics sampling failed: {e}")
+            try:
+                self.processes.refresh()
+            except Exception as e:
+                print(f"⚠️ Process registry refresh failed: {e}")
+            self._stop.wait(self.interval)
+
+    def _publish(self, snapshot):
+        self._snapshot = snapshot
+        self._ready.set()
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"⚠️ Snapshot listener {getattr(callback, '__name__', callback)} failed: {e}")
+
+    def _collect(self):
+        """Collect a single snapshot of all metrics"""
+        hostname = socket.gethostname()
+        try:
+            local_ip = socket.gethostbyname(hostname)
+        except Exception:
+            local_ip = "127.0.0.1"
+
+        # Cached verdict from the background prober - never blocks on a timeout
+        internet_status = self.prober.status_text()
+
+        try:
+            # Tick deltas since the previous snapshot; never sleeps
+            cpu = self.cpu.sample()
+        except Exception as e:
+            print(f"⚠️ Failed to get CPU usage: {e}")
+            cpu = None
+        cpu_usage = cpu.percent if cpu else 0
+
+        try:
+            memory = psutil.virtual_memory()
+            memory_usage = memory.percent
+            total_memory_gb = memory.total / (1024**3)
+        except Exception as e:
+            print(f"⚠️ Failed to get memory usage: {e}")
+            memory_usage = 0
+            total_memory_gb = 0
+
+        try:
+            # One statvfs per cached mount; the system mount is the host figure
+            disks = self.disks.sample()
+        except Exception as e:
+            print(f"⚠️ Failed to get disk usage: {e}")
+            disks = {}
+        disk_usage = self.disks.system_percent(disks)
+
+        try:
+            net_io = psutil.net_io_counters()
+        except Exception as e:
+            print(f"⚠️ Failed to get network stats: {e}")
+            net_io = None
+
+        try:
+            nic_io = psutil.net_io_counters(pernic=True)
+        except Exception as e:
+            print(f"⚠️ Failed to get per-interface network stats: {e}")
+            nic_io = {}
+        nic_rates = self._rates.update(nic_io, time.monotonic())
+
+        try:
+            # Walked once per snapshot; every consumer reads the aggregate
+            connections = collect_connections()
+        except Exception as e:
+            print(f"⚠️ Failed to get connections: {e}")
+            connections = EMPTY_SUMMARY
+
+        try:
+            if_stats = psutil.net_if_stats()
+        except Exception as e:
+            print(f"⚠️ Failed to get interface stats: {e}")
+            if_stats = {}
+
+        try:
+            if_addrs = {nic: tuple(addrs) for nic, addrs in psutil.net_if_addrs().items()}
+        except Exception as e:
+            print(f"⚠️ Failed to get interface addresses: {e}")
+            if_addrs = {}
+
+        try:
+            boot_time = psutil.boot_time()
+        except Exception:
+            boot_time = None
+
+        self._seq += 1
+        return Snapshot(
+            seq=self._seq,
+            timestamp=datetime.now(),
+            hostname=hostname,
+            local_ip=local_ip,
+            internet_status=internet_status,
+            cpu_usage=cpu_usage,
+            cpu=cpu,
+            memory_usage=memory_usage,
+            total_memory_gb=total_memory_gb,
+            disk_usage=disk_usage,
+            net_io=net_io,
+            nics=ColumnTable.from_rows(nic_io, NIC_SCHEMA),
+            nic_rates=MappingProxyType(nic_rates),
+            net_rates=total_rates(nic_rates),
+            connections=connections,
+            if_stats=MappingProxyType(dict(if_stats)),
+            if_addrs=MappingProxyType(if_addrs),
+            mounts=ColumnTable.from_rows(disks, MOUNT_SCHEMA),
+            boot_time=boot_time,
+        )
+
+
+_default_sampler = None
+_default_lock = threading.Lock()
+
+
+def get_sampler(**kwargs):
+    """Return the process-wide sampler, creating it on first use"""
+    global _default_sampler
+    with _default_lock:
+        if _default_sampler is None:
+            _default_sampler = MetricsSampler(**kwargs)
+        return _default_sampler
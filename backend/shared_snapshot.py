@@ -0,0 +1,196 @@
+"""Hand snapshots from one sampler process to many server worker processes
+
+The sampler process pickles each Snapshot into a shared memory segment
+guarded by a sequence lock: the writer makes the generation counter odd,
+copies the payload, then makes it even again. Readers copy the payload
+between two reads of the counter and retry if it changed or was odd, so
+they never block the writer and never see a half-written snapshot. A
+reader whose generation is unchanged returns its cached Snapshot without
+copying or unpickling anything.
+"""
+import io
+import pickle
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from types import MappingProxyType
+
+from process_registry import get_registry
+
+
+# generation (odd while writing), payload length
+HEADER = struct.Struct('<QQ')
+DEFAULT_SIZE = 4 * 1024 * 1024
+
+
+def _attach(name):
+    """Open an existing segment without taking ownership of it
+
+    Before Python 3.13 attaching also registers the segment with the
+    resource tracker, which would unlink it when this process exits (and
+    workers forked from the creator share its tracker), so registration is
+    skipped; only the creator cleans up.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _mapping_proxy(mapping):
+    return MappingProxyType(mapping)
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        # mappingproxy is not picklable; the read-only wrapper is rebuilt on load
+        if type(obj) is MappingProxyType:
+            return _mapping_proxy, (dict(obj),)
+        return NotImplemented
+
+
+def encode_snapshot(snapshot):
+    # Connection pids stay unresolved: a reader that needs them scans /proc
+    # itself, so cycles nobody asks about never pay for the inode -> pid walk
+    buffer = io.BytesIO()
+    _SnapshotPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(snapshot)
+    return buffer.getvalue()
+
+
+class SharedSnapshotWriter:
+    """Owner side: creates the segment and publishes snapshots into it"""
+
+    def __init__(self, name=None, size=DEFAULT_SIZE, create=True):
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            HEADER.pack_into(self.shm.buf, 0, 0, 0)
+        else:
+            self.shm = _attach(name)
+        self.name = self.shm.name
+        self.capacity = self.shm.size - HEADER.size
+        self._generation = HEADER.unpack_from(self.shm.buf, 0)[0] & ~1
+
+    def publish(self, snapshot):
+        """Sampler listener: make ``snapshot`` the one every reader sees"""
+        payload = encode_snapshot(snapshot)
+        if len(payload) > self.capacity:
+            print(f"⚠️ Snapshot of {len(payload)} bytes does not fit shared memory ({self.capacity} bytes), skipped")
+            return
+        buf = self.shm.buf
+        self._generation += 1
+        HEADER.pack_into(buf, 0, self._generation, 0)
+        buf[HEADER.size:HEADER.size + len(payload)] = payload
+        self._generation += 1
+        HEADER.pack_into(buf, 0, self._generation, len(payload))
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedSnapshotReader:
+    """Worker side stand-in for MetricsSampler that reads the shared segment
+
+    Offers the parts of the sampler interface the API uses: ``latest()``,
+    ``add_listener()`` (listeners run from a polling thread whenever a new
+    snapshot appears), ``start()``/``stop()``, ``interval`` and ``processes``.
+    """
+
+    def __init__(self, name, interval=5.0, poll_interval=0.25, processes=None):
+        self.name = name
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.processes = processes or get_registry()
+        self.shm = _attach(name)
+        self._generation = None
+        self._snapshot = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def start(self):
+        """Start the polling thread that drives listeners (no-op if already running)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="snapshot-reader", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _read(self):
+        """Current snapshot, re-reading shared memory only when the generation moved"""
+        buf = self.shm.buf
+        while True:
+            generation, length = HEADER.unpack_from(buf, 0)
+            if generation == self._generation:
+                return self._snapshot
+            if generation == 0:
+                return None  # nothing published yet
+            if generation & 1:
+                time.sleep(0)  # writer in progress
+                continue
+            payload = bytes(buf[HEADER.size:HEADER.size + length])
+            if HEADER.unpack_from(buf, 0)[0] != generation:
+                continue  # overwritten while copying
+            with self._lock:
+                if self._generation != generation:
+                    self._snapshot = pickle.loads(payload)
+                    self._generation = generation
+                return self._snapshot
+
+    def latest(self, timeout=10.0):
+        """Return the most recent snapshot, waiting for the first one if needed"""
+        snapshot = self._read()
+        deadline = time.monotonic() + timeout
+        while snapshot is None and time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            snapshot = self._read()
+        return snapshot
+
+    def _run(self):
+        last_seq = None
+        while not self._stop.is_set():
+            try:
+                snapshot = self._read()
+            except Exception as e:
+                print(f"⚠️ Reading shared snapshot failed: {e}")
+                snapshot = None
+            if snapshot is not None and snapshot.seq != last_seq:
+                last_seq = snapshot.seq
+                for callback in list(self._listeners):
+                    try:
+                        callback(snapshot)
+                    except Exception as e:
+                        print(f"⚠️ Snapshot listener {getattr(callback, '__name__', callback)} failed: {e}")
+                # Once per sampling cycle, as the sampler does: per-process CPU%
+                # covers one interval and exited or idle processes are dropped
+                try:
+                    self.processes.refresh()
+                except Exception as e:
+                    print(f"⚠️ Process registry refresh failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def close(self):
+        self.stop()
+        self.shm.close()
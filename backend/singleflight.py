@@ -0,0 +1,81 @@
+import threading
+import time
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time; concurrent callers share it
+
+    A caller arriving while the computation for its key is in flight waits
+    for that result instead of starting another (coalesced). With ``ttl``
+    the finished result is also handed to callers arriving within ``ttl``
+    seconds (cached); errors are shared with the waiting callers but never
+    cached.
+
+    Counters are kept per name (the first element of a tuple key, or the
+    key itself) and returned by ``stats()``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._results = {}
+        self._stats = {}
+
+    def do(self, key, fn, ttl=0.0, name=None):
+        """Return ``fn()``, computed once for all concurrent callers with this key"""
+        if name is None:
+            name = key[0] if isinstance(key, tuple) else key
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats.setdefault(name, {'executed': 0, 'coalesced': 0, 'cached': 0})
+            cached = self._results.get(key)
+            if cached is not None and cached[0] > now:
+                stats['cached'] += 1
+                return cached[1]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                stats['executed'] += 1
+            else:
+                stats['coalesced'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and ttl > 0:
+                    finished = time.monotonic()
+                    # Drop expired results so per-snapshot keys do not pile up
+                    for stale in [k for k, (expires, _) in self._results.items() if expires <= finished]:
+                        del self._results[stale]
+                    self._results[key] = (finished + ttl, call.value)
+            call.done.set()
+        return call.value
+
+    def stats(self):
+        """{name: {'executed', 'coalesced', 'cached'}} plus a 'total' entry"""
+        with self._lock:
+            stats = {name: dict(counts) for name, counts in self._stats.items()}
+        stats['total'] = {
+            counter: sum(counts[counter] for counts in stats.values())
+            for counter in ('executed', 'coalesced', 'cached')
+        }
+        return stats
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import queue
+import threading
+
+_MISSING = object()
+
+
+def format_event(event, data, event_id=None):
+    """Encode one Server-Sent Event (data is already JSON text)"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def diff_state(previous, current):
+    """Two-level delta between payloads shaped like {section: {field: value}}
+
+    Returns ``{'changed': {section: {field: value}}, 'removed': {section: [field]}}``
+    with only the fields whose value differs; an empty ``changed`` means the
+    snapshot did not change anything a client can see.
+    """
+    changed = {}
+    removed = {}
+    for section, fields in current.items():
+        old = previous.get(section) or {}
+        section_changes = {key: value for key, value in fields.items() if old.get(key, _MISSING) != value}
+        if section_changes:
+            changed[section] = section_changes
+        gone = [key for key in old if key not in fields]
+        if gone:
+            removed[section] = gone
+    return {'changed': changed, 'removed': removed}
+
+
+class _Subscriber:
+    def __init__(self, max_queue):
+        self.queue = queue.Queue(max_queue)
+        # Start with a full snapshot; set again whenever deltas were dropped
+        self.resync = True
+
+
+class SnapshotBroker:
+    """Fans sampler snapshots out to Server-Sent Event subscribers
+
+    ``build`` turns a snapshot into ``{section: {field: value}}``. Each
+    published snapshot is built, diffed and serialised once, then the same
+    encoded event is queued for every subscriber. A subscriber whose bounded
+    queue is full (slow client) has its backlog discarded and receives a full
+    snapshot on its next read instead of an unbounded pile of deltas. With no
+    subscribers, publishing only remembers the snapshot.
+    """
+
+    def __init__(self, build, max_queue=16, heartbeat=15.0):
+        self.build = build
+        self.max_queue = max_queue
+        self.heartbeat = heartbeat
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._state = None
+        self._state_seq = None
+        self._encoded_state = None
+        self._closed = False
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def publish(self, snapshot):
+        """Sampler listener: push the delta since the previous snapshot to every subscriber"""
+        with self._lock:
+            self._snapshot = snapshot
+            if not self._subscribers:
+                # Nobody listening: build lazily when the next client connects
+                self._state = None
+                return
+            previous = self._state
+            self._refresh_state()
+            if previous is None:
+                event = format_event('snapshot', self._encoded_state, snapshot.seq)
+            else:
+                delta = diff_state(previous, self._state)
+                if not delta['changed'] and not delta['removed']:
+                    return
+                event = format_event('delta', json.dumps(delta, separators=(',', ':'), ensure_ascii=False, default=str), snapshot.seq)
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            if subscriber.resync:
+                continue  # will get the full snapshot on its next read
+            try:
+                subscriber.queue.put_nowait(event)
+            except queue.Full:
+                self._drop_backlog(subscriber)
+                # Wake a reader that is already waiting on the (now empty) queue
+                try:
+                    subscriber.queue.put_nowait(None)
+                except queue.Full:
+                    pass
+
+    def _refresh_state(self):
+        if self._snapshot is None:
+            return
+        if self._state is not None and self._state_seq == self._snapshot.seq:
+            return
+        self._state = self.build(self._snapshot)
+        self._state_seq = self._snapshot.seq
+        self._encoded_state = json.dumps(self._state, separators=(',', ':'), ensure_ascii=False, default=str)
+
+    def _drop_backlog(self, subscriber):
+        subscriber.resync = True
+        try:
+            while True:
+                subscriber.queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _full_snapshot_event(self):
+        with self._lock:
+            self._refresh_state()
+            if self._state is None:
+                return None
+            return format_event('snapshot', self._encoded_state, self._state_seq)
+
+    def subscribe(self):
+        subscriber = _Subscriber(self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def close(self):
+        """End every open stream (graceful shutdown); clients reconnect elsewhere"""
+        with self._lock:
+            self._closed = True
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            self._drop_backlog(subscriber)
+            try:
+                subscriber.queue.put_nowait(None)
+            except queue.Full:
+                pass
+
+    def events(self, subscriber=None):
+        """Generator of encoded SSE text for one client; unsubscribes when the client goes away
+
+        A comment line is sent every ``heartbeat`` seconds without events so
+        proxies keep the connection open and dead clients are noticed on the
+        next write.
+        """
+        subscriber = subscriber or self.subscribe()
+        try:
+            yield f"retry: {int(self.heartbeat * 1000)}\n\n"
+            while not self._closed:
+                if subscriber.resync:
+                    # Anything queued before the resync is older than the snapshot
+                    self._drop_backlog(subscriber)
+                    subscriber.resync = False
+                    event = self._full_snapshot_event()
+                    if event is not None:
+                        yield event
+                        continue
+                try:
+                    event = subscriber.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+                if event is not None:
+                    yield event
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def aevents(self, subscriber=None, poll_interval=0.25):
+        """Async variant of ``events()`` for the ASGI server
+
+        Subscriber queues are filled from the sampler thread, so they are
+        polled instead of awaited: an idle stream costs one wake-up every
+        ``poll_interval`` seconds and holds no thread. ASGI send() does not
+        fail for a closed connection, so the caller must ``aclose()`` the
+        generator when the client disconnects; that unsubscribes it.
+        """
+        subscriber = subscriber or self.subscribe()
+        try:
+            yield f"retry: {int(self.heartbeat * 1000)}\n\n"
+            idle = 0.0
+            while not self._closed:
+                if subscriber.resync:
+                    self._drop_backlog(subscriber)
+                    subscriber.resync = False
+                    event = self._full_snapshot_event()
+                    if event is not None:
+                        idle = 0.0
+                        yield event
+                        continue
+                try:
+                    event = subscriber.queue.get_nowait()
+                except queue.Empty:
+                    if idle >= self.heartbeat:
+                        idle = 0.0
+                        yield ": heartbeat\n\n"
+                    await asyncio.sleep(poll_interval)
+                    idle += poll_interval
+                    continue
+                if event is not None:
+                    idle = 0.0
+                    yield event
+        finally:
+            self.unsubscribe(subscriber)
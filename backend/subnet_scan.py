@@ -0,0 +1,247 @@
+"""Host discovery on the attached IPv4 subnets: an asyncio TCP-connect sweep
+
+Each interface address plus its netmask gives a subnet, and every host in it
+gets a TCP connect to a few common ports. A completed handshake marks the
+port open. A refused connection (RST) also proves the host is up, so hosts
+with no open ports are still found. Hosts that time out or are unreachable
+count as down.
+
+Sweeps run on one scanner event loop, so every caller shares the limits:
+at most ``concurrency`` connects at a time, started at no more than
+``rate`` per second, each abandoned after ``timeout``. A /22 (1022 hosts)
+therefore finishes in a few seconds. Concurrent requests for the same subnet
+share one sweep, and results are cached per subnet for ``ttl`` seconds.
+
+Only subnets attached to an interface (or parts of them) and loopback
+(127.0.0.0/8, for testing against local listeners, see
+benchmarks/bench_subnet_scan.py) can be scanned. Subnets larger than
+``max_hosts`` are narrowed to the block around the interface address, and
+loopback is skipped unless asked for explicitly.
+"""
+import asyncio
+import errno
+import ipaddress
+import os
+import socket
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+DEFAULT_PORTS = (22, 80, 443, 445, 3389)
+DEFAULT_CONCURRENCY = int(os.environ.get('NETMGMT_SCAN_CONCURRENCY', 256))
+DEFAULT_RATE = float(os.environ.get('NETMGMT_SCAN_RATE', 2000))
+DEFAULT_TIMEOUT = float(os.environ.get('NETMGMT_SCAN_TIMEOUT', 0.5))
+MAX_HOSTS = 1024  # a /22
+
+# One responding host; ``rtt_ms`` is the fastest answer (open or refused)
+HostResult = namedtuple('HostResult', ['address', 'open_ports', 'rtt_ms'])
+
+# ``hosts`` are the hosts that answered, in address order
+SubnetScan = namedtuple('SubnetScan', ['network', 'interface', 'hosts', 'scanned', 'elapsed_ms', 'timestamp'])
+
+
+LOOPBACK = ipaddress.IPv4Network('127.0.0.0/8')
+
+
+def _interface_networks(if_addrs):
+    """(interface, address, IPv4Network) for every IPv4 address with a netmask"""
+    for interface, addrs in if_addrs.items():
+        for addr in addrs:
+            if addr.family != socket.AF_INET or not addr.netmask:
+                continue
+            try:
+                yield interface, addr.address, ipaddress.IPv4Interface(f"{addr.address}/{addr.netmask}").network
+            except ValueError:
+                continue
+
+
+def attached_subnets(if_addrs, max_hosts=MAX_HOSTS, include_loopback=False):
+    """[(interface, IPv4Network)] from psutil.net_if_addrs()-style data, one per subnet"""
+    subnets = []
+    seen = set()
+    for interface, address, network in _interface_networks(if_addrs):
+        if network.is_loopback and not include_loopback:
+            continue
+        network = clamp_network(network, address, max_hosts)
+        if network.num_addresses > 1 and network not in seen:
+            seen.add(network)
+            subnets.append((interface, network))
+    return subnets
+
+
+def clamp_network(network, address, max_hosts=MAX_HOSTS):
+    """``network`` itself, or its largest sub-block holding ``address`` with at most ``max_hosts`` addresses"""
+    if network.num_addresses <= max_hosts:
+        return network
+    prefix = 32 - max(max_hosts.bit_length() - 1, 0)
+    return ipaddress.IPv4Interface(f"{address}/{prefix}").network
+
+
+def parse_network(text, if_addrs, max_hosts=MAX_HOSTS):
+    """(interface, IPv4Network) for a 'a.b.c.d/nn' argument
+
+    Raises ValueError unless the network is IPv4, at most ``max_hosts``
+    addresses, and inside an attached subnet or loopback.
+    """
+    network = ipaddress.ip_network(text, strict=False)
+    if network.version != 4:
+        raise ValueError("only IPv4 subnets can be scanned")
+    if network.num_addresses > max_hosts:
+        raise ValueError(f"{network} has {network.num_addresses} addresses (limit {max_hosts})")
+    if network.subnet_of(LOOPBACK):
+        return 'lo', network
+    for interface, _, attached in _interface_networks(if_addrs):
+        if network.subnet_of(attached):
+            return interface, network
+    raise ValueError(f"{network} is not on a subnet attached to this host")
+
+
+def _hosts(network):
+    # hosts() is empty for /32 and both addresses for /31
+    return list(network.hosts()) or [network.network_address]
+
+
+class _RateLimiter:
+    """Spaces out starts to at most ``rate`` per second (no limit if rate <= 0)"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class SubnetScanner:
+    """Concurrent TCP-connect host discovery with per-subnet result caching"""
+
+    def __init__(self, ports=DEFAULT_PORTS, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 rate=DEFAULT_RATE, ttl=60.0, max_hosts=MAX_HOSTS):
+        self.ports = tuple(ports)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.rate = rate
+        self.ttl = ttl
+        self.max_hosts = max_hosts
+        self._lock = threading.Lock()
+        self._cache = {}  # network -> (expires at, SubnetScan)
+        self._loop = None
+        # Only touched on the scanner loop
+        self._sweeps = {}  # network -> Task of the sweep in flight
+        self._slots = None
+        self._limiter = None
+
+    def cached(self, network):
+        """The last scan of ``network`` while it is fresh, else None (never scans)"""
+        with self._lock:
+            entry = self._cache.get(network)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        return None
+
+    async def _connect(self, address, port, slots, limiter):
+        """'open', 'closed' (refused: the host is up) or None, with the elapsed ms"""
+        async with slots:
+            await limiter.wait()
+            start = time.monotonic()
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), self.timeout)
+            except ConnectionRefusedError:
+                return 'closed', round((time.monotonic() - start) * 1000, 1)
+            except (OSError, asyncio.TimeoutError) as e:
+                if getattr(e, 'errno', None) == errno.EMFILE:
+                    raise  # out of file descriptors: lower the concurrency
+                return None, None
+            rtt_ms = round((time.monotonic() - start) * 1000, 1)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            return 'open', rtt_ms
+
+    async def _scan_host(self, address, slots, limiter):
+        answers = await asyncio.gather(*(self._connect(address, port, slots, limiter) for port in self.ports))
+        rtts = [rtt for state, rtt in answers if state is not None]
+        if not rtts:
+            return None
+        open_ports = [port for port, (state, _) in zip(self.ports, answers) if state == 'open']
+        return HostResult(address, open_ports, min(rtts))
+
+    async def _sweep(self, network, interface):
+        addresses = [str(address) for address in _hosts(network)]
+        start = time.monotonic()
+        found = await asyncio.gather(*(self._scan_host(address, self._slots, self._limiter)
+                                       for address in addresses))
+        result = SubnetScan(str(network), interface, [host for host in found if host is not None],
+                            len(addresses), round((time.monotonic() - start) * 1000, 1), datetime.now())
+        with self._lock:
+            self._cache[network] = (time.monotonic() + self.ttl, result)
+        return result
+
+    async def _scan(self, network, interface, refresh):
+        if not refresh:
+            cached = self.cached(network)
+            if cached is not None:
+                return cached
+        # Join the sweep already running for this subnet instead of starting another
+        task = self._sweeps.get(network)
+        if task is None:
+            task = self._sweeps[network] = asyncio.ensure_future(self._sweep(network, interface))
+            task.add_done_callback(lambda _: self._sweeps.pop(network, None))
+        return await asyncio.shield(task)
+
+    async def _scan_all(self, targets, refresh):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._limiter = _RateLimiter(self.rate)
+        return await asyncio.gather(*(self._scan(network, interface, refresh) for interface, network in targets))
+
+    def _scanner_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='subnet-scan', daemon=True).start()
+            return self._loop
+
+    def scan_many(self, targets, refresh=False):
+        """[SubnetScan] for [(interface, IPv4Network)], sweeping the subnets concurrently
+
+        Blocks until done. Fresh cached results are returned without touching
+        the network; subnets being swept for another caller are waited for.
+        """
+        targets = list(targets)
+        if not refresh:
+            cached = [self.cached(network) for _, network in targets]
+            if all(result is not None for result in cached):
+                return cached
+        future = asyncio.run_coroutine_threadsafe(self._scan_all(targets, refresh), self._scanner_loop())
+        return future.result()
+
+    def scan(self, network, interface=None, refresh=False):
+        """SubnetScan of one IPv4Network"""
+        return self.scan_many([(interface, network)], refresh)[0]
+
+    def scan_attached(self, if_addrs, refresh=False):
+        """SubnetScans of every attached subnet"""
+        return self.scan_many(attached_subnets(if_addrs, self.max_hosts), refresh)
+
+
+_default_scanner = None
+_default_lock = threading.Lock()
+
+
+def get_subnet_scanner():
+    """Return the process-wide subnet scanner"""
+    global _default_scanner
+    with _default_lock:
+        if _default_scanner is None:
+            _default_scanner = SubnetScanner()
+        return _default_scanner
@@ -36,9 +36,14 @@ function App() {
     };
 
     fetchSystemStatus();
-    const interval = setInterval(fetchSystemStatus, 10000);
 
-    return () => clearInterval(interval);
+    // Keep the status current from the shared live stream
+    return apiService.subscribe((state, streamError) => {
+      if (!streamError && state) {
+        setSystemStatus(state.system);
+        setError(null);
+      }
+    });
   }, []);
 
   const renderActiveModule = () => {
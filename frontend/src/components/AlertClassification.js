@@ -302,7 +302,7 @@ const AlertClassification = () => {
                     </h3>
                     <div className="alert-list">
                       {criticalAlerts.map((alert, index) => (
-                        <div key={index} className="alert alert-critical" style={{
+                        <div key={alert.id || index} className="alert alert-critical" style={{
                           background: 'linear-gradient(135deg, #7f1d1d20 0%, #dc262620 100%)',
                           border: '2px solid #dc262640',
                           borderRadius: '15px',
@@ -338,7 +338,15 @@ const AlertClassification = () => {
                                 display: 'flex',
                                 alignItems: 'center',
                                 gap: '5px'
-                              }}>🕒 {formatTime(alert.timestamp)}</span>
+                              }}>🕒 since {formatTime(alert.first_seen || alert.timestamp)}</span>
+                              {alert.flapping && (
+                                <span className="alert-flapping" style={{
+                                  display: 'flex',
+                                  alignItems: 'center',
+                                  gap: '5px',
+                                  color: '#fbbf24'
+                                }}>🔁 Flapping</span>
+                              )}
                             </div>
                           </div>
                         </div>
@@ -369,7 +377,7 @@ const AlertClassification = () => {
                     </h3>
                     <div className="alert-list">
                       {warningAlerts.map((alert, index) => (
-                        <div key={index} className="alert alert-warning" style={{
+                        <div key={alert.id || index} className="alert alert-warning" style={{
                           background: 'linear-gradient(135deg, #854d0e20 0%, #d9770620 100%)',
                           border: '2px solid #d9770640',
                           borderRadius: '15px',
@@ -405,7 +413,15 @@ const AlertClassification = () => {
                                 display: 'flex',
                                 alignItems: 'center',
                                 gap: '5px'
-                              }}>🕒 {formatTime(alert.timestamp)}</span>
+                              }}>🕒 since {formatTime(alert.first_seen || alert.timestamp)}</span>
+                              {alert.flapping && (
+                                <span className="alert-flapping" style={{
+                                  display: 'flex',
+                                  alignItems: 'center',
+                                  gap: '5px',
+                                  color: '#fbbf24'
+                                }}>🔁 Flapping</span>
+                              )}
                             </div>
                           </div>
                         </div>
@@ -452,7 +468,7 @@ const AlertClassification = () => {
                     </div>
                     <div className="table-body">
                       {alerts.map((alert, index) => (
-                        <div key={index} className="table-row" style={{
+                        <div key={alert.id || index} className="table-row" style={{
                           display: 'grid',
                           gridTemplateColumns: '1fr 1fr 2fr 1fr 1fr',
                           gap: '15px',
@@ -494,7 +510,7 @@ const AlertClassification = () => {
                             color: '#94a3b8',
                             fontSize: '13px',
                             fontWeight: '500'
-                          }}>{formatTime(alert.timestamp)}</div>
+                          }}>{formatTime(alert.first_seen || alert.timestamp)}</div>
                         </div>
                       ))}
                       {alerts.length === 0 && (
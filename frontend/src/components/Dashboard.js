@@ -9,6 +9,13 @@ const Dashboard = () => {
   const [error, setError] = useState(null);
   const [refreshing, setRefreshing] = useState(false);
 
+  // Combine all alerts
+  const combineAlerts = (alertsData) => [
+    ...(alertsData.CRITICAL || []),
+    ...(alertsData.WARNING || []),
+    ...(alertsData.INFO || [])
+  ];
+
   const fetchDashboardData = async () => {
     setRefreshing(true);
     try {
@@ -18,14 +25,7 @@ const Dashboard = () => {
       ]);
       
       setSystemStatus(statusData);
-      
-      // Combine all alerts
-      const allAlerts = [
-        ...(alertsData.CRITICAL || []),
-        ...(alertsData.WARNING || []),
-        ...(alertsData.INFO || [])
-      ];
-      setAlerts(allAlerts);
+      setAlerts(combineAlerts(alertsData));
       setError(null);
     } catch (err) {
       setError(err.message);
@@ -40,9 +40,17 @@ const Dashboard = () => {
   useEffect(() => {
     fetchDashboardData();
     
-    // Set up auto-refresh every 30 seconds
-    const interval = setInterval(fetchDashboardData, 30000);
-    return () => clearInterval(interval);
+    // Live updates pushed by the backend instead of polling
+    return apiService.subscribe((state, streamError) => {
+      if (streamError) {
+        setError(streamError.message);
+        return;
+      }
+      setSystemStatus(state.system || {});
+      setAlerts(combineAlerts(state.alerts || {}));
+      setError(null);
+      setLoading(false);
+    });
   }, []);
 
   const formatBytes = (bytes) => {
@@ -12,24 +12,27 @@ const Sidebar = ({ activeModule, setActiveModule }) => {
   });
   const [lastUpdate, setLastUpdate] = useState(null);
 
+  const updateSidebar = (statusData, alertsData) => {
+    const criticalCount = alertsData.CRITICAL?.length || 0;
+    const warningCount = alertsData.WARNING?.length || 0;
+    
+    setSystemStatus({
+      healthScore: statusData.health_score || 0,
+      criticalAlerts: criticalCount,
+      warningAlerts: warningCount,
+      activeConnections: statusData.active_connections || 0,
+      internetStatus: statusData.internet || 'Unknown'
+    });
+    setLastUpdate(new Date());
+  };
+
   const fetchSidebarData = async () => {
     try {
       const [statusData, alertsData] = await Promise.all([
         apiService.getSystemStatus(),
         apiService.getAlerts()
       ]);
-      
-      const criticalCount = alertsData.CRITICAL?.length || 0;
-      const warningCount = alertsData.WARNING?.length || 0;
-      
-      setSystemStatus({
-        healthScore: statusData.health_score || 0,
-        criticalAlerts: criticalCount,
-        warningAlerts: warningCount,
-        activeConnections: statusData.active_connections || 0,
-        internetStatus: statusData.internet || 'Unknown'
-      });
-      setLastUpdate(new Date());
+      updateSidebar(statusData, alertsData);
     } catch (error) {
       console.error('Error fetching sidebar data:', error);
       // Keep previous data or set to defaults
@@ -38,8 +41,13 @@ const Sidebar = ({ activeModule, setActiveModule }) => {
 
   useEffect(() => {
     fetchSidebarData();
-    const interval = setInterval(fetchSidebarData, 30000); // Update every 30 seconds
-    return () => clearInterval(interval);
+    
+    // Shares the dashboard's live stream; keeps previous data while it reconnects
+    return apiService.subscribe((state, streamError) => {
+      if (!streamError && state) {
+        updateSidebar(state.system || {}, state.alerts || {});
+      }
+    });
   }, []);
 
   const menuItems = [
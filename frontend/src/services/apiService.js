@@ -1,7 +1,28 @@
 // services/apiService.js
 const API_BASE_URL = 'http://localhost:5000/api';
 
+// Apply a {changed, removed} delta from /api/stream without mutating the old state
+const applyDelta = (state, delta) => {
+  const next = { ...state };
+  Object.entries(delta.changed || {}).forEach(([section, fields]) => {
+    next[section] = { ...(next[section] || {}), ...fields };
+  });
+  Object.entries(delta.removed || {}).forEach(([section, keys]) => {
+    const fields = { ...(next[section] || {}) };
+    keys.forEach((key) => delete fields[key]);
+    next[section] = fields;
+  });
+  return next;
+};
+
 class ApiService {
+  constructor() {
+    this.eventSource = null;
+    this.streamState = null;
+    this.streamListeners = new Set();
+    this.etagCache = new Map();
+  }
+
   async request(endpoint, options = {}) {
     const url = `${API_BASE_URL}${endpoint}`;
     
@@ -25,27 +46,126 @@ class ApiService {
     }
   }
 
+  // GET with If-None-Match: when the backend has no newer snapshot it answers
+  // 304 and the body parsed last time is returned (the same object, so React
+  // state setters see no change and skip the re-render)
+  async requestCached(endpoint) {
+    const url = `${API_BASE_URL}${endpoint}`;
+    const cached = this.etagCache.get(endpoint);
+
+    try {
+      const response = await fetch(url, {
+        headers: cached ? { 'If-None-Match': cached.etag } : {},
+        cache: 'no-store',
+      });
+
+      if (response.status === 304 && cached) {
+        return cached.data;
+      }
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+
+      const data = await response.json();
+      const etag = response.headers.get('ETag');
+      if (etag) {
+        this.etagCache.set(endpoint, { etag, data });
+      }
+      return data;
+    } catch (error) {
+      console.error(`API request failed for ${endpoint}:`, error);
+      throw new Error(`Backend connection failed: ${error.message}`);
+    }
+  }
+
   async getSystemStatus() {
-    return this.request('/system-status');
+    return this.requestCached('/system-status');
   }
 
-  async getAlerts() {
-    return this.request('/alerts');
+  // since: the 'cursor' of a previous response, to get only newer transitions/log events
+  async getAlerts(since) {
+    return this.requestCached(since === undefined ? '/alerts' : `/alerts?since=${since}`);
   }
 
-  async getNetworkStats() {
-    return this.request('/network-stats');
+  async getNetworkStats(since) {
+    return this.requestCached(since === undefined ? '/network-stats' : `/network-stats?since=${since}`);
   }
 
   async sendCommand(command, args = []) {
     return this.request('/command', {
       method: 'POST',
       body: JSON.stringify({ 
-        command: args.length > 0 ? `${command} ${args.join(' ')}` : command 
+        command: args.length > 0 ? `${command} ${args.join(' ')}` : command
       }),
     });
   }
 
+  // Several command lines in one request, answered from the same snapshot:
+  // resolves to {responses: [{command, response}, ...]}
+  async sendCommands(commands) {
+    return this.request('/command', {
+      method: 'POST',
+      body: JSON.stringify({ commands }),
+    });
+  }
+
+  // Live {system, alerts} state pushed by the backend. All components share one
+  // EventSource; it opens with the first subscriber and closes with the last.
+  // The listener is called as listener(state, error). Returns an unsubscribe function.
+  subscribe(listener) {
+    this.streamListeners.add(listener);
+    if (this.streamState) {
+      listener(this.streamState, null);
+    }
+    if (!this.eventSource) {
+      this.openStream();
+    }
+    return () => {
+      this.streamListeners.delete(listener);
+      if (this.streamListeners.size === 0) {
+        this.closeStream();
+      }
+    };
+  }
+
+  openStream() {
+    const source = new EventSource(`${API_BASE_URL}/stream`);
+
+    // Sent on connect and after a reconnect or dropped deltas
+    source.addEventListener('snapshot', (event) => {
+      this.streamState = JSON.parse(event.data);
+      this.notifyStream(null);
+    });
+
+    source.addEventListener('delta', (event) => {
+      if (!this.streamState) return;
+      this.streamState = applyDelta(this.streamState, JSON.parse(event.data));
+      this.notifyStream(null);
+    });
+
+    // EventSource reconnects by itself and the server resends a full snapshot,
+    // so a drop only surfaces as an error before any data arrived or if it gave up
+    source.onerror = () => {
+      if (!this.streamState || source.readyState === EventSource.CLOSED) {
+        this.notifyStream(new Error('Backend connection failed: live stream unavailable'));
+      }
+    };
+
+    this.eventSource = source;
+  }
+
+  closeStream() {
+    if (this.eventSource) {
+      this.eventSource.close();
+      this.eventSource = null;
+    }
+    this.streamState = null;
+  }
+
+  notifyStream(error) {
+    this.streamListeners.forEach((listener) => listener(this.streamState, error));
+  }
+
   async healthCheck() {
     try {
       return await this.request('/health');